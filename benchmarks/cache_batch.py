@@ -0,0 +1,73 @@
+"""
+Round trips of multi-key cache operations, before and after batching: a loop of single-key `get`/`set`/`delete`
+calls, as the CRUD interfaces used to issue, against one `get_many` (MGET), `set_many` (MULTI/EXEC pipeline) and
+`delete_many` (DEL). Needs the Redis of the application settings; the local cache tier is turned off so that every
+read reaches Redis.
+
+    python -m benchmarks.cache_batch --iterations 50
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.timing import format_durations, measure_async
+from src.cache.redis import AsyncRedis
+
+
+async def main_async(sizes: list[int], iterations: int) -> None:
+    cache = AsyncRedis()
+    cache.local_cache = None
+    await cache.connect()
+
+    try:
+        for size in sizes:
+            keys = [f"benchmark:cache-batch:{size}:{index}" for index in range(size)]
+            values = {key: "x" * 200 for key in keys}
+
+            async def set_loop() -> None:
+                for key, value in values.items():
+                    await cache.set(key=key, value=value)
+
+            async def get_loop() -> None:
+                for key in keys:
+                    await cache.get(key=key)
+
+            async def delete_loop() -> None:
+                for key in keys:
+                    await cache.delete(key=key)
+
+            print(format_durations(f"N={size} set loop (before)", await measure_async(set_loop, iterations)))
+            print(
+                format_durations(
+                    f"N={size} set_many (after)", await measure_async(lambda: cache.set_many(values=values), iterations)
+                )
+            )
+            print(format_durations(f"N={size} get loop (before)", await measure_async(get_loop, iterations)))
+            print(
+                format_durations(
+                    f"N={size} get_many (after)", await measure_async(lambda: cache.get_many(keys=keys), iterations)
+                )
+            )
+            print(format_durations(f"N={size} delete loop (before)", await measure_async(delete_loop, iterations)))
+            print(
+                format_durations(
+                    f"N={size} delete_many (after)",
+                    await measure_async(lambda: cache.delete_many(keys=keys), iterations),
+                )
+            )
+
+    finally:
+        await cache.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-key cache calls with the batched ones.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="Keys per operation.")
+    parser.add_argument("--iterations", type=int, default=50)
+    arguments = parser.parse_args()
+
+    asyncio.run(main_async(sizes=arguments.sizes, iterations=arguments.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Encode and decode cost and payload size of the cache codecs, against caching the ORM `__dict__` as the CRUD
+interfaces used to. Redis cannot store a dict, so the old approach is measured in its closest working form: the
+`__dict__` without `_sa_instance_state` as JSON, decoded back into an ORM instance with `Model(**cached)`.
+
+    python -m benchmarks.cache_codec --iterations 20000
+"""
+
+import argparse
+import datetime
+import json
+import typing
+import uuid
+
+from benchmarks.timing import format_durations, measure
+from src.cache.codec import CacheCodec, character_codec, user_codec
+from src.models.character import Character
+from src.models.user import User
+
+
+def encode_dict(db_obj: typing.Any) -> str:
+    return json.dumps(
+        {key: value for key, value in db_obj.__dict__.items() if key != "_sa_instance_state"}, default=str
+    )
+
+
+def compare(name: str, db_obj: typing.Any, model: type, codec: CacheCodec, iterations: int) -> None:
+    dict_payload = encode_dict(db_obj)
+    codec_payload = codec.encode(db_obj)
+
+    print(f"{name}: {len(dict_payload.encode())} bytes as __dict__, {len(codec_payload.encode())} bytes with codec")
+    print(format_durations(f"{name} encode __dict__ (before)", measure(lambda: encode_dict(db_obj), iterations)))
+    print(format_durations(f"{name} encode codec (after)", measure(lambda: codec.encode(db_obj), iterations)))
+    print(
+        format_durations(
+            f"{name} decode __dict__ (before)", measure(lambda: model(**json.loads(dict_payload)), iterations)
+        )
+    )
+    print(format_durations(f"{name} decode codec (after)", measure(lambda: codec.decode(codec_payload), iterations)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the cache codecs with caching the ORM `__dict__`.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    arguments = parser.parse_args()
+
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    db_user = User(
+        id=uuid.uuid4(),
+        username="benchmark",
+        email="benchmark@example.com",
+        is_verified=True,
+        is_active=True,
+        is_logged_in=False,
+        created_at=now,
+        updated_at=now,
+    )
+    db_user.set_hash_salt(hash_salt="$2b$12$" + "s" * 53)
+    db_user.set_hashed_password(hashed_password="$argon2id$v=19$m=65536,t=3,p=4$" + "h" * 66)
+    db_character = Character(id=uuid.uuid4(), user_id=db_user.id, name="benchmark", created_at=now)
+
+    compare("user", db_user, model=User, codec=user_codec, iterations=arguments.iterations)
+    compare("character", db_character, model=Character, codec=character_codec, iterations=arguments.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Item trades under contention: `--concurrency` workers, each on a session of its own, trade `--items` items between
+`--users` users for `--duration` seconds. Few users and items keep the trades fighting over the same rows. Reports
+trades per second, trades rejected because the item had moved on (expected), and any other failure, such as a
+deadlock or a serialization error (unexpected). Needs the Postgres of the application settings, migrated to head,
+with `DB_POOL_SIZE` + `DB_POOL_OVERFLOW` of at least `--concurrency`.
+
+    python -m benchmarks.item_trade_contention --users 4 --items 8 --concurrency 16 --duration 10
+"""
+
+import argparse
+import asyncio
+import collections
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from benchmarks.seeding import drop_seeded_users, seed_items, seed_users
+from src.cache.manager import async_cache
+from src.crud.item import ItemTransferHistoryCRUDInterface
+from src.database.db import async_db
+from src.schemas.routes.item import ItemTransferType
+from src.utilities.exceptions.database import EntityDoesNotExist
+
+
+async def trade(
+    owners: dict[uuid.UUID, uuid.UUID],
+    user_ids: list[uuid.UUID],
+    deadline: float,
+    outcomes: collections.Counter,
+) -> None:
+    async with async_db.async_session() as async_session:
+        item_crud = ItemTransferHistoryCRUDInterface(async_session=async_session, authorization=None)
+
+        while time.perf_counter() < deadline:
+            item_id = random.choice(list(owners))
+            from_owner_id = owners[item_id]
+            to_owner_id = random.choice([user_id for user_id in user_ids if user_id != from_owner_id])
+
+            try:
+                await item_crud.transfer_item(
+                    item_transfer=ItemTransferType(
+                        item_id=item_id,
+                        from_owner_id=from_owner_id,
+                        to_owner_id=to_owner_id,
+                        amount=Decimal("1.00"),
+                        fee_amount=Decimal("0.00"),
+                    )
+                )
+                owners[item_id] = to_owner_id
+                outcomes["applied"] += 1
+
+            except EntityDoesNotExist:
+                outcomes["rejected"] += 1
+
+            except Exception as error:
+                await async_session.rollback()
+                outcomes[type(error).__name__] += 1
+
+
+async def main_async(users: int, items: int, concurrency: int, duration: float) -> None:
+    await async_cache.connect()
+
+    async with async_db.async_session() as async_session:
+        user_ids = await seed_users(async_session, count=users, amount=Decimal(1_000_000))
+        owner_ids = [user_ids[index % users] for index in range(items)]
+        item_ids = await seed_items(async_session, owner_ids=owner_ids)
+        owners = dict(zip(item_ids, owner_ids))
+        outcomes: collections.Counter = collections.Counter()
+
+        try:
+            started_at = time.perf_counter()
+            deadline = started_at + duration
+            await asyncio.gather(*(trade(owners, user_ids, deadline, outcomes) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started_at
+
+        finally:
+            await drop_seeded_users(async_session, user_ids=user_ids)
+            await async_cache.disconnect()
+
+    failures = {outcome: count for outcome, count in outcomes.items() if outcome not in ("applied", "rejected")}
+    print(f"{outcomes['applied'] / elapsed:.0f} trades/s over {elapsed:.1f} s ({outcomes['applied']} applied)")
+    print(f"{outcomes['rejected']} rejected because the item had already moved")
+    print(f"other failures: {failures or 'none'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run concurrent item trades over a few users and items.")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--items", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to trade for.")
+    arguments = parser.parse_args()
+
+    asyncio.run(
+        main_async(
+            users=arguments.users, items=arguments.items, concurrency=arguments.concurrency, duration=arguments.duration
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Rows for the benchmarks that need Postgres. They run against the database of the application settings, migrated to
+head; everything seeded is prefixed with a random run id and deleted again by `drop_seeded_users`.
+"""
+
+import typing
+import uuid
+from decimal import Decimal
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.balance import Balance, BalanceSnapshot, BalanceTransferHistory
+from src.models.item import Item, ItemTransferHistory, ItemType
+from src.models.user import User
+from src.utilities.generators.uuid_generator import generate_uuid7
+
+
+async def seed_users(async_session: AsyncSession, count: int, amount: Decimal) -> list[uuid.UUID]:
+    """
+    Insert `count` users, each with a balance of `amount`, and return their ids.
+    """
+    run_id = uuid.uuid4().hex[:12]
+    user_ids = [generate_uuid7() for _ in range(count)]
+
+    await async_session.execute(
+        sqlalchemy.insert(User),
+        [
+            dict(id=user_id, username=f"bench-{run_id}-{index}", email=f"bench-{run_id}-{index}@example.com")
+            for index, user_id in enumerate(user_ids)
+        ],
+    )
+    await async_session.execute(
+        sqlalchemy.insert(Balance), [dict(user_id=user_id, amount=amount) for user_id in user_ids]
+    )
+    await async_session.commit()
+
+    return user_ids
+
+
+async def seed_items(async_session: AsyncSession, owner_ids: typing.Sequence[uuid.UUID]) -> list[uuid.UUID]:
+    """
+    Insert one item of a benchmark item type for every entry of `owner_ids` and return their ids.
+    """
+    item_type_id = generate_uuid7()
+    item_ids = [generate_uuid7() for _ in owner_ids]
+
+    await async_session.execute(
+        sqlalchemy.insert(ItemType).values(
+            id=item_type_id, name="benchmark", type="benchmark", rarity="common", description="benchmark"
+        )
+    )
+    await async_session.execute(
+        sqlalchemy.insert(Item),
+        [dict(id=item_id, type_id=item_type_id, owner_id=owner_id) for item_id, owner_id in zip(item_ids, owner_ids)],
+    )
+    await async_session.commit()
+
+    return item_ids
+
+
+async def drop_seeded_users(async_session: AsyncSession, user_ids: typing.Sequence[uuid.UUID]) -> None:
+    """
+    Delete the users of `user_ids` with their balances, items and history rows.
+    """
+    balance_ids = sqlalchemy.select(Balance.id).where(Balance.user_id.in_(user_ids))
+    item_type_ids = sqlalchemy.select(Item.type_id).where(Item.owner_id.in_(user_ids)).distinct()
+    item_type_query = await async_session.execute(statement=item_type_ids)
+
+    await async_session.execute(
+        sqlalchemy.delete(ItemTransferHistory).where(
+            ItemTransferHistory.from_owner_id.in_(user_ids) | ItemTransferHistory.to_owner_id.in_(user_ids)
+        )
+    )
+    await async_session.execute(sqlalchemy.delete(Item).where(Item.owner_id.in_(user_ids)))
+    await async_session.execute(sqlalchemy.delete(ItemType).where(ItemType.id.in_(item_type_query.scalars().all())))
+    await async_session.execute(
+        sqlalchemy.delete(BalanceTransferHistory).where(BalanceTransferHistory.balance_id.in_(balance_ids))
+    )
+    await async_session.execute(sqlalchemy.delete(BalanceSnapshot).where(BalanceSnapshot.balance_id.in_(balance_ids)))
+    await async_session.execute(sqlalchemy.delete(Balance).where(Balance.user_id.in_(user_ids)))
+    await async_session.execute(sqlalchemy.delete(User).where(User.id.in_(user_ids)))
+    await async_session.commit()
@@ -0,0 +1,72 @@
+"""
+Event loop responsiveness during a signin storm: `--signins` concurrent password hashes run inline on the event loop,
+as the signin route used to, and then through `hashing_service`. Meanwhile a probe coroutine unrelated to the
+storm wakes up every millisecond and records how late it was, standing in for every other request of the worker.
+
+    python -m benchmarks.signin_storm --signins 64
+"""
+
+import argparse
+import asyncio
+import time
+import typing
+
+from benchmarks.timing import format_durations
+from src.securities.hashing.password import pwd_generator
+from src.securities.hashing.service import hashing_service
+
+PROBE_INTERVAL: float = 0.001
+
+
+async def probe(lags: list[float], is_done: asyncio.Event) -> None:
+    while not is_done.is_set():
+        expected_at = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - expected_at)
+
+
+async def storm(name: str, hash_password: typing.Callable[[str], typing.Awaitable[str]], signins: int) -> None:
+    lags: list[float] = list()
+    is_done = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, is_done))
+    await asyncio.sleep(PROBE_INTERVAL)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(hash_password(f"password-{index}") for index in range(signins)))
+    duration = time.perf_counter() - started_at
+
+    is_done.set()
+    await probe_task
+    print(f"{name}: {signins} hashes in {duration * 1000:.0f} ms")
+    print(format_durations(f"{name} probe lag", lags))
+
+
+async def main_async(signins: int) -> None:
+    hash_salt = pwd_generator.generate_salt
+
+    async def hash_inline(password: str) -> str:
+        return pwd_generator.generate_hashed_password(hash_salt=hash_salt, new_password=password)
+
+    async def hash_in_pool(password: str) -> str:
+        return await hashing_service.generate_hashed_password(hash_salt=hash_salt, new_password=password)
+
+    hashing_service.start()
+    try:
+        await hash_in_pool("warm-up")
+        await storm("inline (before)", hash_inline, signins=signins)
+        await storm("hashing_service (after)", hash_in_pool, signins=signins)
+
+    finally:
+        hashing_service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure event loop lag while password hashes are running.")
+    parser.add_argument("--signins", type=int, default=64, help="Concurrent password hashes.")
+    arguments = parser.parse_args()
+
+    asyncio.run(main_async(signins=arguments.signins))
+
+
+if __name__ == "__main__":
+    main()
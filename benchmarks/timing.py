@@ -0,0 +1,45 @@
+"""
+Timing helpers shared by the benchmarks. Every benchmark is a module run from the repository root with the same
+environment as the application, e.g. `python -m benchmarks.token_cache`.
+"""
+
+import statistics
+import time
+import typing
+
+
+def measure(function: typing.Callable[[], typing.Any], iterations: int) -> list[float]:
+    """
+    Return the duration in seconds of each of `iterations` calls of `function`.
+    """
+    durations = list()
+
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started_at)
+
+    return durations
+
+
+async def measure_async(function: typing.Callable[[], typing.Awaitable[typing.Any]], iterations: int) -> list[float]:
+    durations = list()
+
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        await function()
+        durations.append(time.perf_counter() - started_at)
+
+    return durations
+
+
+def percentile(durations: typing.Sequence[float], fraction: float) -> float:
+    ordered = sorted(durations)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def format_durations(name: str, durations: typing.Sequence[float]) -> str:
+    return (
+        f"{name:<40} median {statistics.median(durations) * 1e6:>10.1f} us"
+        f"  p99 {percentile(durations, 0.99) * 1e6:>10.1f} us  (n={len(durations)})"
+    )
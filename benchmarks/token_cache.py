@@ -0,0 +1,50 @@
+"""
+Auth overhead per request, before and after the verified-token cache: a full python-jose decode, HMAC verification
+and `JWTUser` validation, against `retrieve_details_from_token` answering from the cache.
+
+    python -m benchmarks.token_cache --iterations 20000
+"""
+
+import argparse
+import uuid
+
+from jose import jwt as jose_jwt
+
+from benchmarks.timing import format_durations, measure
+from src.config.manager import settings
+from src.models.user import User
+from src.schemas.jwt import JWTUser
+from src.securities.authorizations.jwt import jwt_generator
+from src.securities.authorizations.token_cache import verified_token_cache
+
+
+def decode_uncached(token: str) -> JWTUser:
+    payload = jose_jwt.decode(
+        token=token, key=settings.JWT_SECRET_KEY_ACCESS_TOKEN, algorithms=[settings.JWT_ALGORITHM]
+    )
+    return JWTUser(user_id=payload["user_id"], email=payload["email"], session_id=payload.get("session_id"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare JWT validation with and without the verified-token cache.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    arguments = parser.parse_args()
+
+    user = User(id=uuid.uuid4(), username="benchmark", email="benchmark@example.com")
+    token = jwt_generator.generate_access_token(user=user)
+
+    uncached = measure(lambda: decode_uncached(token), iterations=arguments.iterations)
+
+    jwt_generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY_ACCESS_TOKEN)
+    cached = measure(
+        lambda: jwt_generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY_ACCESS_TOKEN),
+        iterations=arguments.iterations,
+    )
+
+    print(format_durations("decode and validate (before)", uncached))
+    print(format_durations("verified-token cache hit (after)", cached))
+    print(f"cache stats: {verified_token_cache.stats.as_dict()}")
+
+
+if __name__ == "__main__":
+    main()
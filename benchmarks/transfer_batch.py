@@ -0,0 +1,66 @@
+"""
+Throughput of balance transfers, before and after batching: `--transfers` calls of `transfer_balance`, one
+transaction each, against a single `transfer_balances` call applying the same transfers in one transaction. Needs
+the Postgres of the application settings, migrated to head; the seeded users are deleted afterwards.
+
+    python -m benchmarks.transfer_batch --users 100 --transfers 1000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from decimal import Decimal
+
+from benchmarks.seeding import drop_seeded_users, seed_users
+from src.cache.manager import async_cache
+from src.crud.balance import BalanceCRUDInterface
+from src.database.db import async_db
+from src.schemas.routes.balance import BalanceTransferType
+
+
+async def main_async(users: int, transfers: int) -> None:
+    await async_cache.connect()
+
+    async with async_db.async_session() as async_session:
+        user_ids = await seed_users(async_session, count=users, amount=Decimal(2 * transfers))
+        balance_crud = BalanceCRUDInterface(async_session=async_session, authorization=None)
+        balance_transfers = [
+            BalanceTransferType(
+                from_user_id=from_user_id, to_user_id=to_user_id, amount=Decimal("1.00"), fee_amount=Decimal("0.00")
+            )
+            for from_user_id, to_user_id in (random.sample(user_ids, 2) for _ in range(transfers))
+        ]
+
+        try:
+            started_at = time.perf_counter()
+            for balance_transfer in balance_transfers:
+                await balance_crud.transfer_balance(balance_transfer=balance_transfer)
+            single_duration = time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            results = await balance_crud.transfer_balances(balance_transfers=balance_transfers)
+            batch_duration = time.perf_counter() - started_at
+
+        finally:
+            await async_session.rollback()
+            await drop_seeded_users(async_session, user_ids=user_ids)
+            await async_cache.disconnect()
+
+    applied = sum(result.is_applied for result in results)
+    single_rate, batch_rate = transfers / single_duration, transfers / batch_duration
+    print(f"transfer_balance x{transfers} (before)   {single_rate:>10.0f} transfers/s")
+    print(f"transfer_balances x{transfers} (after)   {batch_rate:>10.0f} transfers/s  ({applied} applied)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare one transaction per transfer with a batch of transfers.")
+    parser.add_argument("--users", type=int, default=100, help="Users the transfers are spread over.")
+    parser.add_argument("--transfers", type=int, default=1000)
+    arguments = parser.parse_args()
+
+    asyncio.run(main_async(users=arguments.users, transfers=arguments.transfers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Primary key inserts with random UUIDv4 against time-ordered UUIDv7 keys: `--rows` rows inserted in batches of
+`--batch-size` into two scratch tables, one per key kind, reporting the insert time and the size of each primary key
+index. Random keys split pages all over the index, ordered keys append to its right-most page. Needs the Postgres of
+the application settings; the scratch tables are dropped afterwards.
+
+    python -m benchmarks.uuid_insert --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+import typing
+import uuid
+
+import sqlalchemy
+
+from benchmarks.timing import format_durations, measure
+from src.database.db import async_db
+from src.utilities.generators.uuid_generator import generate_uuid7
+
+
+async def insert_rows(
+    table: str, generate_id: typing.Callable[[], uuid.UUID], rows: int, batch_size: int
+) -> tuple[float, int]:
+    """
+    Insert `rows` rows keyed by `generate_id` into a new `table`, one transaction per batch, and return the
+    duration in seconds and the size in bytes of its primary key index.
+    """
+    insert_stmt = sqlalchemy.text(f"INSERT INTO {table} (id, payload) VALUES (:id, :payload)")
+
+    async with async_db.async_engine.begin() as connection:
+        await connection.execute(
+            sqlalchemy.text(f"CREATE TABLE {table} (id UUID PRIMARY KEY, payload VARCHAR(64) NOT NULL)")
+        )
+
+    started_at = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        async with async_db.async_engine.begin() as connection:
+            await connection.execute(
+                insert_stmt,
+                [dict(id=generate_id(), payload="x" * 64) for _ in range(min(batch_size, rows - offset))],
+            )
+    duration = time.perf_counter() - started_at
+
+    async with async_db.async_engine.connect() as connection:
+        index_size = await connection.scalar(sqlalchemy.text(f"SELECT pg_relation_size('{table}_pkey')"))
+
+    return duration, index_size
+
+
+async def main_async(rows: int, batch_size: int) -> None:
+    suffix = uuid.uuid4().hex[:8]
+    tables = {
+        "uuid4 (before)": (f"bench_uuid4_{suffix}", uuid.uuid4),
+        "uuid7 (after)": (f"bench_uuid7_{suffix}", generate_uuid7),
+    }
+
+    try:
+        for name, (table, generate_id) in tables.items():
+            duration, index_size = await insert_rows(table, generate_id, rows=rows, batch_size=batch_size)
+            print(f"{name:<16} {rows / duration:>10.0f} rows/s  primary key index {index_size / 2**20:>8.1f} MiB")
+
+    finally:
+        async with async_db.async_engine.begin() as connection:
+            for table, _ in tables.values():
+                await connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {table}"))
+
+        await async_db.async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare UUIDv4 and UUIDv7 primary key inserts.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows inserted per transaction.")
+    arguments = parser.parse_args()
+
+    print(format_durations("generate uuid4", measure(uuid.uuid4, iterations=100_000)))
+    print(format_durations("generate uuid7", measure(generate_uuid7, iterations=100_000)))
+    asyncio.run(main_async(rows=arguments.rows, batch_size=arguments.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import fastapi
 
 from src.api.routes.authentication import router as auth_router
 from src.api.routes.balance import router as balance_router
+from src.api.routes.cache import router as cache_router
 from src.api.routes.character import router as character_router
 from src.api.routes.item import router as item_router
 from src.api.routes.user import router as user_router
@@ -10,6 +11,7 @@ router = fastapi.APIRouter()
 
 router.include_router(router=auth_router)
 router.include_router(router=balance_router)
+router.include_router(router=cache_router)
 router.include_router(router=character_router)
 router.include_router(router=item_router)
 router.include_router(router=user_router)
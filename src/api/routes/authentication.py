@@ -2,22 +2,54 @@ import fastapi
 
 from src.crud.user import UserCRUDInterface
 from src.crud.base import get_interface
+from src.schemas.routes.authentication import RefreshTokenInRequestType, TokensInResponseType
 from src.schemas.routes.user import UserInCreateType, UserInLoginType, UserInResponseType, UserType
-from src.securities.authorizations.jwt import jwt_generator
+from src.securities.authorizations.session_store import session_store
+from src.securities.limiters.rate_limiter import (
+    auth_account_rate_limit_rule,
+    auth_ip_rate_limit_rule,
+    rate_limiter,
+)
 from src.utilities.exceptions.database import EntityAlreadyExists
+from src.utilities.exceptions.hashing import HashingServiceOverloaded
 from src.utilities.exceptions.http.exc_400 import (
     http_exc_400_credentials_bad_signin_request,
     http_exc_400_credentials_bad_signup_request,
 )
+from src.utilities.exceptions.http.exc_401 import http_401_token_credentials_request, http_401_token_expired_request
+from src.utilities.exceptions.http.exc_503 import (
+    http_503_exc_hashing_overloaded_request,
+    http_503_exc_session_store_unavailable_request,
+)
+from src.utilities.exceptions.session import SessionDoesNotExist, SessionStoreUnavailable
 
 router = fastapi.APIRouter(prefix="/auth", tags=["authentication"])
 
 
+async def limit_signup_rate(request: fastapi.Request, user_create: UserInCreateType) -> None:
+    await rate_limiter.enforce(
+        limits=[
+            (auth_ip_rate_limit_rule, request.client.host if request.client else ""),
+            (auth_account_rate_limit_rule, user_create.email.lower()),
+        ]
+    )
+
+
+async def limit_signin_rate(request: fastapi.Request, user_login: UserInLoginType) -> None:
+    await rate_limiter.enforce(
+        limits=[
+            (auth_ip_rate_limit_rule, request.client.host if request.client else ""),
+            (auth_account_rate_limit_rule, user_login.email.lower()),
+        ]
+    )
+
+
 @router.post(
     "/signup",
     name="auth:signup",
     response_model=UserInResponseType,
     status_code=fastapi.status.HTTP_201_CREATED,
+    dependencies=[fastapi.Depends(limit_signup_rate)],
 )
 async def signup(
     user_create: UserInCreateType,
@@ -30,11 +62,18 @@ async def signup(
     except EntityAlreadyExists:
         raise await http_exc_400_credentials_bad_signup_request()
 
-    new_user = await user_interface.create_user(user_create=user_create)
+    try:
+        new_user = await user_interface.create_user(user_create=user_create)
+
+    except HashingServiceOverloaded:
+        raise await http_503_exc_hashing_overloaded_request()
+
+    token, refresh_token = await session_store.start_session(user=new_user)
 
     return UserInResponseType(
         id=new_user.id,
-        token=jwt_generator.generate_access_token(user=new_user),
+        token=token,
+        refresh_token=refresh_token,
         authorized_user=UserType(
             username=new_user.username,
             email=new_user.email,
@@ -52,6 +91,7 @@ async def signup(
     name="auth:signin",
     response_model=UserInResponseType,
     status_code=fastapi.status.HTTP_202_ACCEPTED,
+    dependencies=[fastapi.Depends(limit_signin_rate)],
 )
 async def signin(
     user_login: UserInLoginType,
@@ -60,12 +100,18 @@ async def signin(
     try:
         db_user = await user_interface.read_user_by_password_authentication(user_login=user_login)
 
+    except HashingServiceOverloaded:
+        raise await http_503_exc_hashing_overloaded_request()
+
     except Exception:
         raise await http_exc_400_credentials_bad_signin_request()
 
+    token, refresh_token = await session_store.start_session(user=db_user)
+
     return UserInResponseType(
         id=db_user.id,
-        token=jwt_generator.generate_access_token(user=db_user),
+        token=token,
+        refresh_token=refresh_token,
         authorized_user=UserType(
             username=db_user.username,
             email=db_user.email,
@@ -76,3 +122,42 @@ async def signin(
             updated_at=db_user.updated_at,
         ),
     )
+
+
+@router.post(
+    path="/refresh",
+    name="auth:refresh",
+    response_model=TokensInResponseType,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def refresh(refresh_token_in: RefreshTokenInRequestType) -> TokensInResponseType:
+    """
+    Trade a refresh token for a new access token and refresh token. Each refresh token works once.
+    """
+    try:
+        token, refresh_token = await session_store.renew_session(refresh_token=refresh_token_in.refresh_token)
+
+    except ValueError:
+        raise await http_401_token_credentials_request()
+
+    except SessionDoesNotExist:
+        raise await http_401_token_expired_request()
+
+    except SessionStoreUnavailable:
+        raise await http_503_exc_session_store_unavailable_request()
+
+    return TokensInResponseType(token=token, refresh_token=refresh_token)
+
+
+@router.post(path="/logout", name="auth:logout", status_code=fastapi.status.HTTP_200_OK)
+async def logout(
+    refresh_token_in: RefreshTokenInRequestType, authorization: str = fastapi.Header(default=None)
+) -> dict[str, str]:
+    _, _, access_token = (authorization or "").partition(" ")
+    try:
+        await session_store.end_session(refresh_token=refresh_token_in.refresh_token, access_token=access_token)
+
+    except ValueError:
+        raise await http_401_token_credentials_request()
+
+    return {"notification": "Signed out! The tokens of this session no longer work."}
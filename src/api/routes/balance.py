@@ -1,10 +1,24 @@
+import datetime
+import typing
 from uuid import UUID
 
 import fastapi
 
+from src.config.manager import settings
 from src.crud.balance import BalanceCRUDInterface
 from src.crud.base import get_interface
-from src.schemas.routes.balance import BalanceUpdateType, BalanceType, BalanceTransferType, BalanceTransferHistoryType
+from src.schemas.routes.balance import (
+    BalanceAtTimeType,
+    BalanceTransferBatchType,
+    BalanceTransferHistoryType,
+    BalanceTransferResultType,
+    BalanceTransferType,
+    BalanceType,
+    BalanceUpdateType,
+)
+from src.utilities.exceptions.http.exc_400 import http_400_exc_bad_cursor_request
+from src.utilities.formatters.cursor_formatter import decode_cursor, encode_cursor
+from src.utilities.formatters.ndjson_formatter import format_models_into_ndjson
 
 router = fastapi.APIRouter(prefix="/balances", tags=["balances"])
 
@@ -50,6 +64,38 @@ async def transfer_balance(
     )
 
 
+@router.post(
+    path="/transfer/batch",
+    name="balances:transfer-balance-batch",
+    response_model=list[BalanceTransferResultType],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def transfer_balance_batch(
+    balance_transfer_batch: BalanceTransferBatchType,
+    balance_interface: BalanceCRUDInterface = fastapi.Depends(get_interface(interface_type=BalanceCRUDInterface)),
+) -> list[BalanceTransferResultType]:
+    return await balance_interface.transfer_balances(balance_transfers=balance_transfer_batch.transfers)
+
+
+@router.get(
+    path="/{user_id}/at",
+    name="balances:get-balance-at",
+    response_model=BalanceAtTimeType,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_balance_at(
+    user_id: UUID,
+    ts: datetime.datetime,
+    balance_interface: BalanceCRUDInterface = fastapi.Depends(get_interface(interface_type=BalanceCRUDInterface)),
+) -> BalanceAtTimeType:
+    """
+    Return the amount of the balance at `ts`; a timestamp without a timezone is taken as UTC.
+    """
+    at = ts if ts.tzinfo else ts.replace(tzinfo=datetime.timezone.utc)
+    amount = await balance_interface.get_balance_at(user_id=user_id, at=at)
+    return BalanceAtTimeType(user_id=user_id, amount=amount, at=at)
+
+
 @router.get(
     path="/history/{user_id}",
     name="balances:get-balance-history",
@@ -58,18 +104,43 @@ async def transfer_balance(
 )
 async def get_balance_history(
     user_id: UUID,
+    response: fastapi.Response,
+    cursor: str | None = None,
+    limit: int = fastapi.Query(default=settings.API_PAGE_DEFAULT_SIZE, ge=1, le=settings.API_PAGE_MAX_SIZE),
+    stream: bool = False,
     balance_interface: BalanceCRUDInterface = fastapi.Depends(get_interface(interface_type=BalanceCRUDInterface)),
-) -> list[BalanceTransferHistoryType]:
-    history = await balance_interface.get_balance_history(user_id=user_id)
-    return [
-        BalanceTransferHistoryType(
-            id=record.id,
-            balance_id=record.balance_id,
-            amount=record.amount,
-            balance_before=record.balance_before,
-            balance_after=record.balance_after,
-            operation_type=record.operation_type,
-            created_at=record.created_at,
+) -> list[BalanceTransferHistoryType] | fastapi.responses.StreamingResponse:
+    """
+    Return one page of the history and, when more may follow, the cursor of the next page in `X-Next-Cursor`.
+    With `stream=true` every entry after `cursor` is streamed as NDJSON instead.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+
+    except ValueError:
+        raise await http_400_exc_bad_cursor_request(cursor=cursor)
+
+    if stream:
+        history = await balance_interface.stream_balance_history(user_id=user_id, after=after)
+        return fastapi.responses.StreamingResponse(
+            format_models_into_ndjson(build_balance_transfer_history(record=record) async for record in history),
+            media_type="application/x-ndjson",
         )
-        for record in history
-    ]
+
+    history = await balance_interface.get_balance_history(user_id=user_id, after=after, limit=limit)
+    if len(history) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(created_at=history[-1].created_at, pk=history[-1].id)
+
+    return [build_balance_transfer_history(record=record) for record in history]
+
+
+def build_balance_transfer_history(record: typing.Any) -> BalanceTransferHistoryType:
+    return BalanceTransferHistoryType(
+        id=record.id,
+        balance_id=record.balance_id,
+        amount=record.amount,
+        balance_before=record.balance_before,
+        balance_after=record.balance_after,
+        operation_type=record.operation_type,
+        created_at=record.created_at,
+    )
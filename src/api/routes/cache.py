@@ -0,0 +1,21 @@
+import fastapi
+
+from src.cache.manager import async_cache
+from src.securities.authorizations.token_cache import verified_token_cache
+from src.securities.limiters.rate_limiter import rate_limiter
+
+router = fastapi.APIRouter(prefix="/cache", tags=["cache"])
+
+
+@router.get(
+    path="/stats",
+    name="cache:read-stats",
+    response_model=dict[str, dict[str, int | str]],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_cache_stats() -> dict[str, dict[str, int | str]]:
+    return {
+        **async_cache.metrics,
+        "verified-token": verified_token_cache.stats.as_dict(),
+        **rate_limiter.metrics,
+    }
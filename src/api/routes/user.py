@@ -1,14 +1,21 @@
+import typing
 from uuid import UUID
 
 import fastapi
 import pydantic
 
+from src.config.manager import settings
 from src.crud.user import UserCRUDInterface
 from src.crud.base import get_interface
 from src.schemas.routes.user import UserInResponseType, UserInUpdateType, UserType
 from src.securities.authorizations.jwt import jwt_generator
 from src.utilities.exceptions.database import EntityDoesNotExist
+from src.utilities.exceptions.hashing import HashingServiceOverloaded
+from src.utilities.exceptions.http.exc_400 import http_400_exc_bad_cursor_request
 from src.utilities.exceptions.http.exc_404 import http_404_exc_id_not_found_request
+from src.utilities.exceptions.http.exc_503 import http_503_exc_hashing_overloaded_request
+from src.utilities.formatters.cursor_formatter import decode_cursor, encode_cursor
+from src.utilities.formatters.ndjson_formatter import format_models_into_ndjson
 
 router = fastapi.APIRouter(prefix="/users", tags=["users"])
 
@@ -20,29 +27,34 @@ router = fastapi.APIRouter(prefix="/users", tags=["users"])
     status_code=fastapi.status.HTTP_200_OK,
 )
 async def get_users(
+    response: fastapi.Response,
+    cursor: str | None = None,
+    limit: int = fastapi.Query(default=settings.API_PAGE_DEFAULT_SIZE, ge=1, le=settings.API_PAGE_MAX_SIZE),
+    stream: bool = False,
     user_interface: UserCRUDInterface = fastapi.Depends(get_interface(interface_type=UserCRUDInterface)),
-) -> list[UserInResponseType]:
-    db_users = await user_interface.read_users()
-    db_user_list: list = list()
-
-    for db_user in db_users:
-        access_token = jwt_generator.generate_access_token(user=db_user)
-        user = UserInResponseType(
-            id=db_user.id,
-            authorized_user=UserType(
-                token=access_token,
-                username=db_user.username,
-                email=db_user.email,
-                is_verified=db_user.is_verified,
-                is_active=db_user.is_active,
-                is_logged_in=db_user.is_logged_in,
-                created_at=db_user.created_at,
-                updated_at=db_user.updated_at,
-            ),
+) -> list[UserInResponseType] | fastapi.responses.StreamingResponse:
+    """
+    Return one page of users and, when more may follow, the cursor of the next page in `X-Next-Cursor`. With
+    `stream=true` every user after `cursor` is streamed as NDJSON instead.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+
+    except ValueError:
+        raise await http_400_exc_bad_cursor_request(cursor=cursor)
+
+    if stream:
+        db_users = await user_interface.stream_users(after=after)
+        return fastapi.responses.StreamingResponse(
+            format_models_into_ndjson(build_user_in_response(db_user=db_user) async for db_user in db_users),
+            media_type="application/x-ndjson",
         )
-        db_user_list.append(user)
 
-    return db_user_list
+    db_users = await user_interface.read_users(after=after, limit=limit)
+    if len(db_users) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(created_at=db_users[-1].created_at, pk=db_users[-1].id)
+
+    return [build_user_in_response(db_user=db_user) for db_user in db_users]
 
 
 @router.get(
@@ -57,24 +69,11 @@ async def get_user(
 ) -> UserInResponseType:
     try:
         db_user = await user_interface.read_user_by_id(pk=pk)
-        access_token = jwt_generator.generate_access_token(user=db_user)
 
     except EntityDoesNotExist:
         raise await http_404_exc_id_not_found_request(pk=pk)
 
-    return UserInResponseType(
-        id=db_user.id,
-        authorized_user=UserType(
-            token=access_token,
-            username=db_user.username,
-            email=db_user.email,  # type: ignore
-            is_verified=db_user.is_verified,
-            is_active=db_user.is_active,
-            is_logged_in=db_user.is_logged_in,
-            created_at=db_user.created_at,
-            updated_at=db_user.updated_at,
-        ),
-    )
+    return build_user_in_response(db_user=db_user)
 
 
 @router.patch(
@@ -97,21 +96,10 @@ async def update_user(
     except EntityDoesNotExist:
         raise await http_404_exc_id_not_found_request(pk=query_id)
 
-    access_token = jwt_generator.generate_access_token(user=updated_db_user)
+    except HashingServiceOverloaded:
+        raise await http_503_exc_hashing_overloaded_request()
 
-    return UserInResponseType(
-        id=updated_db_user.id,
-        authorized_user=UserType(
-            token=access_token,
-            username=updated_db_user.username,
-            email=updated_db_user.email,  # type: ignore
-            is_verified=updated_db_user.is_verified,
-            is_active=updated_db_user.is_active,
-            is_logged_in=updated_db_user.is_logged_in,
-            created_at=updated_db_user.created_at,
-            updated_at=updated_db_user.updated_at,
-        ),
-    )
+    return build_user_in_response(db_user=updated_db_user)
 
 
 @router.delete(path="", name="users:delete-user-by-id", status_code=fastapi.status.HTTP_200_OK)
@@ -126,3 +114,19 @@ async def delete_user(
         raise await http_404_exc_id_not_found_request(pk=pk)
 
     return {"notification": deletion_result}
+
+
+def build_user_in_response(db_user: typing.Any) -> UserInResponseType:
+    return UserInResponseType(
+        id=db_user.id,
+        token=jwt_generator.generate_access_token(user=db_user),
+        authorized_user=UserType(
+            username=db_user.username,
+            email=db_user.email,
+            is_verified=db_user.is_verified,
+            is_active=db_user.is_active,
+            is_logged_in=db_user.is_logged_in,
+            created_at=db_user.created_at,
+            updated_at=db_user.updated_at,
+        ),
+    )
@@ -0,0 +1,189 @@
+import asyncio
+import contextlib
+import datetime
+import pathlib
+import threading
+import typing
+from functools import lru_cache
+from uuid import UUID
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.archive.segment import SegmentLayout, SegmentReader, SegmentWriter
+from src.config.manager import settings
+
+balance_transfer_history_layout: SegmentLayout = SegmentLayout(
+    table="balance_transfer_history",
+    group_by="balance_id",
+    columns=(
+        ("id", "uuid"),
+        ("balance_id", "uuid"),
+        ("amount", "decimal"),
+        ("balance_before", "decimal"),
+        ("balance_after", "decimal"),
+        ("operation_type", "text"),
+        ("created_at", "timestamp"),
+    ),
+)
+item_transfer_history_layout: SegmentLayout = SegmentLayout(
+    table="item_transfer_history",
+    group_by="item_id",
+    columns=(
+        ("id", "uuid"),
+        ("item_id", "uuid"),
+        ("from_owner_id", "uuid"),
+        ("to_owner_id", "uuid"),
+        ("fee_amount", "decimal"),
+        ("balance_transfer_history_id", "uuid"),
+        ("created_at", "timestamp"),
+    ),
+)
+ARCHIVE_LAYOUTS: dict[str, SegmentLayout] = {
+    layout.table: layout for layout in (balance_transfer_history_layout, item_transfer_history_layout)
+}
+
+
+class HistoryArchive:
+    """
+    Cold storage for the history partitions detached by the retention job: one segment per table and month at
+    `HISTORY_ARCHIVE_DIR/<table>/<YYYYMM>.seg`. Every worker reads the same directory, so it has to be shared
+    when the workers run on several hosts. Reads run in a thread, since decompression is CPU bound.
+    """
+
+    def __init__(self, directory: str, block_rows: int):
+        self.directory: pathlib.Path | None = pathlib.Path(directory) if directory else None
+        self.block_rows: int = block_rows
+        self._readers: dict[pathlib.Path, tuple[int, SegmentReader]] = dict()
+        self._reader_users: dict[SegmentReader, int] = dict()
+        self._readers_lock: threading.Lock = threading.Lock()
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.directory is not None
+
+    def segment_path(self, table: str, month: datetime.date) -> pathlib.Path:
+        return self.directory / table / f"{month:%Y%m}.seg"
+
+    async def read_group(
+        self, table: str, group_id: UUID, after: tuple[datetime.datetime, UUID] | None, limit: int
+    ) -> list[dict[str, typing.Any]]:
+        """
+        Return up to `limit` archived rows of `group_id` after `after`, oldest month first. Archived months are
+        older than every partition still attached, so these rows come before any row in the database.
+        """
+        if not self.is_enabled or limit <= 0:
+            return list()
+
+        return await asyncio.to_thread(self._read_group, table, group_id, after, limit)
+
+    async def archive_partition(
+        self, async_engine: AsyncEngine, table: str, partition: str, month: datetime.date
+    ) -> int:
+        """
+        Write the rows of `partition` into the segment of `month` and return how many were written. The segment
+        is on disk once this returns, so the partition may be detached and dropped. An existing segment of the
+        same month is replaced, so an archive interrupted before the partition was dropped is simply redone.
+        """
+        layout = ARCHIVE_LAYOUTS[table]
+        path = self.segment_path(table, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        columns = ", ".join(f'"{name}"' for name in layout.column_names)
+
+        writer = await asyncio.to_thread(SegmentWriter, path, layout, self.block_rows)
+        try:
+            async with async_engine.connect() as connection:
+                result = await connection.stream(
+                    sqlalchemy.text(
+                        f'SELECT {columns} FROM "{partition}" ORDER BY "{layout.group_by}", "created_at", "id"'
+                    )
+                )
+                async for rows in result.mappings().partitions(self.block_rows):
+                    await asyncio.to_thread(writer.write_rows, rows)
+
+            await asyncio.to_thread(writer.close)
+
+        except BaseException:
+            writer.abort()
+            raise
+
+        return writer.row_count
+
+    def archived_until(self, table: str) -> datetime.datetime | None:
+        """
+        Return the end of the newest archived month of `table`, or `None` when nothing is archived. Rows before it
+        are read from the archive only: a partition is archived before it is detached, so for a moment its rows
+        are in both places.
+        """
+        if not self.is_enabled:
+            return None
+
+        months = [datetime.datetime.strptime(path.stem, "%Y%m") for path in (self.directory / table).glob("*.seg")]
+        if not months:
+            return None
+
+        next_month = (max(months).replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        return next_month.replace(tzinfo=datetime.timezone.utc)
+
+    def _read_group(
+        self, table: str, group_id: UUID, after: tuple[datetime.datetime, UUID] | None, limit: int
+    ) -> list[dict[str, typing.Any]]:
+        rows = list()
+        for path in sorted((self.directory / table).glob("*.seg")):
+            with self._use_reader(path) as reader:
+                rows.extend(reader.read_group(group_id, after=after, limit=limit - len(rows)))
+            if len(rows) == limit:
+                break
+
+        return rows
+
+    @contextlib.contextmanager
+    def _use_reader(self, path: pathlib.Path) -> typing.Iterator[SegmentReader]:
+        """
+        Lend the reader of the segment at `path`, opening a new one when the segment was rewritten since. A
+        replaced reader is closed as soon as no thread reads from it any more, so its map and file are released.
+        """
+        with self._readers_lock:
+            modified_at = path.stat().st_mtime_ns
+            cached_reader = self._readers.get(path)
+            if cached_reader is None or cached_reader[0] != modified_at:
+                self._readers[path] = (modified_at, SegmentReader(path))
+                if cached_reader is not None:
+                    self._close_if_unused(cached_reader[1])
+                cached_reader = self._readers[path]
+
+            reader = cached_reader[1]
+            self._reader_users[reader] = self._reader_users.get(reader, 0) + 1
+
+        try:
+            yield reader
+
+        finally:
+            with self._readers_lock:
+                self._reader_users[reader] -= 1
+                if not self._reader_users[reader]:
+                    del self._reader_users[reader]
+                self._close_if_unused(reader)
+
+    def _close_if_unused(self, reader: SegmentReader) -> None:
+        is_current = self._readers.get(reader.path, (None, None))[1] is reader
+        if not is_current and reader not in self._reader_users:
+            reader.close()
+
+    def close(self) -> None:
+        """
+        Close every cached reader; the ones still being read from are closed when their read finishes.
+        """
+        with self._readers_lock:
+            readers = [reader for _, reader in self._readers.values()]
+            self._readers.clear()
+            for reader in readers:
+                self._close_if_unused(reader)
+
+
+@lru_cache()
+def get_history_archive() -> HistoryArchive:
+    return HistoryArchive(directory=settings.HISTORY_ARCHIVE_DIR, block_rows=settings.HISTORY_ARCHIVE_BLOCK_ROWS)
+
+
+history_archive: HistoryArchive = get_history_archive()
@@ -0,0 +1,276 @@
+import bisect
+import datetime
+import decimal
+import json
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import typing
+import zlib
+from array import array
+from uuid import UUID
+
+SEGMENT_MAGIC = b"XHSEG01\n"
+SEGMENT_VERSION = 1
+DECIMAL_SCALE = 2
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+# Group index entry: group id, first row, row count. Fixed width, so it is binary-searched in place.
+GROUP_INDEX_ENTRY = struct.Struct("<16sQI")
+FOOTER_SUFFIX = struct.Struct("<I8s")
+
+
+class SegmentLayout:
+    """
+    The columns of an archived table and the column its rows are grouped by. Rows are stored ordered by
+    (`group_by`, `created_at`, `id`), so the rows of one group are contiguous and already in page order.
+
+    Column kinds: `uuid` (16 bytes), `timestamp` (int64 microseconds since the epoch), `decimal` (int64 scaled by
+    `DECIMAL_SCALE`) and `text` (uint16 codes into a per-segment dictionary).
+    """
+
+    def __init__(self, table: str, group_by: str, columns: tuple[tuple[str, str], ...]):
+        self.table: str = table
+        self.group_by: str = group_by
+        self.columns: tuple[tuple[str, str], ...] = columns
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _ in self.columns]
+
+
+def _encode_int64(values: list[int]) -> bytes:
+    encoded = array("q", values)
+    if sys.byteorder != "little":
+        encoded.byteswap()
+    return encoded.tobytes()
+
+
+def _decode_int64(buffer: bytes) -> typing.Sequence[int]:
+    if sys.byteorder != "little":
+        decoded = array("q", buffer)
+        decoded.byteswap()
+        return decoded
+    return memoryview(buffer).cast("q")
+
+
+class SegmentWriter:
+    """
+    Write rows, already ordered as `SegmentLayout` describes, into a segment file: each column is compressed
+    separately in blocks of `block_rows` rows, followed by the group index and a compressed JSON footer. The file
+    is written next to `path` and renamed into place by `close`, so readers never see a partial segment.
+    """
+
+    def __init__(self, path: pathlib.Path, layout: SegmentLayout, block_rows: int):
+        self.path: pathlib.Path = path
+        self.layout: SegmentLayout = layout
+        self.block_rows: int = block_rows
+        self._partial_path: pathlib.Path = path.with_suffix(path.suffix + ".partial")
+        self._file: typing.BinaryIO = open(self._partial_path, "wb")
+        self._file.write(SEGMENT_MAGIC)
+        self._pending_rows: list[typing.Mapping[str, typing.Any]] = list()
+        self._blocks: list[list[tuple[int, int]]] = list()
+        self._dictionaries: dict[str, dict[str, int]] = {
+            name: dict() for name, kind in layout.columns if kind == "text"
+        }
+        self._groups: list[list[typing.Any]] = list()
+        self.row_count: int = 0
+        self._created_at_range: list[int] = list()
+
+    def write_rows(self, rows: typing.Iterable[typing.Mapping[str, typing.Any]]) -> None:
+        for row in rows:
+            group_id = row[self.layout.group_by]
+            if self._groups and self._groups[-1][0] == group_id:
+                self._groups[-1][2] += 1
+            else:
+                self._groups.append([group_id, self.row_count, 1])
+
+            self._pending_rows.append(row)
+            self.row_count += 1
+            if len(self._pending_rows) == self.block_rows:
+                self._write_block()
+
+    def close(self) -> None:
+        if self._pending_rows:
+            self._write_block()
+
+        index_offset = self._file.tell()
+        for group_id, first_row, row_count in sorted(self._groups, key=lambda group: group[0].bytes):
+            self._file.write(GROUP_INDEX_ENTRY.pack(group_id.bytes, first_row, row_count))
+
+        footer = zlib.compress(
+            json.dumps(
+                {
+                    "version": SEGMENT_VERSION,
+                    "table": self.layout.table,
+                    "group_by": self.layout.group_by,
+                    "columns": self.layout.columns,
+                    "row_count": self.row_count,
+                    "block_rows": self.block_rows,
+                    "blocks": self._blocks,
+                    "dictionaries": {name: list(codes) for name, codes in self._dictionaries.items()},
+                    "index": [index_offset, len(self._groups)],
+                    "created_at_range": self._created_at_range,
+                }
+            ).encode()
+        )
+        self._file.write(footer)
+        self._file.write(FOOTER_SUFFIX.pack(len(footer), SEGMENT_MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._partial_path, self.path)
+
+        # The rename itself is only durable once the directory entry is flushed too.
+        directory = os.open(self.path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+
+        finally:
+            os.close(directory)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._partial_path.unlink(missing_ok=True)
+
+    def _write_block(self) -> None:
+        block = list()
+        for name, kind in self.layout.columns:
+            values = [row[name] for row in self._pending_rows]
+            if kind == "uuid":
+                encoded = b"".join(value.bytes for value in values)
+            elif kind == "timestamp":
+                micros = [(value - EPOCH) // datetime.timedelta(microseconds=1) for value in values]
+                if name == "created_at":
+                    bounds = micros + self._created_at_range
+                    self._created_at_range = [min(bounds), max(bounds)]
+                encoded = _encode_int64(micros)
+            elif kind == "decimal":
+                encoded = _encode_int64([int(decimal.Decimal(value).scaleb(DECIMAL_SCALE)) for value in values])
+            else:
+                codes = self._dictionaries[name]
+                encoded = array("H", [codes.setdefault(value, len(codes)) for value in values]).tobytes()
+
+            compressed = zlib.compress(encoded)
+            block.append((self._file.tell(), len(compressed)))
+            self._file.write(compressed)
+
+        self._blocks.append(block)
+        self._pending_rows.clear()
+
+
+class SegmentReader:
+    """
+    Read a segment through a read-only memory map. The footer and group index are parsed once; a lookup then
+    binary-searches the group index in place and decompresses only the column blocks that hold the requested
+    rows, straight from the mapped pages. Fixed-width columns are decoded as typed views over the decompressed
+    buffers instead of being unpacked value by value.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path: pathlib.Path = path
+        with open(path, "rb") as segment_file:
+            self._mmap: mmap.mmap = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view: memoryview = memoryview(self._mmap)
+
+        footer_length, magic = FOOTER_SUFFIX.unpack_from(self._view, len(self._view) - FOOTER_SUFFIX.size)
+        if self._view[: len(SEGMENT_MAGIC)] != SEGMENT_MAGIC or magic != SEGMENT_MAGIC:
+            raise ValueError(f"`{path}` is not a history segment!")
+
+        footer_offset = len(self._view) - FOOTER_SUFFIX.size - footer_length
+        footer = json.loads(zlib.decompress(self._view[footer_offset : footer_offset + footer_length]))
+        self.columns: list[tuple[str, str]] = [tuple(column) for column in footer["columns"]]
+        self.row_count: int = footer["row_count"]
+        self.block_rows: int = footer["block_rows"]
+        self.created_at_range: list[int] = footer["created_at_range"]
+        self._blocks: list[list[list[int]]] = footer["blocks"]
+        self._dictionaries: dict[str, list[str]] = footer["dictionaries"]
+        self._index_offset, self._group_count = footer["index"]
+
+    def find_group(self, group_id: UUID) -> tuple[int, int] | None:
+        """
+        Return the first row and row count of `group_id`, or `None` when the segment holds none of its rows.
+        """
+        low, high = 0, self._group_count
+        while low < high:
+            middle = (low + high) // 2
+            entry_offset = self._index_offset + middle * GROUP_INDEX_ENTRY.size
+            if bytes(self._view[entry_offset : entry_offset + 16]) < group_id.bytes:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self._group_count:
+            return None
+
+        entry_id, first_row, row_count = GROUP_INDEX_ENTRY.unpack_from(
+            self._view, self._index_offset + low * GROUP_INDEX_ENTRY.size
+        )
+        return (first_row, row_count) if entry_id == group_id.bytes else None
+
+    def read_group(
+        self, group_id: UUID, after: tuple[datetime.datetime, UUID] | None, limit: int
+    ) -> list[dict[str, typing.Any]]:
+        """
+        Return up to `limit` rows of `group_id` positioned after `after` in (`created_at`, `id`) order.
+        """
+        group = self.find_group(group_id)
+        if group is None or limit <= 0:
+            return list()
+
+        first_row, row_count = group
+        if after is not None:
+            after_key = ((after[0] - EPOCH) // datetime.timedelta(microseconds=1), after[1].bytes)
+            if after_key[0] > self.created_at_range[1]:
+                return list()
+
+            created_at = self._read_column("created_at", first_row, row_count)
+            ids = self._read_column("id", first_row, row_count)
+            keys = [(created_at[position], ids[position]) for position in range(row_count)]
+            skipped_rows = bisect.bisect_right(keys, after_key)
+            first_row, row_count = first_row + skipped_rows, row_count - skipped_rows
+
+        row_count = min(row_count, limit)
+        values = {name: self._decode_column(name, kind, first_row, row_count) for name, kind in self.columns}
+        return [{name: values[name][position] for name, _ in self.columns} for position in range(row_count)]
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def _read_column(self, name: str, first_row: int, row_count: int) -> list[typing.Any]:
+        """
+        Return the raw stored values of column `name` for the row range: ints, or the 16-byte form of uuids.
+        """
+        column = [position for position, (column_name, _) in enumerate(self.columns) if column_name == name][0]
+        kind = self.columns[column][1]
+        values = list()
+
+        for block in range(first_row // self.block_rows, (first_row + row_count - 1) // self.block_rows + 1):
+            offset, length = self._blocks[block][column]
+            buffer = zlib.decompress(self._view[offset : offset + length])
+            start = max(first_row - block * self.block_rows, 0)
+            stop = min(first_row + row_count - block * self.block_rows, self.block_rows)
+
+            if kind == "uuid":
+                values.extend(buffer[position * 16 : position * 16 + 16] for position in range(start, stop))
+            elif kind == "text":
+                values.extend(memoryview(buffer).cast("H")[start:stop])
+            else:
+                values.extend(_decode_int64(buffer)[start:stop])
+
+        return values
+
+    def _decode_column(self, name: str, kind: str, first_row: int, row_count: int) -> list[typing.Any]:
+        if row_count <= 0:
+            return list()
+
+        values = self._read_column(name, first_row, row_count)
+        if kind == "uuid":
+            return [UUID(bytes=value) for value in values]
+        if kind == "timestamp":
+            return [EPOCH + datetime.timedelta(microseconds=value) for value in values]
+        if kind == "decimal":
+            return [decimal.Decimal(value).scaleb(-DECIMAL_SCALE) for value in values]
+        return [self._dictionaries[name][code] for code in values]
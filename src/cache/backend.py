@@ -0,0 +1,255 @@
+import abc
+import asyncio
+import logging
+import typing
+from enum import Enum
+
+from src.cache.codec import CacheCodec
+from src.cache.local import CacheStats
+from src.cache.policy import CachePolicy, default_cache_policy
+from src.utilities.exceptions.database import EntityDoesNotExist
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE_CACHE_PAYLOAD = "\x00not-found"
+
+
+class SessionRotation(str, Enum):
+    ROTATED: str = "rotated"
+    MISSING: str = "missing"
+    REUSED: str = "reused"
+    UNAVAILABLE: str = "unavailable"
+
+
+class CacheBackend(abc.ABC):
+    """
+    The cache interface used by the CRUD interfaces. Storage is left to the implementations, while the
+    cache-aside behaviour built on top of it (coalesced loads, negative entries and stale-while-revalidate)
+    is shared here.
+    """
+
+    def __init__(self):
+        self.stats: dict[str, CacheStats] = {"negative": CacheStats()}
+        self._in_flight_loads: dict[str, asyncio.Task] = dict()
+
+    @abc.abstractmethod
+    async def connect(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def disconnect(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def _get(self, key: str, codec: CacheCodec | None, policy: CachePolicy) -> tuple[typing.Any | None, bool]:
+        """
+        Return the cached value (or `None`) and whether it is inside the stale window of `policy`.
+        """
+
+    @abc.abstractmethod
+    async def get_many(self, keys: typing.Sequence[str], codec: CacheCodec | None = None) -> list[typing.Any | None]:
+        """
+        Return the cached values in the order of `keys`, with `None` for misses and not-found entries.
+        """
+
+    @abc.abstractmethod
+    async def set_many(
+        self,
+        values: dict[str, typing.Any],
+        codec: CacheCodec | None = None,
+        tags: dict[str, str] | None = None,
+        policy: CachePolicy = default_cache_policy,
+    ) -> None:
+        """
+        Store every key of `values` at once and register it under its entry in `tags`.
+        """
+
+    @abc.abstractmethod
+    async def set_negative(self, key: str) -> None:
+        """
+        Remember for a short while that `key` has no backing row. Writing the entity under the same key
+        overwrites the entry, so creates clear it implicitly.
+        """
+
+    @abc.abstractmethod
+    async def delete_many(self, keys: typing.Sequence[str]) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def invalidate(self, tag: str) -> None:
+        """
+        Drop every key registered under `tag`.
+        """
+
+    @abc.abstractmethod
+    async def read_timeline(self, key: str, offset: int, limit: int, codec: CacheCodec) -> list[typing.Any] | None:
+        """
+        Return `limit` entries of the timeline at `key` starting at `offset`, or `None` when it is not cached.
+        """
+
+    @abc.abstractmethod
+    async def get_timeline_generation(self, key: str) -> str:
+        ...
+
+    @abc.abstractmethod
+    async def fill_timeline(
+        self,
+        key: str,
+        entries: typing.Sequence[tuple[float, typing.Any]],
+        generation: str,
+        codec: CacheCodec,
+        policy: CachePolicy = default_cache_policy,
+    ) -> bool:
+        """
+        Replace the timeline at `key` with `entries` (score, value), unless an append bumped the generation
+        since `generation` was read; the loaded snapshot could be missing that entry, so it is dropped instead.
+        """
+
+    @abc.abstractmethod
+    async def append_timeline(
+        self, key: str, score: float, value: typing.Any, codec: CacheCodec, policy: CachePolicy = default_cache_policy
+    ) -> None:
+        """
+        Add one entry to the timeline at `key` if it is cached. The generation is bumped either way, so a fill
+        racing with this append cannot store a snapshot without it.
+        """
+
+    @abc.abstractmethod
+    async def drop_timelines(self, keys: typing.Sequence[str], policy: CachePolicy = default_cache_policy) -> None:
+        """
+        Drop the timelines at `keys` and bump their generations, for writes that would otherwise need one
+        append per entry.
+        """
+
+    @abc.abstractmethod
+    async def take_token(self, key: str, capacity: int, refill_rate: float) -> float:
+        """
+        Take one token from the bucket at `key`, which holds up to `capacity` tokens and regains `refill_rate`
+        of them per second. Return 0 when a token was taken, or else the seconds until one is available.
+        """
+
+    @abc.abstractmethod
+    async def rotate_session(self, key: str, token_id: str, new_token_id: str, expire: int) -> SessionRotation:
+        """
+        Replace the token id stored at `key` with `new_token_id` if it still is `token_id`. A different id means
+        `token_id` was already rotated once, so the session at `key` is dropped and `REUSED` is returned.
+        """
+
+    @abc.abstractmethod
+    async def add_expiring_member(self, key: str, member: str, expires_at: float) -> None:
+        """
+        Add `member` to the set at `key` until the epoch time `expires_at`.
+        """
+
+    @abc.abstractmethod
+    async def read_expiring_members(self, key: str) -> dict[str, float] | None:
+        """
+        Return the unexpired members of the set at `key` with their expiry, or `None` when it cannot be read.
+        """
+
+    async def get(self, key: str, codec: CacheCodec | None = None) -> typing.Any | None:
+        """
+        Return the cached value or `None` on a miss; a cached not-found entry raises `EntityDoesNotExist`.
+        """
+        value, _ = await self._get(key=key, codec=codec, policy=default_cache_policy)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: typing.Any,
+        codec: CacheCodec | None = None,
+        tag: str | None = None,
+        policy: CachePolicy = default_cache_policy,
+    ) -> None:
+        """
+        Store `key`; when a `tag` is given the key is also registered under it, so `invalidate` can later drop
+        every key written for the same entity at once.
+        """
+        await self.set_many(values={key: value}, codec=codec, tags={key: tag} if tag else None, policy=policy)
+
+    async def delete(self, key: str) -> None:
+        await self.delete_many(keys=[key])
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Awaitable[typing.Any]],
+        codec: CacheCodec,
+        policy: CachePolicy = default_cache_policy,
+        tag: typing.Callable[[typing.Any], str] | None = None,
+    ) -> typing.Any:
+        """
+        Cache-aside read where concurrent misses for the same key in this worker share a single `loader` call.
+        The load is shielded, so a cancelled caller does not cancel it for the others that are waiting. An
+        entry inside the stale window of its `policy` is returned as is while a background load refreshes it,
+        so `loader` must not depend on the caller's request-scoped resources.
+        """
+        value, is_stale = await self._get(key=key, codec=codec, policy=policy)
+        if value is not None:
+            if is_stale:
+                self._start_load(key=key, loader=loader, codec=codec, policy=policy, tag=tag)
+            return value
+
+        return await asyncio.shield(self._start_load(key=key, loader=loader, codec=codec, policy=policy, tag=tag))
+
+    @property
+    def metrics(self) -> dict[str, dict[str, int | str]]:
+        return {tier: tier_stats.as_dict() for tier, tier_stats in self.stats.items()}
+
+    def _start_load(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Awaitable[typing.Any]],
+        codec: CacheCodec,
+        policy: CachePolicy,
+        tag: typing.Callable[[typing.Any], str] | None,
+    ) -> asyncio.Task:
+        load = self._in_flight_loads.get(key)
+        if load is None:
+            load = asyncio.ensure_future(self._load(key=key, loader=loader, codec=codec, policy=policy, tag=tag))
+            load.add_done_callback(lambda finished_load: self._finish_load(key=key, load=finished_load))
+            self._in_flight_loads[key] = load
+
+        return load
+
+    def _finish_load(self, key: str, load: asyncio.Task) -> None:
+        self._in_flight_loads.pop(key, None)
+
+        if not load.cancelled() and load.exception() and not isinstance(load.exception(), EntityDoesNotExist):
+            logger.warning(f"Cache load for `{key}` failed --- {load.exception()}")
+
+    async def _load(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Awaitable[typing.Any]],
+        codec: CacheCodec,
+        policy: CachePolicy,
+        tag: typing.Callable[[typing.Any], str] | None,
+    ) -> typing.Any:
+        return await self._load_and_set(key=key, loader=loader, codec=codec, policy=policy, tag=tag)
+
+    async def _load_and_set(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Awaitable[typing.Any]],
+        codec: CacheCodec,
+        policy: CachePolicy,
+        tag: typing.Callable[[typing.Any], str] | None,
+    ) -> typing.Any:
+        try:
+            value = codec.to_schema(await loader())
+
+        except EntityDoesNotExist:
+            await self.set_negative(key)
+            raise
+
+        await self.set(key, value, codec=codec, tag=tag(value) if tag else None, policy=policy)
+        return value
+
+    def _raise_if_negative(self, key: str, value: typing.Any) -> typing.Any:
+        if value == NEGATIVE_CACHE_PAYLOAD:
+            self.stats["negative"].record(is_hit=True)
+            raise EntityDoesNotExist(f"Cached entity `{key}` does not exist!")
+
+        return value
@@ -0,0 +1,69 @@
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half-open"
+
+
+class CircuitBreaker:
+    """
+    A consecutive-failure circuit breaker. After `failure_threshold` failures in a row the circuit opens and
+    calls are refused for `reset_timeout` seconds. After that a single probe call is let through
+    (half-open), and its outcome either closes the circuit again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: int):
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: int = reset_timeout
+        self.state: CircuitState = CircuitState.CLOSED
+        self.consecutive_failures: int = 0
+        self.opened_at: float = 0.0
+        self.trips: int = 0
+        self.rejected_calls: int = 0
+        self.probes: int = 0
+        self._is_probe_in_flight: bool = False
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected_calls += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+
+        if self._is_probe_in_flight:
+            self.rejected_calls += 1
+            return False
+
+        self._is_probe_in_flight = True
+        self.probes += 1
+        return True
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._is_probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._is_probe_in_flight = False
+
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                self.trips += 1
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, int | str]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected_calls": self.rejected_calls,
+            "probes": self.probes,
+        }
@@ -0,0 +1,32 @@
+import math
+import time
+
+from src.cache.local import LocalCache
+
+
+class LocalTokenBuckets:
+    """
+    Token buckets held in the memory of this worker, bounded to `max_size` buckets. A bucket evicted or expired
+    (once it would have refilled anyway) starts full again. Nothing is shared between workers, so every worker
+    enforces the limits on its own.
+    """
+
+    def __init__(self, max_size: int):
+        self._buckets: LocalCache = LocalCache(max_size=max_size, expire=1)
+
+    def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        tokens, refilled_at = self._buckets.get(key) or (float(capacity), now)
+        tokens = min(float(capacity), tokens + (now - refilled_at) * refill_rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_rate
+
+        self._buckets.set(key, (tokens, now), expire=math.ceil(capacity / refill_rate) + 1)
+        return retry_after
+
+    def clear(self) -> None:
+        self._buckets.clear()
@@ -0,0 +1,37 @@
+import typing
+
+import pydantic
+
+from src.schemas.models.user import UserModelType
+from src.schemas.routes.balance import BalanceTransferHistoryType, BalanceType
+from src.schemas.routes.character import CharacterType
+
+
+class CacheCodec:
+    """
+    A codec that serializes only the columns exposed by an entity schema and prefixes the payload with
+    the schema version, so entries written by an older release are treated as a cache miss.
+    """
+
+    def __init__(self, name: str, schema: typing.Any, version: int = 1):
+        self._adapter: pydantic.TypeAdapter = pydantic.TypeAdapter(schema)
+        self._header: str = f"{name}/v{version}|"
+
+    def to_schema(self, value: typing.Any) -> typing.Any:
+        return self._adapter.validate_python(value, from_attributes=True)
+
+    def encode(self, value: typing.Any) -> str:
+        return self._header + self._adapter.dump_json(self.to_schema(value)).decode()
+
+    def decode(self, payload: str | None) -> typing.Any | None:
+        if not payload or not payload.startswith(self._header):
+            return None
+        return self._adapter.validate_json(payload[len(self._header) :])
+
+
+user_codec: CacheCodec = CacheCodec(name="user", schema=UserModelType)
+character_codec: CacheCodec = CacheCodec(name="character", schema=CharacterType)
+balance_codec: CacheCodec = CacheCodec(name="balance", schema=BalanceType)
+balance_transfer_history_codec: CacheCodec = CacheCodec(
+    name="balance-transfer-history", schema=BalanceTransferHistoryType
+)
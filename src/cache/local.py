@@ -0,0 +1,84 @@
+import collections
+import time
+import typing
+
+
+class LocalCache:
+    """
+    A bounded in-process LRU cache whose entries expire after a fixed TTL. When `max_bytes` is given, the sizes
+    passed to `set` are also summed and least recently used entries are evicted to keep the total under it.
+    """
+
+    def __init__(self, max_size: int, expire: int, max_bytes: int | None = None):
+        self._max_size: int = max_size
+        self._expire: int = expire
+        self._max_bytes: int | None = max_bytes
+        self._size_in_bytes: int = 0
+        self._entries: collections.OrderedDict[str, tuple[float, int, typing.Any]] = collections.OrderedDict()
+        self.evictions: int = 0
+
+    def get(self, key: str) -> typing.Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def ttl(self, key: str) -> int:
+        """
+        Return the whole seconds `key` has left to live, or -2 when it is missing (as Redis `TTL` does).
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return -2
+
+        return int(entry[0] - time.monotonic())
+
+    def set(self, key: str, value: typing.Any, expire: int | None = None, size: int = 0) -> None:
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + (expire or self._expire), size, value)
+        self._size_in_bytes += size
+
+        while len(self._entries) > self._max_size or (
+            self._max_bytes is not None and self._size_in_bytes > self._max_bytes and len(self._entries) > 1
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size_in_bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_in_bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size_in_bytes = 0
+
+    @property
+    def size_in_bytes(self) -> int:
+        return self._size_in_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def record(self, is_hit: bool) -> None:
+        if is_hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def as_dict(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,24 @@
+from functools import lru_cache
+
+from src.cache.backend import CacheBackend
+from src.cache.memory import AsyncMemoryCache
+from src.cache.redis import AsyncRedis
+from src.config.manager import settings
+
+
+class CacheBackendFactory:
+    def __init__(self, backend: str):
+        self.backend = backend
+
+    def __call__(self) -> CacheBackend:
+        if self.backend == "memory":
+            return AsyncMemoryCache()
+        return AsyncRedis()
+
+
+@lru_cache()
+def get_cache() -> CacheBackend:
+    return CacheBackendFactory(backend=settings.CACHE_BACKEND)()
+
+
+async_cache: CacheBackend = get_cache()
@@ -0,0 +1,181 @@
+import bisect
+import math
+import sys
+import time
+import typing
+
+from src.cache.backend import NEGATIVE_CACHE_PAYLOAD, CacheBackend, SessionRotation
+from src.cache.bucket import LocalTokenBuckets
+from src.cache.codec import CacheCodec
+from src.cache.local import CacheStats, LocalCache
+from src.cache.policy import CachePolicy, default_cache_policy
+from src.config.manager import settings
+
+
+class AsyncMemoryCache(CacheBackend):
+    """
+    A cache backend held in the memory of this worker, for running without Redis. Values, tag sets and timelines
+    share one LRU bounded by `CACHE_MEMORY_MAX_SIZE` entries and `CACHE_MEMORY_MAX_BYTES` of encoded payload.
+    Nothing is shared between workers, so every worker may serve its own copy until that copy expires.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.entries: LocalCache = LocalCache(
+            max_size=settings.CACHE_MEMORY_MAX_SIZE,
+            expire=settings.REDIS_CACHE_EXPIRE,
+            max_bytes=settings.CACHE_MEMORY_MAX_BYTES,
+        )
+        self.buckets: LocalTokenBuckets = LocalTokenBuckets(max_size=settings.RATE_LIMIT_LOCAL_MAX_SIZE)
+        self.stats.update(memory=CacheStats())
+
+    async def connect(self) -> None:
+        self.entries.clear()
+        self.buckets.clear()
+
+    async def disconnect(self) -> None:
+        self.entries.clear()
+        self.buckets.clear()
+
+    async def _get(self, key: str, codec: CacheCodec | None, policy: CachePolicy) -> tuple[typing.Any | None, bool]:
+        payload = self.entries.get(key)
+        is_negative = payload == NEGATIVE_CACHE_PAYLOAD
+        value = payload if is_negative or not codec else codec.decode(payload)
+        self.stats["memory"].record(is_hit=value is not None)
+
+        is_stale = not is_negative and policy.has_stale_window and policy.is_stale(self.entries.ttl(key))
+        return self._raise_if_negative(key=key, value=value), is_stale
+
+    async def get_many(self, keys: typing.Sequence[str], codec: CacheCodec | None = None) -> list[typing.Any | None]:
+        values: list[typing.Any | None] = list()
+
+        for key in keys:
+            payload = self.entries.get(key)
+            if payload == NEGATIVE_CACHE_PAYLOAD:
+                payload = None
+
+            value = codec.decode(payload) if codec else payload
+            self.stats["memory"].record(is_hit=value is not None)
+            values.append(value)
+
+        return values
+
+    async def set_many(
+        self,
+        values: dict[str, typing.Any],
+        codec: CacheCodec | None = None,
+        tags: dict[str, str] | None = None,
+        policy: CachePolicy = default_cache_policy,
+    ) -> None:
+        for key, value in values.items():
+            payload = codec.encode(value) if codec else value
+            self.entries.set(key, payload, expire=policy.expire, size=self._sizeof(key, payload))
+
+            tag = tags.get(key) if tags else None
+            if tag:
+                members = (self.entries.get(f"tag:{tag}") or frozenset()) | {key}
+                self.entries.set(f"tag:{tag}", members, expire=policy.expire, size=self._sizeof(f"tag:{tag}", *members))
+
+    async def set_negative(self, key: str) -> None:
+        self.stats["negative"].record(is_hit=False)
+
+        self.entries.set(
+            key,
+            NEGATIVE_CACHE_PAYLOAD,
+            expire=settings.REDIS_NEGATIVE_CACHE_EXPIRE,
+            size=self._sizeof(key, NEGATIVE_CACHE_PAYLOAD),
+        )
+
+    async def delete_many(self, keys: typing.Sequence[str]) -> None:
+        for key in keys:
+            self.entries.delete(key)
+
+    async def invalidate(self, tag: str) -> None:
+        for key in self.entries.get(f"tag:{tag}") or ():
+            self.entries.delete(key)
+
+        self.entries.delete(f"tag:{tag}")
+
+    async def read_timeline(self, key: str, offset: int, limit: int, codec: CacheCodec) -> list[typing.Any] | None:
+        timeline = self.entries.get(key)
+
+        self.stats["memory"].record(is_hit=timeline is not None)
+        if timeline is None:
+            return None
+
+        return [codec.decode(payload) for _, payload in timeline[offset : offset + limit]]
+
+    async def get_timeline_generation(self, key: str) -> str:
+        return self.entries.get(f"{key}:generation") or "0"
+
+    async def fill_timeline(
+        self,
+        key: str,
+        entries: typing.Sequence[tuple[float, typing.Any]],
+        generation: str,
+        codec: CacheCodec,
+        policy: CachePolicy = default_cache_policy,
+    ) -> bool:
+        if await self.get_timeline_generation(key) != generation:
+            return False
+
+        timeline = sorted((score, codec.encode(value)) for score, value in entries)
+        self.entries.set(key, timeline, expire=policy.expire, size=self._sizeof(key, *(item[1] for item in timeline)))
+        return True
+
+    async def append_timeline(
+        self, key: str, score: float, value: typing.Any, codec: CacheCodec, policy: CachePolicy = default_cache_policy
+    ) -> None:
+        generation = str(int(await self.get_timeline_generation(key)) + 1)
+        self.entries.set(f"{key}:generation", generation, expire=policy.expire, size=self._sizeof(key, generation))
+
+        timeline = self.entries.get(key)
+        if timeline is None:
+            return
+
+        timeline = list(timeline)
+        bisect.insort(timeline, (score, codec.encode(value)))
+        self.entries.set(
+            key,
+            timeline,
+            expire=max(self.entries.ttl(key), 1),
+            size=self._sizeof(key, *(item[1] for item in timeline)),
+        )
+
+    async def drop_timelines(self, keys: typing.Sequence[str], policy: CachePolicy = default_cache_policy) -> None:
+        for key in keys:
+            generation = str(int(await self.get_timeline_generation(key)) + 1)
+            self.entries.set(f"{key}:generation", generation, expire=policy.expire, size=self._sizeof(key, generation))
+            self.entries.delete(key)
+
+    async def take_token(self, key: str, capacity: int, refill_rate: float) -> float:
+        return self.buckets.take(key, capacity=capacity, refill_rate=refill_rate)
+
+    async def rotate_session(self, key: str, token_id: str, new_token_id: str, expire: int) -> SessionRotation:
+        current_token_id = self.entries.get(key)
+        if current_token_id is None:
+            return SessionRotation.MISSING
+
+        if current_token_id != token_id:
+            self.entries.delete(key)
+            return SessionRotation.REUSED
+
+        self.entries.set(key, new_token_id, expire=expire, size=self._sizeof(key, new_token_id))
+        return SessionRotation.ROTATED
+
+    async def add_expiring_member(self, key: str, member: str, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+
+        members = await self.read_expiring_members(key) | {member: expires_at}
+        self.entries.set(
+            key, members, expire=math.ceil(max(members.values()) - time.time()), size=self._sizeof(key, *members)
+        )
+
+    async def read_expiring_members(self, key: str) -> dict[str, float] | None:
+        now = time.time()
+        return {member: expires_at for member, expires_at in (self.entries.get(key) or {}).items() if expires_at > now}
+
+    @staticmethod
+    def _sizeof(*parts: typing.Any) -> int:
+        return sum(len(part) if isinstance(part, str) else sys.getsizeof(part) for part in parts)
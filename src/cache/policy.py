@@ -0,0 +1,41 @@
+from src.config.manager import settings
+
+
+class CachePolicy:
+    """
+    Expiry rules for one family of cache keys. Entries are dropped after `expire` seconds; once an entry is
+    older than `stale_after` seconds it is still served, but a background refresh is started for it.
+    """
+
+    def __init__(self, family: str, expire: int, stale_after: int = 0):
+        self.family: str = family
+        self.expire: int = expire
+        self.stale_after: int = stale_after
+
+    @property
+    def has_stale_window(self) -> bool:
+        return 0 < self.stale_after < self.expire
+
+    def is_stale(self, ttl: int) -> bool:
+        return self.has_stale_window and ttl >= 0 and self.expire - ttl >= self.stale_after
+
+
+default_cache_policy: CachePolicy = CachePolicy(family="default", expire=settings.REDIS_CACHE_EXPIRE)
+user_cache_policy: CachePolicy = CachePolicy(
+    family="user", expire=settings.REDIS_USER_CACHE_EXPIRE, stale_after=settings.REDIS_USER_CACHE_STALE_AFTER
+)
+character_cache_policy: CachePolicy = CachePolicy(
+    family="character",
+    expire=settings.REDIS_CHARACTER_CACHE_EXPIRE,
+    stale_after=settings.REDIS_CHARACTER_CACHE_STALE_AFTER,
+)
+balance_cache_policy: CachePolicy = CachePolicy(family="balance", expire=settings.REDIS_BALANCE_CACHE_EXPIRE)
+balance_history_cache_policy: CachePolicy = CachePolicy(
+    family="balance-history", expire=settings.REDIS_BALANCE_HISTORY_CACHE_EXPIRE
+)
+replica_sticky_cache_policy: CachePolicy = CachePolicy(
+    family="replica-sticky", expire=settings.DB_REPLICA_STICKY_WINDOW
+)
+session_cache_policy: CachePolicy = CachePolicy(
+    family="session", expire=settings.JWT_REFRESH_TOKEN_EXPIRATION_TIME_DAYS * 24 * 60 * 60
+)
@@ -1,39 +1,487 @@
+import asyncio
+import json
+import logging
+import math
+import time
+import typing
+from uuid import uuid4
+
 import redis.asyncio as redis
 from pydantic import RedisDsn
 from redis.client import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import LockError
 
+from src.cache.backend import NEGATIVE_CACHE_PAYLOAD, CacheBackend, SessionRotation
+from src.cache.breaker import CircuitBreaker, CircuitState
+from src.cache.bucket import LocalTokenBuckets
+from src.cache.codec import CacheCodec
+from src.cache.local import CacheStats, LocalCache
+from src.cache.policy import CachePolicy, default_cache_policy
 from src.config.manager import settings
 
 REDIS_URL = "{}://{}:{}".format(settings.REDIS_SCHEMA, settings.REDIS_HOST, settings.REDIS_PORT)
 
+logger = logging.getLogger(__name__)
+
+INVALIDATE_TAG_SCRIPT = """
+local keys = redis.call("SMEMBERS", KEYS[1])
+redis.call("DEL", KEYS[1], unpack(keys))
+return keys
+"""
+
+FILL_TIMELINE_SCRIPT = """
+if (redis.call("GET", KEYS[2]) or "0") ~= ARGV[1] then
+    return 0
+end
+redis.call("DEL", KEYS[1])
+redis.call("ZADD", KEYS[1], "-inf", "")
+for index = 3, #ARGV, 2 do
+    redis.call("ZADD", KEYS[1], ARGV[index], ARGV[index + 1])
+end
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+return 1
+"""
+
+APPEND_TIMELINE_SCRIPT = """
+redis.call("INCR", KEYS[2])
+redis.call("EXPIRE", KEYS[2], ARGV[3])
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    redis.call("ZADD", KEYS[1], ARGV[1], ARGV[2])
+end
+"""
+
+# The clock is read in Redis so that every worker refills the bucket against the same time. Redis truncates Lua
+# numbers to integers, hence the string reply.
+TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "refilled_at")
+local tokens = tonumber(bucket[1]) or capacity
+local refilled_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - refilled_at) * refill_rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / refill_rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "refilled_at", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return tostring(retry_after)
+"""
 
-class AsyncRedis:
+ROTATE_SESSION_SCRIPT = """
+local current_token_id = redis.call("GET", KEYS[1])
+if not current_token_id then
+    return 0
+end
+if current_token_id ~= ARGV[1] then
+    redis.call("DEL", KEYS[1])
+    return -1
+end
+redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
+SESSION_ROTATIONS: dict[int, SessionRotation] = {
+    1: SessionRotation.ROTATED,
+    0: SessionRotation.MISSING,
+    -1: SessionRotation.REUSED,
+}
+
+
+class AsyncRedis(CacheBackend):
     def __init__(self):
+        super().__init__()
         self.redis_url: RedisDsn = RedisDsn(url=REDIS_URL)
         self.redis: Redis | None = None
         self.pool: ConnectionPool | None = None
+        self.worker_id: str = uuid4().hex
+        self.local_cache: LocalCache | None = (
+            LocalCache(max_size=settings.REDIS_LOCAL_CACHE_MAX_SIZE, expire=settings.REDIS_LOCAL_CACHE_EXPIRE)
+            if settings.IS_REDIS_LOCAL_CACHE_ENABLED
+            else None
+        )
+        self.stats.update(local=CacheStats(), redis=CacheStats())
+        self._invalidation_listener: asyncio.Task | None = None
+        self._invalidate_tag_script: AsyncScript | None = None
+        self._fill_timeline_script: AsyncScript | None = None
+        self._append_timeline_script: AsyncScript | None = None
+        self._take_token_script: AsyncScript | None = None
+        self._rotate_session_script: AsyncScript | None = None
+        self.fallback_buckets: LocalTokenBuckets = LocalTokenBuckets(max_size=settings.RATE_LIMIT_LOCAL_MAX_SIZE)
+        self.breaker: CircuitBreaker = CircuitBreaker(
+            failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.REDIS_BREAKER_RESET_TIMEOUT,
+        )
+        self._stale_keys: set[str] = set()
+        self._stale_tags: set[str] = set()
+        self._recovery: asyncio.Task | None = None
 
-    def connect(self):
+    async def connect(self) -> None:
         self.redis = redis.from_url(
-            self.redis_url.unicode_string(), encoding="utf-8", db=settings.REDIS_DB, decode_responses=True
+            self.redis_url.unicode_string(),
+            encoding="utf-8",
+            db=settings.REDIS_DB,
+            decode_responses=True,
+            socket_timeout=settings.REDIS_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_TIMEOUT,
         )
         self.pool = self.redis.connection_pool
+        self._invalidate_tag_script = self.redis.register_script(INVALIDATE_TAG_SCRIPT)
+        self._fill_timeline_script = self.redis.register_script(FILL_TIMELINE_SCRIPT)
+        self._append_timeline_script = self.redis.register_script(APPEND_TIMELINE_SCRIPT)
+        self._take_token_script = self.redis.register_script(TAKE_TOKEN_SCRIPT)
+        self._rotate_session_script = self.redis.register_script(ROTATE_SESSION_SCRIPT)
+
+        if self.local_cache is not None:
+            self._invalidation_listener = asyncio.create_task(self._listen_for_invalidations())
+
+    async def disconnect(self) -> None:
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.cancel()
+
+        await self.redis.close()
+        await self.pool.disconnect()
+
+    async def _get(self, key: str, codec: CacheCodec | None, policy: CachePolicy) -> tuple[typing.Any | None, bool]:
+        if self.local_cache is not None:
+            value = self.local_cache.get(key)
+            self.stats["local"].record(is_hit=value is not None)
+            if value is not None:
+                return self._raise_if_negative(key=key, value=value), False
+
+        async def _get_with_ttl() -> list[typing.Any]:
+            async with self.redis.pipeline(transaction=False) as pipeline:
+                pipeline.get(key)
+                pipeline.ttl(key)
+                return await pipeline.execute()
+
+        if policy.has_stale_window:
+            payload, ttl = await self._call(_get_with_ttl, fallback=(None, -1))
+        else:
+            payload, ttl = await self._call(lambda: self.redis.get(key)), -1
+
+        is_negative = payload == NEGATIVE_CACHE_PAYLOAD
+        value = payload if is_negative or not codec else codec.decode(payload)
+        self.stats["redis"].record(is_hit=value is not None)
+
+        if value is not None and self.local_cache is not None:
+            self.local_cache.set(key, value, expire=settings.REDIS_NEGATIVE_CACHE_EXPIRE if is_negative else None)
+
+        return self._raise_if_negative(key=key, value=value), not is_negative and policy.is_stale(ttl)
+
+    async def get_many(self, keys: typing.Sequence[str], codec: CacheCodec | None = None) -> list[typing.Any | None]:
+        """
+        Return the cached values in the order of `keys`, with `None` for misses and not-found entries. Keys
+        that are not held locally are fetched with a single MGET.
+        """
+        values: list[typing.Any | None] = [None] * len(keys)
+        remote_indexes: list[int] = list()
+
+        for index, key in enumerate(keys):
+            value = self.local_cache.get(key) if self.local_cache is not None else None
+            if self.local_cache is not None:
+                self.stats["local"].record(is_hit=value is not None)
+
+            if value is None or value == NEGATIVE_CACHE_PAYLOAD:
+                remote_indexes.append(index)
+            else:
+                values[index] = value
+
+        if not remote_indexes:
+            return values
+
+        payloads = await self._call(
+            lambda: self.redis.mget([keys[index] for index in remote_indexes]), fallback=[None] * len(remote_indexes)
+        )
+
+        for index, payload in zip(remote_indexes, payloads):
+            if payload == NEGATIVE_CACHE_PAYLOAD:
+                payload = None
+
+            value = codec.decode(payload) if codec else payload
+            self.stats["redis"].record(is_hit=value is not None)
+
+            if value is not None:
+                values[index] = value
+                if self.local_cache is not None:
+                    self.local_cache.set(keys[index], value)
+
+        return values
+
+    async def set_many(
+        self,
+        values: dict[str, typing.Any],
+        codec: CacheCodec | None = None,
+        tags: dict[str, str] | None = None,
+        policy: CachePolicy = default_cache_policy,
+    ) -> None:
+        """
+        Store every key of `values` (and register it under its entry in `tags`) in one MULTI/EXEC pipeline, so
+        a multi-key write is applied atomically and costs a single round trip.
+        """
+        if not values:
+            return
+
+        async def _set_many() -> bool:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                for key, value in values.items():
+                    pipeline.set(key, codec.encode(value) if codec else value, ex=policy.expire)
+
+                    tag = tags.get(key) if tags else None
+                    if tag:
+                        pipeline.sadd(f"tag:{tag}", key)
+                        pipeline.expire(f"tag:{tag}", policy.expire)
+
+                await pipeline.execute()
+            return True
+
+        is_written = await self._call(_set_many, fallback=False, stale_keys=values)
+
+        if is_written and self.local_cache is not None:
+            for key, value in values.items():
+                self.local_cache.set(key, codec.to_schema(value) if codec else value)
+            await self._publish_invalidation(*values)
+
+    async def set_negative(self, key: str) -> None:
+        """
+        Remember for a short while that `key` has no backing row. Writing the entity under the same key
+        overwrites the entry, so creates clear it implicitly.
+        """
+        self.stats["negative"].record(is_hit=False)
+
+        await self._call(lambda: self.redis.set(key, NEGATIVE_CACHE_PAYLOAD, ex=settings.REDIS_NEGATIVE_CACHE_EXPIRE))
+
+        if self.local_cache is not None:
+            self.local_cache.set(key, NEGATIVE_CACHE_PAYLOAD, expire=settings.REDIS_NEGATIVE_CACHE_EXPIRE)
+            await self._publish_invalidation(key)
 
-    def disconnect(self):
-        self.redis.close()
-        self.pool.disconnect()
+    async def delete_many(self, keys: typing.Sequence[str]) -> None:
+        if not keys:
+            return
 
-    async def get(self, key: str) -> str | None:
-        async with self.redis as session:
-            return await session.get(key)
+        await self._call(lambda: self.redis.delete(*keys), stale_keys=keys)
 
-    async def set(self, key: str, value: str | dict) -> None:
-        async with self.redis as session:
-            await session.set(key, value, ex=settings.REDIS_EXPIRATION_TIME)
+        if self.local_cache is not None:
+            for key in keys:
+                self.local_cache.delete(key)
+            await self._publish_invalidation(*keys)
+
+    async def invalidate(self, tag: str) -> None:
+        keys = await self._call(lambda: self._invalidate_tag_script(keys=[f"tag:{tag}"]), fallback=[], stale_tag=tag)
+
+        if self.local_cache is not None and keys:
+            for key in keys:
+                self.local_cache.delete(key)
+            await self._publish_invalidation(*keys)
+
+    async def read_timeline(self, key: str, offset: int, limit: int, codec: CacheCodec) -> list[typing.Any] | None:
+        """
+        Return `limit` entries of the sorted timeline at `key` starting at `offset`, or `None` when the timeline
+        is not cached. Rank 0 is a head member that marks an existing (possibly empty) timeline.
+        """
+        async def _read_timeline() -> list[typing.Any]:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                pipeline.exists(key)
+                pipeline.zrange(key, offset + 1, offset + limit)
+                return await pipeline.execute()
+
+        is_cached, members = await self._call(_read_timeline, fallback=(0, []))
+
+        self.stats["redis"].record(is_hit=bool(is_cached))
+        if not is_cached:
+            return None
+
+        return [codec.decode(member) for member in members]
+
+    async def get_timeline_generation(self, key: str) -> str:
+        return await self._call(lambda: self.redis.get(f"{key}:generation")) or "0"
+
+    async def fill_timeline(
+        self,
+        key: str,
+        entries: typing.Sequence[tuple[float, typing.Any]],
+        generation: str,
+        codec: CacheCodec,
+        policy: CachePolicy = default_cache_policy,
+    ) -> bool:
+        """
+        Replace the timeline at `key` with `entries` (score, value), unless an append bumped the generation
+        since `generation` was read; the loaded snapshot could be missing that entry, so it is dropped instead.
+        """
+        arguments: list[typing.Any] = [generation, policy.expire]
+        for score, value in entries:
+            arguments.extend((score, codec.encode(value)))
+
+        return bool(
+            await self._call(
+                lambda: self._fill_timeline_script(keys=[key, f"{key}:generation"], args=arguments), fallback=0
+            )
+        )
+
+    async def append_timeline(
+        self, key: str, score: float, value: typing.Any, codec: CacheCodec, policy: CachePolicy = default_cache_policy
+    ) -> None:
+        """
+        Add one entry to the timeline at `key` if it is cached. The generation is bumped either way, so a fill
+        racing with this append cannot store a snapshot without it.
+        """
+        arguments = [score, codec.encode(value), policy.expire]
+        await self._call(
+            lambda: self._append_timeline_script(keys=[key, f"{key}:generation"], args=arguments), stale_keys=[key]
+        )
+
+    async def drop_timelines(self, keys: typing.Sequence[str], policy: CachePolicy = default_cache_policy) -> None:
+        if not keys:
+            return
+
+        async def _drop_timelines() -> None:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                for key in keys:
+                    pipeline.incr(f"{key}:generation")
+                    pipeline.expire(f"{key}:generation", policy.expire)
+                    pipeline.delete(key)
+                await pipeline.execute()
+
+        await self._call(_drop_timelines, stale_keys=keys)
+
+    async def take_token(self, key: str, capacity: int, refill_rate: float) -> float:
+        """
+        Take a token from the bucket at `key` atomically for every worker. While Redis is unavailable the bucket
+        of this worker is used instead, so the limits keep holding per worker rather than failing open.
+        """
+        retry_after = await self._call(lambda: self._take_token_script(keys=[key], args=[capacity, refill_rate]))
+        if retry_after is None:
+            return self.fallback_buckets.take(key, capacity=capacity, refill_rate=refill_rate)
+
+        return float(retry_after)
+
+    async def rotate_session(self, key: str, token_id: str, new_token_id: str, expire: int) -> SessionRotation:
+        rotation = await self._call(
+            lambda: self._rotate_session_script(keys=[key], args=[token_id, new_token_id, expire])
+        )
+        return SessionRotation.UNAVAILABLE if rotation is None else SESSION_ROTATIONS[int(rotation)]
+
+    async def add_expiring_member(self, key: str, member: str, expires_at: float) -> None:
+        # The key expires with the member added last, so an already expired one must not move that back.
+        if expires_at <= time.time():
+            return
+
+        async def _add_expiring_member() -> None:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                pipeline.zremrangebyscore(key, "-inf", time.time())
+                pipeline.zadd(key, {member: expires_at})
+                pipeline.expireat(key, math.ceil(expires_at))
+                await pipeline.execute()
+
+        await self._call(_add_expiring_member)
+
+    async def read_expiring_members(self, key: str) -> dict[str, float] | None:
+        members = await self._call(lambda: self.redis.zrangebyscore(key, time.time(), "+inf", withscores=True))
+        return None if members is None else dict(members)
+
+    async def _load(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Awaitable[typing.Any]],
+        codec: CacheCodec,
+        policy: CachePolicy,
+        tag: typing.Callable[[typing.Any], str] | None,
+    ) -> typing.Any:
+        if not settings.IS_REDIS_LOCK_ENABLED or self.breaker.state != CircuitState.CLOSED:
+            return await self._load_and_set(key=key, loader=loader, codec=codec, policy=policy, tag=tag)
+
+        try:
+            async with self.redis.lock(
+                f"lock:{key}",
+                timeout=settings.REDIS_LOCK_TIMEOUT,
+                blocking_timeout=settings.REDIS_LOCK_BLOCKING_TIMEOUT,
+            ):
+                value, is_stale = await self._get(key=key, codec=codec, policy=policy)
+                if value is not None and not is_stale:
+                    return value
+
+                return await self._load_and_set(key=key, loader=loader, codec=codec, policy=policy, tag=tag)
+
+        except (LockError, redis.RedisError, asyncio.TimeoutError):
+            return await self._load_and_set(key=key, loader=loader, codec=codec, policy=policy, tag=tag)
+
+    @property
+    def metrics(self) -> dict[str, dict[str, int | str]]:
+        return super().metrics | {"breaker": self.breaker.as_dict()}
+
+    async def _call(
+        self,
+        command: typing.Callable[[], typing.Awaitable[typing.Any]],
+        fallback: typing.Any = None,
+        stale_keys: typing.Iterable[str] = (),
+        stale_tag: str | None = None,
+    ) -> typing.Any:
+        """
+        Run one Redis command under the circuit breaker and `REDIS_TIMEOUT`. A refused or failed command returns
+        `fallback`, so callers degrade to the database. The keys (or tag) a failed write could not update are
+        invalidated after the next successful command, so values cached before an outage are not served after it.
+        """
+        if self.breaker.allow_request():
+            try:
+                result = await asyncio.wait_for(command(), timeout=settings.REDIS_TIMEOUT)
+
+            except (redis.RedisError, asyncio.TimeoutError, OSError) as redis_error:
+                self.breaker.record_failure()
+                logger.warning(f"Redis command failed --- {redis_error!r}")
+
+            else:
+                self.breaker.record_success()
+                if (self._stale_keys or self._stale_tags) and (self._recovery is None or self._recovery.done()):
+                    self._recovery = asyncio.create_task(self._invalidate_stale_entries())
+                return result
+
+        self._stale_keys.update(stale_keys)
+        if stale_tag:
+            self._stale_tags.add(stale_tag)
+
+        if self.local_cache is not None:
+            for key in stale_keys:
+                self.local_cache.delete(key)
+
+        return fallback
+
+    async def _invalidate_stale_entries(self) -> None:
+        stale_keys, self._stale_keys = self._stale_keys, set()
+        stale_tags, self._stale_tags = self._stale_tags, set()
+
+        await self.delete_many(keys=list(stale_keys))
+        for tag in stale_tags:
+            await self.invalidate(tag=tag)
+
+    async def _publish_invalidation(self, *keys: str) -> None:
+        await self._call(
+            lambda: self.redis.publish(settings.REDIS_INVALIDATION_CHANNEL, f"{self.worker_id}|{json.dumps(keys)}")
+        )
 
-    async def delete(self, key: str) -> None:
-        async with self.redis as session:
-            await session.delete(key)
+    async def _listen_for_invalidations(self) -> None:
+        """
+        Drop local entries that another worker has overwritten or deleted. While the subscription is down
+        the local tier cannot be trusted, so it is cleared before every (re)subscribe.
+        """
+        while True:
+            self.local_cache.clear()
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.REDIS_INVALIDATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
 
+                        origin, _, keys = message["data"].partition("|")
+                        if origin != self.worker_id:
+                            for key in json.loads(keys):
+                                self.local_cache.delete(key)
 
-async_redis: AsyncRedis = AsyncRedis()
+            except redis.RedisError as redis_error:
+                logger.warning(f"Cache invalidation subscription lost --- {redis_error}")
+                await asyncio.sleep(1)
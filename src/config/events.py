@@ -1,14 +1,20 @@
+import asyncio
 import typing
 
 import fastapi
 
-from src.cache.redis import async_redis
+from src.archive.manager import history_archive
+from src.cache.manager import async_cache
 from src.database.events import dispose_db_connection, initialize_db_connection
+from src.securities.authorizations.revocations import run_revocation_sync
+from src.securities.hashing.service import hashing_service
 
 
 def execute_backend_server_event_handler(backend_app: fastapi.FastAPI) -> typing.Any:
     async def launch_backend_server_events() -> None:
-        async_redis.connect()
+        await async_cache.connect()
+        backend_app.state.revocation_sync = asyncio.create_task(run_revocation_sync())
+        hashing_service.start()
         await initialize_db_connection(backend_app=backend_app)
 
     return launch_backend_server_events
@@ -16,7 +22,10 @@ def execute_backend_server_event_handler(backend_app: fastapi.FastAPI) -> typing
 
 def terminate_backend_server_event_handler(backend_app: fastapi.FastAPI) -> typing.Any:
     async def stop_backend_server_events() -> None:
-        async_redis.disconnect()
+        backend_app.state.revocation_sync.cancel()
+        await async_cache.disconnect()
+        hashing_service.shutdown()
+        history_archive.close()
         await dispose_db_connection(backend_app=backend_app)
 
     return stop_backend_server_events
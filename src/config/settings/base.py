@@ -32,6 +32,9 @@ class Settings(BaseSettings):
     OPENAPI_URL: str = "/swagger"
     REDOC_URL: str = "/redoc"
     OPENAPI_PREFIX: str = ""
+    API_PAGE_DEFAULT_SIZE: int = int(os.getenv("API_PAGE_DEFAULT_SIZE", 100))
+    API_PAGE_MAX_SIZE: int = int(os.getenv("API_PAGE_MAX_SIZE", 1000))
+    API_STREAM_BATCH_SIZE: int = int(os.getenv("API_STREAM_BATCH_SIZE", 500))
 
     DB_POSTGRES_NAME: str = os.getenv("DB_POSTGRES_NAME")
     DB_POSTGRES_PASSWORD: str = os.getenv("DB_POSTGRES_PASSWORD")
@@ -43,6 +46,15 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 0))
     DB_POOL_OVERFLOW: int = int(os.getenv("DB_POOL_OVERFLOW", 0))
     DB_TIMEOUT: int = int(os.getenv("DB_TIMEOUT", 0))
+    DB_POSTGRES_REPLICA_URIS: str = os.getenv("DB_POSTGRES_REPLICA_URIS", "")
+    DB_REPLICA_STICKY_WINDOW: int = int(os.getenv("DB_REPLICA_STICKY_WINDOW", 5))
+    HISTORY_PARTITION_PREMAKE_MONTHS: int = int(os.getenv("HISTORY_PARTITION_PREMAKE_MONTHS", 3))
+    HISTORY_PARTITION_MAINTENANCE_INTERVAL: int = int(os.getenv("HISTORY_PARTITION_MAINTENANCE_INTERVAL", 3600))
+    HISTORY_RETENTION_MONTHS: int = int(os.getenv("HISTORY_RETENTION_MONTHS", 0))
+    HISTORY_ARCHIVE_DIR: str = os.getenv("HISTORY_ARCHIVE_DIR", "")
+    HISTORY_ARCHIVE_BLOCK_ROWS: int = int(os.getenv("HISTORY_ARCHIVE_BLOCK_ROWS", 4096))
+    LEDGER_SNAPSHOT_INTERVAL: int = int(os.getenv("LEDGER_SNAPSHOT_INTERVAL", 3600))
+    LEDGER_SNAPSHOT_SETTLE_SECONDS: int = int(os.getenv("LEDGER_SNAPSHOT_SETTLE_SECONDS", 300))
 
     IS_DB_ECHO_LOG: bool = os.getenv("IS_DB_ECHO_LOG", "false").lower() in ["true", "1", "t"]
     IS_DB_FORCE_ROLLBACK: bool = os.getenv("IS_DB_FORCE_ROLLBACK", "false").lower() in ["true", "1", "t"]
@@ -51,6 +63,11 @@ class Settings(BaseSettings):
     HASHING_ALGORITHM_LAYER_1: str = os.getenv("HASHING_ALGORITHM_LAYER_1")
     HASHING_ALGORITHM_LAYER_2: str = os.getenv("HASHING_ALGORITHM_LAYER_2")
     HASHING_SALT: str = os.getenv("HASHING_SALT")
+    HASHING_ARGON2_TIME_COST: int = int(os.getenv("HASHING_ARGON2_TIME_COST", 3))
+    HASHING_ARGON2_MEMORY_COST: int = int(os.getenv("HASHING_ARGON2_MEMORY_COST", 65536))
+    HASHING_ARGON2_PARALLELISM: int = int(os.getenv("HASHING_ARGON2_PARALLELISM", 4))
+    HASHING_POOL_WORKERS: int = int(os.getenv("HASHING_POOL_WORKERS", os.cpu_count() or 1))
+    HASHING_QUEUE_MAX_DEPTH: int = int(os.getenv("HASHING_QUEUE_MAX_DEPTH", 64))
 
     JWT_SUBJECT: str = os.getenv("JWT_SUBJECT")
     JWT_TOKEN_PREFIX: str = os.getenv("JWT_TOKEN_PREFIX")
@@ -59,6 +76,9 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY_REFRESH_TOKEN: str = os.getenv("JWT_SECRET_KEY_REFRESH_TOKEN")
     JWT_ACCESS_TOKEN_EXPIRATION_TIME_MIN: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRATION_TIME_MIN", 180))
     JWT_REFRESH_TOKEN_EXPIRATION_TIME_DAYS: int = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRATION_TIME_DAYS", 30))
+    JWT_VERIFIED_TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("JWT_VERIFIED_TOKEN_CACHE_MAX_SIZE", 10000))
+    JWT_VERIFIED_TOKEN_CACHE_EXPIRE: int = int(os.getenv("JWT_VERIFIED_TOKEN_CACHE_EXPIRE", 300))
+    JWT_REVOCATION_SYNC_INTERVAL: int = int(os.getenv("JWT_REVOCATION_SYNC_INTERVAL", 5))
 
     IS_ALLOWED_CREDENTIALS: bool = os.getenv("IS_ALLOWED_CREDENTIALS", "false").lower() in ["true", "1", "t"]
     ALLOWED_ORIGINS: list[str] = [
@@ -78,6 +98,32 @@ class Settings(BaseSettings):
     REDIS_POOL_MAX_SIZE: int = int(os.getenv("REDIS_POOL_MAX_SIZE", 10))
     REDIS_CACHE_EXPIRE: int = int(os.getenv("REDIS_CACHE_EXPIRE", 3600))
     REDIS_TIMEOUT: int = int(os.getenv("REDIS_TIMEOUT", 5))
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("REDIS_BREAKER_FAILURE_THRESHOLD", 5))
+    REDIS_BREAKER_RESET_TIMEOUT: int = int(os.getenv("REDIS_BREAKER_RESET_TIMEOUT", 30))
+    REDIS_USER_CACHE_EXPIRE: int = int(os.getenv("REDIS_USER_CACHE_EXPIRE", 3600))
+    REDIS_USER_CACHE_STALE_AFTER: int = int(os.getenv("REDIS_USER_CACHE_STALE_AFTER", 3000))
+    REDIS_CHARACTER_CACHE_EXPIRE: int = int(os.getenv("REDIS_CHARACTER_CACHE_EXPIRE", 3600))
+    REDIS_CHARACTER_CACHE_STALE_AFTER: int = int(os.getenv("REDIS_CHARACTER_CACHE_STALE_AFTER", 3000))
+    REDIS_BALANCE_CACHE_EXPIRE: int = int(os.getenv("REDIS_BALANCE_CACHE_EXPIRE", 300))
+    REDIS_BALANCE_HISTORY_CACHE_EXPIRE: int = int(os.getenv("REDIS_BALANCE_HISTORY_CACHE_EXPIRE", 600))
+    REDIS_NEGATIVE_CACHE_EXPIRE: int = int(os.getenv("REDIS_NEGATIVE_CACHE_EXPIRE", 30))
+    REDIS_INVALIDATION_CHANNEL: str = os.getenv("REDIS_INVALIDATION_CHANNEL", "cache:invalidation")
+    IS_REDIS_LOCAL_CACHE_ENABLED: bool = os.getenv("IS_REDIS_LOCAL_CACHE_ENABLED", "false").lower() in ["true", "1", "t"]
+    REDIS_LOCAL_CACHE_MAX_SIZE: int = int(os.getenv("REDIS_LOCAL_CACHE_MAX_SIZE", 10000))
+    REDIS_LOCAL_CACHE_EXPIRE: int = int(os.getenv("REDIS_LOCAL_CACHE_EXPIRE", 30))
+    IS_REDIS_LOCK_ENABLED: bool = os.getenv("IS_REDIS_LOCK_ENABLED", "false").lower() in ["true", "1", "t"]
+    REDIS_LOCK_TIMEOUT: int = int(os.getenv("REDIS_LOCK_TIMEOUT", 10))
+    REDIS_LOCK_BLOCKING_TIMEOUT: int = int(os.getenv("REDIS_LOCK_BLOCKING_TIMEOUT", 5))
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "redis")
+    CACHE_MEMORY_MAX_SIZE: int = int(os.getenv("CACHE_MEMORY_MAX_SIZE", 100000))
+    CACHE_MEMORY_MAX_BYTES: int = int(os.getenv("CACHE_MEMORY_MAX_BYTES", 67108864))
+
+    IS_RATE_LIMIT_ENABLED: bool = os.getenv("IS_RATE_LIMIT_ENABLED", "true").lower() in ["true", "1", "t"]
+    RATE_LIMIT_AUTH_IP_CAPACITY: int = int(os.getenv("RATE_LIMIT_AUTH_IP_CAPACITY", 20))
+    RATE_LIMIT_AUTH_IP_PERIOD: int = int(os.getenv("RATE_LIMIT_AUTH_IP_PERIOD", 60))
+    RATE_LIMIT_AUTH_ACCOUNT_CAPACITY: int = int(os.getenv("RATE_LIMIT_AUTH_ACCOUNT_CAPACITY", 5))
+    RATE_LIMIT_AUTH_ACCOUNT_PERIOD: int = int(os.getenv("RATE_LIMIT_AUTH_ACCOUNT_PERIOD", 300))
+    RATE_LIMIT_LOCAL_MAX_SIZE: int = int(os.getenv("RATE_LIMIT_LOCAL_MAX_SIZE", 100000))
 
     class Config(BaseConfig):
         extra = "ignore"
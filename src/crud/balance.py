@@ -1,86 +1,582 @@
-from typing import Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, NoReturn, Sequence
 from uuid import UUID
 
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.cache.redis import async_redis
-from src.models.balance import Balance
-from src.crud.base import BaseCRUDInterface
-from src.models.balance import BalanceTransferHistory
-from src.schemas.routes.balance import BalanceUpdateType, BalanceTransferType
+from src.archive.manager import history_archive
+from src.cache.codec import balance_codec, balance_transfer_history_codec
+from src.cache.manager import async_cache
+from src.cache.policy import balance_cache_policy, balance_history_cache_policy
+from src.config.manager import settings
+from src.crud.base import BaseCRUDInterface, read_from_replica
+from src.database.db import is_replica_read
+from src.models.balance import Balance, BalanceSnapshot, BalanceTransferHistory
+from src.schemas.routes.balance import (
+    BalanceTransferHistoryType,
+    BalanceTransferResultType,
+    BalanceTransferType,
+    BalanceUpdateType,
+)
 from src.utilities.exceptions.database import EntityDoesNotExist
+from src.utilities.generators.uuid_generator import generate_uuid7
 
 
 class BalanceCRUDInterface(BaseCRUDInterface):
     async def update_balance(self, balance_update: BalanceUpdateType) -> Balance:
-        stmt = sqlalchemy.select(Balance).where(Balance.user_id == balance_update.user_id)
-        query = await self.async_session.execute(statement=stmt)
+        """
+        Apply the delta with a single `UPDATE ... RETURNING` and record it in the same transaction. The amount
+        is changed by the database, so concurrent updates cannot overwrite each other.
+        """
+        update_stmt = (
+            sqlalchemy.update(Balance)
+            .where(Balance.user_id == balance_update.user_id)
+            .values(amount=Balance.amount + balance_update.amount)
+            .returning(Balance)
+        )
+        if balance_update.amount < 0:
+            update_stmt = update_stmt.where(Balance.amount + balance_update.amount >= 0)
+
+        query = await self.async_session.execute(statement=sqlalchemy.select(Balance).from_statement(update_stmt))
         balance = query.scalar()
 
         if not balance:
-            raise EntityDoesNotExist("Balance for user with id `{id}` does not exist!")
+            await self.raise_for_unmatched_update(self.async_session, balance_update.user_id)
 
-        balance.amount += balance_update.amount
+        update_history = await self._insert_balance_history(
+            sqlalchemy.insert(BalanceTransferHistory).values(
+                balance_id=balance.id,
+                amount=balance_update.amount,
+                balance_before=balance.amount - balance_update.amount,
+                balance_after=balance.amount,
+                operation_type="update",
+            )
+        )
 
+        self.async_session.expunge(balance)
+        await self.mark_written(balance.user_id)
         await self.async_session.commit()
-        await self.async_session.refresh(instance=balance)
 
-        await async_redis.set(f"balance:{balance.user_id}", balance.__dict__)
+        await async_cache.set(f"balance:{balance.user_id}", balance, codec=balance_codec, policy=balance_cache_policy)
+        await self._append_balance_history(user_id=balance.user_id, history=update_history)
 
         return balance
 
     async def transfer_balance(self, balance_transfer: BalanceTransferType) -> BalanceTransferHistory:
-        from_stmt = sqlalchemy.select(Balance).where(Balance.user_id == balance_transfer.from_user_id)
-        to_stmt = sqlalchemy.select(Balance).where(Balance.user_id == balance_transfer.to_user_id)
+        """
+        Debit the sender, credit the receiver and record the transfer in one statement (see
+        `build_transfer_statement`); an empty result is rolled back.
+        """
+        if balance_transfer.from_user_id == balance_transfer.to_user_id:
+            raise ValueError("Cannot transfer balance to the same user!")
 
-        from_query = await self.async_session.execute(statement=from_stmt)
-        to_query = await self.async_session.execute(statement=to_stmt)
+        insert_stmt = self.build_transfer_statement(
+            from_user_id=balance_transfer.from_user_id,
+            to_user_id=balance_transfer.to_user_id,
+            amount=balance_transfer.amount,
+            fee_amount=balance_transfer.fee_amount,
+        )
 
-        from_balance = from_query.scalar()
-        to_balance = to_query.scalar()
+        transfer_history = await self._insert_balance_history(insert_stmt)
 
-        if not from_balance or not to_balance:
-            raise EntityDoesNotExist("One of the users does not have a balance record!")
+        if not transfer_history:
+            await self.raise_for_unmatched_update(
+                self.async_session, balance_transfer.from_user_id, balance_transfer.to_user_id
+            )
 
-        if from_balance.amount < balance_transfer.amount + balance_transfer.fee_amount:
-            raise ValueError("Insufficient balance!")
+        await self.mark_written(balance_transfer.from_user_id, balance_transfer.to_user_id)
+        await self.async_session.commit()
 
-        from_balance.amount -= (balance_transfer.amount + balance_transfer.fee_amount)
-        to_balance.amount += balance_transfer.amount
+        await async_cache.delete_many(
+            keys=[f"balance:{balance_transfer.from_user_id}", f"balance:{balance_transfer.to_user_id}"]
+        )
+        await self._append_balance_history(user_id=balance_transfer.from_user_id, history=transfer_history)
+        await async_cache.drop_timelines(
+            keys=[f"balance:history:{balance_transfer.to_user_id}"], policy=balance_history_cache_policy
+        )
 
-        transfer_history = BalanceTransferHistory(
-            balance_id=from_balance.id,
-            amount=balance_transfer.amount,
-            balance_before=from_balance.amount,
-            balance_after=from_balance.amount - balance_transfer.amount,
-            operation_type="transfer",
+        return transfer_history
+
+    async def transfer_balances(
+        self, balance_transfers: Sequence[BalanceTransferType]
+    ) -> list[BalanceTransferResultType]:
+        """
+        Apply many transfers in one transaction, in the order given. Every involved balance is locked up front
+        with one `SELECT ... FOR UPDATE` ordered by `balance.id`, so overlapping batches always lock rows in the
+        same order and cannot deadlock. A transfer that cannot be applied is reported and skipped, the rest are
+        written with one UPDATE and one bulk INSERT of both sides' history rows.
+        """
+        user_ids = {transfer.from_user_id for transfer in balance_transfers} | {
+            transfer.to_user_id for transfer in balance_transfers
+        }
+        lock_stmt = (
+            sqlalchemy.select(Balance.id, Balance.user_id, Balance.amount)
+            .where(Balance.user_id.in_(user_ids))
+            .order_by(Balance.id)
+            .with_for_update()
         )
+        lock_query = await self.async_session.execute(statement=lock_stmt)
+        balances = {user_id: (balance_id, amount) for balance_id, user_id, amount in lock_query.all()}
+        amounts = {user_id: amount for user_id, (_, amount) in balances.items()}
+
+        results: list[BalanceTransferResultType] = list()
+        history_rows: list[dict] = list()
+        credit_rows: list[dict] = list()
+
+        for index, transfer in enumerate(balance_transfers):
+            debit_amount = transfer.amount + transfer.fee_amount
+            missing_user_ids = [
+                user_id for user_id in (transfer.from_user_id, transfer.to_user_id) if user_id not in balances
+            ]
+
+            if missing_user_ids:
+                detail = f"Balance for user with id `{missing_user_ids[0]}` does not exist!"
+            elif transfer.from_user_id == transfer.to_user_id:
+                detail = "Cannot transfer balance to the same user!"
+            elif amounts[transfer.from_user_id] < debit_amount:
+                detail = "Insufficient balance!"
+            else:
+                detail = None
+
+            if detail:
+                results.append(BalanceTransferResultType(index=index, is_applied=False, detail=detail))
+                continue
 
-        self.async_session.add(instance=transfer_history)
+            history_rows.append(
+                dict(
+                    id=generate_uuid7(),
+                    balance_id=balances[transfer.from_user_id][0],
+                    amount=transfer.amount,
+                    balance_before=amounts[transfer.from_user_id],
+                    balance_after=amounts[transfer.from_user_id] - debit_amount,
+                    operation_type="transfer",
+                )
+            )
+            credit_rows.append(
+                dict(
+                    id=generate_uuid7(),
+                    balance_id=balances[transfer.to_user_id][0],
+                    amount=transfer.amount,
+                    balance_before=amounts[transfer.to_user_id],
+                    balance_after=amounts[transfer.to_user_id] + transfer.amount,
+                    operation_type="transfer_credit",
+                )
+            )
+            amounts[transfer.from_user_id] -= debit_amount
+            amounts[transfer.to_user_id] += transfer.amount
+            results.append(BalanceTransferResultType(index=index, is_applied=True))
+
+        if not history_rows:
+            await self.async_session.rollback()
+            return results
+
+        changed_rows = [
+            (balances[user_id][0], amount) for user_id, amount in amounts.items() if amount != balances[user_id][1]
+        ]
+        if changed_rows:
+            changed_amounts = sqlalchemy.values(
+                sqlalchemy.column("id", sqlalchemy.UUID),
+                sqlalchemy.column("amount", Balance.amount.type),
+                name="changed_amounts",
+            ).data(changed_rows)
+            update_stmt = (
+                sqlalchemy.update(Balance)
+                .where(Balance.id == changed_amounts.c.id)
+                .values(amount=changed_amounts.c.amount)
+            )
+            await self.async_session.execute(statement=update_stmt)
+
+        history_query = await self.async_session.scalars(
+            sqlalchemy.insert(BalanceTransferHistory).returning(BalanceTransferHistory, sort_by_parameter_order=True),
+            history_rows + credit_rows,
+        )
+        transfer_histories = iter(
+            balance_transfer_history_codec.to_schema(history) for history in history_query.all()[: len(history_rows)]
+        )
+        await self.mark_written(*balances)
         await self.async_session.commit()
-        await self.async_session.refresh(instance=transfer_history)
 
-        return transfer_history
+        for result in results:
+            if result.is_applied:
+                result.transfer = next(transfer_histories)
+
+        await async_cache.delete_many(keys=[f"balance:{user_id}" for user_id in balances])
+        await async_cache.drop_timelines(
+            keys=[f"balance:history:{user_id}" for user_id in balances], policy=balance_history_cache_policy
+        )
+
+        return results
+
+    @read_from_replica(subject="user_id")
+    async def get_balance_history(
+        self, user_id: UUID, after: tuple[datetime, UUID] | None = None, limit: int = settings.API_PAGE_DEFAULT_SIZE
+    ) -> Sequence[BalanceTransferHistoryType]:
+        """
+        Return one keyset page of the history ordered by (`created_at`, `id`), starting after `after`. The first
+        page is served from a cached timeline holding the oldest `API_PAGE_MAX_SIZE` entries plus later appends;
+        later pages are read from the archive and the database.
+        """
+        if after is not None:
+            balance_id = await self._get_balance_id(self.async_session, user_id=user_id)
+            return await self._read_balance_history(balance_id=balance_id, after=after, limit=limit)
 
-    async def get_balance_history(self, user_id: UUID) -> Sequence[BalanceTransferHistory]:
         cache_key = f"balance:history:{user_id}"
-        cached_history = await async_redis.get(cache_key)
-        if cached_history:
-            return [BalanceTransferHistory(**record) for record in cached_history]
+        cached_history = await async_cache.read_timeline(
+            cache_key, offset=0, limit=limit, codec=balance_transfer_history_codec
+        )
+        if cached_history is not None:
+            return cached_history
 
-        balance_stmt = sqlalchemy.select(Balance).where(Balance.user_id == user_id)
-        balance_query = await self.async_session.execute(statement=balance_stmt)
-        balance = balance_query.scalar()
+        generation = await async_cache.get_timeline_generation(cache_key)
+        balance_id = await self._get_balance_id(self.async_session, user_id=user_id)
+        history = await self._read_balance_history(balance_id=balance_id, limit=settings.API_PAGE_MAX_SIZE)
 
-        if not balance:
-            raise EntityDoesNotExist("Balance for user with id `{id}` does not exist!")
+        await async_cache.fill_timeline(
+            cache_key,
+            entries=[(record.created_at.timestamp(), record) for record in history],
+            generation=generation,
+            codec=balance_transfer_history_codec,
+            policy=balance_history_cache_policy,
+        )
+
+        return history[:limit]
+
+    @read_from_replica(subject="user_id")
+    async def stream_balance_history(
+        self, user_id: UUID, after: tuple[datetime, UUID] | None = None
+    ) -> AsyncIterator[BalanceTransferHistory | BalanceTransferHistoryType]:
+        """
+        Stream the whole history after `after`, the archived part first. A missing balance raises before anything
+        is streamed.
+        """
+        balance_id = await self._get_balance_id(self.async_session, user_id=user_id)
+        is_read_only = is_replica_read.get()
 
-        history_stmt = sqlalchemy.select(BalanceTransferHistory).where(BalanceTransferHistory.balance_id == balance.id)
+        async def _stream() -> AsyncIterator[BalanceTransferHistory | BalanceTransferHistoryType]:
+            position = after
+            while True:
+                archived_history = await history_archive.read_group(
+                    "balance_transfer_history", balance_id, after=position, limit=settings.API_STREAM_BATCH_SIZE
+                )
+                for record in archived_history:
+                    yield balance_transfer_history_codec.to_schema(record)
+
+                if archived_history:
+                    position = (archived_history[-1]["created_at"], archived_history[-1]["id"])
+                if len(archived_history) < settings.API_STREAM_BATCH_SIZE:
+                    break
+
+            history_stmt = self._page_balance_history(balance_id=balance_id, after=position)
+            async for record in self.detached_stream(history_stmt, is_read_only=is_read_only):
+                yield record
+
+        return _stream()
+
+    @read_from_replica(subject="user_id")
+    async def get_balance_at(self, user_id: UUID, at: datetime) -> Decimal:
+        """
+        Return the amount of the balance at `at`, replaying only the history between `at` and the nearest
+        snapshot: forward from the latest snapshot taken at or before `at`, or backward from the earliest one
+        after it. Before the first snapshot is taken, the current amount is rolled back instead.
+        """
+        balance_id = await self._get_balance_id(self.async_session, user_id=user_id)
+
+        snapshot_stmt = (
+            sqlalchemy.select(BalanceSnapshot)
+            .where(BalanceSnapshot.balance_id == balance_id, BalanceSnapshot.taken_at <= at)
+            .order_by(BalanceSnapshot.taken_at.desc())
+            .limit(1)
+        )
+        snapshot = (await self.async_session.execute(statement=snapshot_stmt)).scalar()
+        if snapshot:
+            return snapshot.amount + await self._sum_balance_history(balance_id, after=snapshot.taken_at, until=at)
+
+        snapshot_stmt = (
+            sqlalchemy.select(BalanceSnapshot)
+            .where(BalanceSnapshot.balance_id == balance_id, BalanceSnapshot.taken_at > at)
+            .order_by(BalanceSnapshot.taken_at)
+            .limit(1)
+        )
+        snapshot = (await self.async_session.execute(statement=snapshot_stmt)).scalar()
+        if snapshot:
+            return snapshot.amount - await self._sum_balance_history(balance_id, after=at, until=snapshot.taken_at)
+
+        amount_query = await self.async_session.execute(
+            statement=sqlalchemy.select(Balance.amount).where(Balance.id == balance_id)
+        )
+        return amount_query.scalar() - await self._sum_balance_history(balance_id, after=at)
+
+    async def take_balance_snapshots(self, taken_at: datetime) -> int:
+        """
+        Snapshot every balance that changed since the previous run as of `taken_at`, by adding the history in
+        between to its latest snapshot, so a run costs O(recent activity). A balance without any snapshot gets
+        its current amount minus the history after `taken_at` instead. Returns the number of snapshots taken.
+        """
+        since_query = await self.async_session.execute(
+            statement=sqlalchemy.select(sqlalchemy.func.max(BalanceSnapshot.taken_at))
+        )
+        since = since_query.scalar()
+        snapshot_count = 0
+
+        if since is not None:
+            active = (
+                sqlalchemy.select(BalanceTransferHistory.balance_id)
+                .where(BalanceTransferHistory.created_at > since, BalanceTransferHistory.created_at <= taken_at)
+                .distinct()
+                .cte(name="active")
+            )
+            latest = (
+                sqlalchemy.select(BalanceSnapshot.amount, BalanceSnapshot.taken_at)
+                .where(BalanceSnapshot.balance_id == active.c.balance_id)
+                .order_by(BalanceSnapshot.taken_at.desc())
+                .limit(1)
+                .lateral(name="latest")
+            )
+            changes = self._balance_history_delta(
+                active.c.balance_id,
+                BalanceTransferHistory.created_at > latest.c.taken_at,
+                BalanceTransferHistory.created_at <= taken_at,
+            )
+            snapshot_query = await self.async_session.execute(
+                statement=self._build_snapshot_statement(
+                    sqlalchemy.select(active.c.balance_id, latest.c.amount + changes, self._taken_at(taken_at))
+                    .select_from(active)
+                    .join(latest, sqlalchemy.true())
+                )
+            )
+            snapshot_count += snapshot_query.rowcount
+
+        later_changes = self._balance_history_delta(Balance.id, BalanceTransferHistory.created_at > taken_at)
+        snapshot_query = await self.async_session.execute(
+            statement=self._build_snapshot_statement(
+                sqlalchemy.select(Balance.id, Balance.amount - later_changes, self._taken_at(taken_at)).where(
+                    ~sqlalchemy.exists().where(BalanceSnapshot.balance_id == Balance.id)
+                )
+            )
+        )
+        snapshot_count += snapshot_query.rowcount
+
+        await self.async_session.commit()
+        return snapshot_count
+
+    @staticmethod
+    def _balance_history_delta(
+        balance_id: sqlalchemy.ColumnElement, *conditions: sqlalchemy.ColumnElement[bool]
+    ) -> sqlalchemy.ScalarSelect:
+        return (
+            sqlalchemy.select(
+                sqlalchemy.func.coalesce(
+                    sqlalchemy.func.sum(BalanceTransferHistory.balance_after - BalanceTransferHistory.balance_before),
+                    0,
+                )
+            )
+            .where(BalanceTransferHistory.balance_id == balance_id, *conditions)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _taken_at(taken_at: datetime) -> sqlalchemy.ColumnElement:
+        return sqlalchemy.literal(taken_at, BalanceSnapshot.taken_at.type)
+
+    @staticmethod
+    def _build_snapshot_statement(snapshots: sqlalchemy.Select) -> sqlalchemy.Insert:
+        # `id` is left to the column's server default. A snapshot of the same instant is only ever taken once.
+        return (
+            postgresql.insert(BalanceSnapshot)
+            .from_select(["balance_id", "amount", "taken_at"], snapshots, include_defaults=False)
+            .on_conflict_do_nothing(index_elements=["balance_id", "taken_at"])
+        )
+
+    async def _sum_balance_history(self, balance_id: UUID, after: datetime, until: datetime | None = None) -> Decimal:
+        """
+        Return the net change of the balance over (`after`, `until`], including the archived months.
+        """
+        conditions = [BalanceTransferHistory.created_at > after]
+        if until is not None:
+            conditions.append(BalanceTransferHistory.created_at <= until)
+        archived_until = history_archive.archived_until("balance_transfer_history")
+        if archived_until is not None:
+            conditions.append(BalanceTransferHistory.created_at >= archived_until)
+        delta_query = await self.async_session.execute(
+            statement=sqlalchemy.select(self._balance_history_delta(balance_id, *conditions))
+        )
+        delta = delta_query.scalar()
+
+        position = (after, UUID(int=(1 << 128) - 1))
+        while True:
+            archived_history = await history_archive.read_group(
+                "balance_transfer_history", balance_id, after=position, limit=settings.API_STREAM_BATCH_SIZE
+            )
+            for record in archived_history:
+                if until is None or record["created_at"] <= until:
+                    delta += record["balance_after"] - record["balance_before"]
+
+            if len(archived_history) < settings.API_STREAM_BATCH_SIZE or (
+                until is not None and archived_history[-1]["created_at"] > until
+            ):
+                return delta
+            position = (archived_history[-1]["created_at"], archived_history[-1]["id"])
+
+    @staticmethod
+    async def _get_balance_id(async_session: AsyncSession, user_id: UUID) -> UUID:
+        balance_stmt = sqlalchemy.select(Balance.id).where(Balance.user_id == user_id)
+        balance_query = await async_session.execute(statement=balance_stmt)
+        balance_id = balance_query.scalar()
+
+        if not balance_id:
+            raise EntityDoesNotExist(f"Balance for user with id `{user_id}` does not exist!")
+
+        return balance_id
+
+    async def _read_balance_history(
+        self, balance_id: UUID, after: tuple[datetime, UUID] | None = None, limit: int = settings.API_PAGE_DEFAULT_SIZE
+    ) -> list[BalanceTransferHistoryType]:
+        """
+        Read the page from the archive first, since archived months precede every attached partition, and fill
+        whatever is left of it from the database.
+        """
+        archived_history = await history_archive.read_group(
+            "balance_transfer_history", balance_id, after=after, limit=limit
+        )
+        history = [balance_transfer_history_codec.to_schema(record) for record in archived_history]
+        if len(history) == limit:
+            return history
+
+        if history:
+            after = (history[-1].created_at, history[-1].id)
+        history_stmt = self._page_balance_history(balance_id=balance_id, after=after).limit(limit - len(history))
         history_query = await self.async_session.execute(statement=history_stmt)
-        history = history_query.scalars().all()
+        return history + [balance_transfer_history_codec.to_schema(record) for record in history_query.scalars().all()]
+
+    @staticmethod
+    def _page_balance_history(balance_id: UUID, after: tuple[datetime, UUID] | None = None) -> sqlalchemy.Select:
+        history_stmt = sqlalchemy.select(BalanceTransferHistory).where(BalanceTransferHistory.balance_id == balance_id)
+        if after is not None:
+            position = (BalanceTransferHistory.created_at, BalanceTransferHistory.id)
+            history_stmt = history_stmt.where(
+                sqlalchemy.tuple_(*position) > sqlalchemy.tuple_(*after, types=[column.type for column in position]),
+                # Implied by the row comparison, but only a plain bound on `created_at` prunes the monthly partitions.
+                BalanceTransferHistory.created_at >= after[0],
+            )
 
-        await async_redis.set(cache_key, [record.__dict__ for record in history])
+        return history_stmt.order_by(BalanceTransferHistory.created_at, BalanceTransferHistory.id)
+
+    async def _insert_balance_history(self, insert_stmt: sqlalchemy.Insert) -> BalanceTransferHistory | None:
+        query = await self.async_session.execute(
+            statement=sqlalchemy.select(BalanceTransferHistory).from_statement(
+                insert_stmt.returning(BalanceTransferHistory)
+            )
+        )
+        history = query.scalar()
 
+        if history:
+            self.async_session.expunge(history)
         return history
 
+    @staticmethod
+    def build_transfer_statement(
+        from_user_id: UUID,
+        to_user_id: UUID,
+        amount: Decimal,
+        fee_amount: Decimal,
+        precondition: sqlalchemy.ColumnElement[bool] | None = None,
+    ) -> sqlalchemy.Insert:
+        """
+        Build the single statement of a transfer: debit and credit CTEs feeding an `INSERT ... SELECT` of the
+        history rows, one per side, so the history of either balance can be replayed. The debit only matches
+        while the sender can cover the amount and the fee (and `precondition` holds), and the rows are only
+        inserted when both updates matched. The statement returns the sender's row.
+
+        Both balances are locked first, in `balance.id` order as `transfer_balances` does, so two transfers in
+        opposite directions cannot each hold the row the other one waits for.
+        """
+        locked = (
+            sqlalchemy.select(Balance.id)
+            .where(Balance.user_id.in_([from_user_id, to_user_id]))
+            .order_by(Balance.id)
+            .with_for_update()
+            .cte(name="locked")
+            .prefix_with("MATERIALIZED")
+        )
+
+        debit_amount = amount + fee_amount
+        debit_conditions = [
+            Balance.user_id == from_user_id,
+            Balance.id.in_(sqlalchemy.select(locked.c.id)),
+            Balance.amount >= debit_amount,
+        ]
+        if precondition is not None:
+            debit_conditions.append(precondition)
+
+        debited = (
+            sqlalchemy.update(Balance)
+            .where(*debit_conditions)
+            .values(amount=Balance.amount - debit_amount)
+            .returning(Balance.id, Balance.amount)
+            .cte(name="debited")
+        )
+        credited = (
+            sqlalchemy.update(Balance)
+            .where(Balance.user_id == to_user_id, sqlalchemy.exists(sqlalchemy.select(debited.c.id)))
+            .values(amount=Balance.amount + amount)
+            .returning(Balance.id, Balance.amount)
+            .cte(name="credited")
+        )
+        credit_recorded = (
+            sqlalchemy.insert(BalanceTransferHistory)
+            .from_select(
+                ["id", "balance_id", "amount", "balance_before", "balance_after", "operation_type"],
+                sqlalchemy.select(
+                    sqlalchemy.literal(generate_uuid7(), BalanceTransferHistory.id.type),
+                    credited.c.id,
+                    sqlalchemy.literal(amount, BalanceTransferHistory.amount.type),
+                    credited.c.amount - amount,
+                    credited.c.amount,
+                    sqlalchemy.literal("transfer_credit", BalanceTransferHistory.operation_type.type),
+                ),
+                include_defaults=False,
+            )
+            .returning(BalanceTransferHistory.id)
+            .cte(name="credit_recorded")
+        )
+
+        return sqlalchemy.insert(BalanceTransferHistory).from_select(
+            ["id", "balance_id", "amount", "balance_before", "balance_after", "operation_type"],
+            sqlalchemy.select(
+                sqlalchemy.literal(generate_uuid7(), BalanceTransferHistory.id.type),
+                debited.c.id,
+                sqlalchemy.literal(amount, BalanceTransferHistory.amount.type),
+                debited.c.amount + debit_amount,
+                debited.c.amount,
+                sqlalchemy.literal("transfer", BalanceTransferHistory.operation_type.type),
+            ).where(sqlalchemy.exists(sqlalchemy.select(credit_recorded.c.id))),
+            include_defaults=False,
+        )
+
+    @staticmethod
+    async def raise_for_unmatched_update(async_session: AsyncSession, *user_ids: UUID) -> NoReturn:
+        """
+        A conditional update matched no row: roll it back and tell a missing balance from an insufficient one.
+        """
+        stmt = sqlalchemy.select(Balance.user_id).where(Balance.user_id.in_(user_ids))
+        query = await async_session.execute(statement=stmt)
+        existing_user_ids = set(query.scalars().all())
+        await async_session.rollback()
+
+        for user_id in user_ids:
+            if user_id not in existing_user_ids:
+                raise EntityDoesNotExist(f"Balance for user with id `{user_id}` does not exist!")
+
+        raise ValueError("Insufficient balance!")
+
+    async def _append_balance_history(self, user_id: UUID, history: BalanceTransferHistory) -> None:
+        await async_cache.append_timeline(
+            f"balance:history:{user_id}",
+            score=history.created_at.timestamp(),
+            value=history,
+            codec=balance_transfer_history_codec,
+            policy=balance_history_cache_policy,
+        )
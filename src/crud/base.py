@@ -1,10 +1,16 @@
+import functools
+import inspect
 import typing
+from uuid import UUID
 
+import sqlalchemy
 from fastapi import Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache.manager import async_cache
+from src.cache.policy import replica_sticky_cache_policy
 from src.config.manager import settings
-from src.database.db import get_async_session
+from src.database.db import async_db, get_async_session, is_replica_read
 from src.schemas.jwt import JWTUser
 from src.securities.authorizations.jwt import jwt_generator
 from src.utilities.exceptions.http.exc_401 import http_401_token_credentials_request
@@ -29,6 +35,90 @@ class BaseCRUDInterface:
 
         return jwt_user.user_id
 
+    @staticmethod
+    def detached_loader(
+        read: typing.Callable[[AsyncSession], typing.Awaitable[typing.Any]],
+    ) -> typing.Callable[[], typing.Awaitable[typing.Any]]:
+        """
+        Bind `read` to a session of its own, so a shared or background cache load can outlive the request that
+        started it. The session reads from a replica if the caller was allowed to.
+        """
+        is_read_only = is_replica_read.get()
+
+        async def _load() -> typing.Any:
+            async with async_db.async_session(info={"is_read_only": is_read_only}) as async_session:
+                return await read(async_session)
+
+        return _load
+
+    @staticmethod
+    def detached_stream(stmt: sqlalchemy.Select, is_read_only: bool | None = None) -> typing.AsyncIterator[typing.Any]:
+        """
+        Yield the rows of `stmt` through a server-side cursor, `API_STREAM_BATCH_SIZE` at a time, on a session of
+        its own, so a streamed response can outlive the request's session. The session reads from a replica if
+        `is_read_only` (by default: the caller) allows it.
+        """
+        if is_read_only is None:
+            is_read_only = is_replica_read.get()
+
+        async def _stream() -> typing.AsyncIterator[typing.Any]:
+            async with async_db.async_session(info={"is_read_only": is_read_only}) as async_session:
+                result = await async_session.stream_scalars(
+                    statement=stmt.execution_options(yield_per=settings.API_STREAM_BATCH_SIZE)
+                )
+                async for row in result:
+                    yield row
+
+        return _stream()
+
+    async def mark_written(self, *entity_ids: UUID | str | None) -> None:
+        """
+        Pin reads about `entity_ids` (and from the requesting user) to the primary for `DB_REPLICA_STICKY_WINDOW`
+        seconds, so a write is never followed by a replica read that has not replayed it yet. Besides ids, pass
+        every other value a cached read is keyed by (a username, an email), old and new, so a lagging replica
+        cannot fill the shared cache under that key either.
+        """
+        if not async_db.async_replica_engines:
+            return
+
+        await async_cache.set_many(
+            values={f"db:written:{entity_id}": "1" for entity_id in (self.user_id, *entity_ids) if entity_id},
+            policy=replica_sticky_cache_policy,
+        )
+
+    async def is_written_recently(self, *entity_ids: UUID | str | None) -> bool:
+        keys = [f"db:written:{entity_id}" for entity_id in (self.user_id, *entity_ids) if entity_id]
+        return any(value is not None for value in await async_cache.get_many(keys=keys))
+
+
+def read_from_replica(subject: str | None = None) -> typing.Callable:
+    """
+    Let the SELECTs of the decorated CRUD method go to a replica, unless the requesting user or the entity passed
+    as the `subject` argument was written within the sticky window (see `BaseCRUDInterface.mark_written`).
+    """
+
+    def decorator(method: typing.Callable) -> typing.Callable:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self: BaseCRUDInterface, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if not async_db.async_replica_engines:
+                return await method(self, *args, **kwargs)
+
+            entity_id = signature.bind(self, *args, **kwargs).arguments.get(subject) if subject else None
+            if await self.is_written_recently(entity_id):
+                return await method(self, *args, **kwargs)
+
+            token = is_replica_read.set(True)
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                is_replica_read.reset(token)
+
+        return wrapper
+
+    return decorator
+
 
 def get_interface(
     interface_type: typing.Type[BaseCRUDInterface],
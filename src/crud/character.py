@@ -4,10 +4,12 @@ from uuid import UUID
 import sqlalchemy
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.cache.redis import async_redis
-from src.crud.base import BaseCRUDInterface
+from src.cache.codec import character_codec
+from src.cache.manager import async_cache
+from src.cache.policy import character_cache_policy
+from src.crud.base import BaseCRUDInterface, read_from_replica
 from src.models.character import Character
-from src.schemas.routes.character import CharacterCreateType
+from src.schemas.routes.character import CharacterCreateType, CharacterType
 from src.utilities.exceptions.database import EntityDoesNotExist
 
 
@@ -18,26 +20,41 @@ class CharacterCRUDInterface(BaseCRUDInterface):
         self.async_session.add(instance=new_character)
         await self.async_session.commit()
         await self.async_session.refresh(instance=new_character)
+        await self.mark_written(new_character.id)
+
+        await async_cache.set(
+            f"character:{new_character.id}",
+            new_character,
+            codec=character_codec,
+            tag=f"character:{new_character.id}",
+            policy=character_cache_policy,
+        )
 
         return new_character
 
+    @read_from_replica()
     async def read_characters(self) -> Sequence[Character]:
         stmt = sqlalchemy.select(Character)
         query = await self.async_session.execute(statement=stmt)
         return query.scalars().all()
 
-    async def read_character_by_id(self, pk: UUID) -> Character:
-        cache_key = f"character:{pk}"
-        cached_character = await async_redis.get(cache_key)
-        if cached_character:
-            return Character(**cached_character)
-
+    @read_from_replica(subject="pk")
+    async def read_character_by_id(self, pk: UUID) -> CharacterType:
+        return await async_cache.get_or_load(
+            key=f"character:{pk}",
+            loader=self.detached_loader(lambda async_session: self._read_character(async_session, pk=pk)),
+            codec=character_codec,
+            policy=character_cache_policy,
+            tag=lambda character: f"character:{character.id}",
+        )
+
+    @staticmethod
+    async def _read_character(async_session: AsyncSession, pk: UUID) -> Character:
         stmt = sqlalchemy.select(Character).where(Character.id == pk)
-        query = await self.async_session.execute(statement=stmt)
+        query = await async_session.execute(statement=stmt)
         db_character = query.scalar()
 
         if not db_character:
             raise EntityDoesNotExist("Character with id `{id}` does not exist!")
 
-        await async_redis.set(cache_key, db_character.__dict__)
         return db_character
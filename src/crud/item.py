@@ -1,14 +1,17 @@
-from uuid import UUID
+from typing import NoReturn
 
 import sqlalchemy
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache.manager import async_cache
+from src.cache.policy import balance_history_cache_policy
+from src.crud.balance import BalanceCRUDInterface
 from src.crud.base import BaseCRUDInterface
 from src.models.item import Item
 from src.schemas.routes.item import ItemCreateType, ItemEquipType, ItemTransferType
 from src.models.item import ItemTransferHistory
-from src.models.balance import Balance, BalanceTransferHistory
+from src.models.balance import BalanceTransferHistory
 from src.utilities.exceptions.database import EntityDoesNotExist
+from src.utilities.generators.uuid_generator import generate_uuid7
 
 
 class ItemCRUDInterface(BaseCRUDInterface):
@@ -43,65 +46,87 @@ class ItemCRUDInterface(BaseCRUDInterface):
 
 class ItemTransferHistoryCRUDInterface(BaseCRUDInterface):
     async def transfer_item(self, item_transfer: ItemTransferType) -> ItemTransferHistory:
-        from_stmt = sqlalchemy.select(Item).where(Item.id == item_transfer.item_id).where(Item.owner_id == item_transfer.from_owner_id)
-        from_query = await self.async_session.execute(statement=from_stmt)
-        item = from_query.scalar()
-
-        if not item:
-            raise EntityDoesNotExist("Item with id `{id}` does not exist or does not belong to the user!")
-
-        item.owner_id = item_transfer.to_owner_id
-
-        balance_transfer_history_id = await self.transfer_balance(
-            from_user_id=item_transfer.from_owner_id,
-            to_user_id=item_transfer.to_owner_id,
-            amount=item_transfer.amount,
-            fee_amount=item_transfer.fee_amount,
+        """
+        Run the whole trade as one statement in one transaction: the ownership change, the balance transfer and
+        the history rows. Each step only matches when the previous one did, and every UPDATE locks the row it
+        changes, so a concurrent trade of the same item or balance waits and then re-checks its conditions.
+        """
+        if item_transfer.from_owner_id == item_transfer.to_owner_id:
+            raise ValueError("Cannot transfer an item to the same user!")
+
+        moved = (
+            sqlalchemy.update(Item)
+            .where(Item.id == item_transfer.item_id, Item.owner_id == item_transfer.from_owner_id)
+            .values(owner_id=item_transfer.to_owner_id)
+            .returning(Item.id)
+            .cte(name="moved")
         )
-
-        transfer_history = ItemTransferHistory(
-            item_id=item.id,
-            from_owner_id=item_transfer.from_owner_id,
-            to_owner_id=item_transfer.to_owner_id,
-            fee_amount=item_transfer.fee_amount,
-            balance_transfer_history_id=balance_transfer_history_id,
+        balance_transferred = (
+            BalanceCRUDInterface.build_transfer_statement(
+                from_user_id=item_transfer.from_owner_id,
+                to_user_id=item_transfer.to_owner_id,
+                amount=item_transfer.amount,
+                fee_amount=item_transfer.fee_amount,
+                precondition=sqlalchemy.exists(sqlalchemy.select(moved.c.id)),
+            )
+            .returning(BalanceTransferHistory.id)
+            .cte(name="balance_transferred")
+        )
+        insert_stmt = (
+            sqlalchemy.insert(ItemTransferHistory)
+            .from_select(
+                ["id", "item_id", "from_owner_id", "to_owner_id", "fee_amount", "balance_transfer_history_id"],
+                sqlalchemy.select(
+                    sqlalchemy.literal(generate_uuid7(), ItemTransferHistory.id.type),
+                    sqlalchemy.literal(item_transfer.item_id, ItemTransferHistory.item_id.type),
+                    sqlalchemy.literal(item_transfer.from_owner_id, ItemTransferHistory.from_owner_id.type),
+                    sqlalchemy.literal(item_transfer.to_owner_id, ItemTransferHistory.to_owner_id.type),
+                    sqlalchemy.literal(item_transfer.fee_amount, ItemTransferHistory.fee_amount.type),
+                    balance_transferred.c.id,
+                ),
+                include_defaults=False,
+            )
+            .returning(ItemTransferHistory)
         )
 
-        self.async_session.add(instance=transfer_history)
-        await self.async_session.commit()
-        await self.async_session.refresh(instance=transfer_history)
-
-        return transfer_history
-
-    async def transfer_balance(self, from_user_id: UUID, to_user_id: UUID, amount: float, fee_amount: float) -> UUID:
-        from_stmt = sqlalchemy.select(Balance).where(Balance.user_id == from_user_id)
-        to_stmt = sqlalchemy.select(Balance).where(Balance.user_id == to_user_id)
+        query = await self.async_session.execute(
+            statement=sqlalchemy.select(ItemTransferHistory).from_statement(insert_stmt)
+        )
+        transfer_history = query.scalar()
 
-        from_query = await self.async_session.execute(statement=from_stmt)
-        to_query = await self.async_session.execute(statement=to_stmt)
+        if not transfer_history:
+            await self._raise_for_unmatched_trade(item_transfer=item_transfer)
 
-        from_balance = from_query.scalar()
-        to_balance = to_query.scalar()
+        self.async_session.expunge(transfer_history)
+        await self.mark_written(item_transfer.from_owner_id, item_transfer.to_owner_id)
+        await self.async_session.commit()
 
-        if not from_balance or not to_balance:
-            raise EntityDoesNotExist("One of the users does not have a balance record!")
+        await async_cache.delete_many(
+            keys=[f"balance:{item_transfer.from_owner_id}", f"balance:{item_transfer.to_owner_id}"]
+        )
+        await async_cache.drop_timelines(
+            keys=[f"balance:history:{item_transfer.from_owner_id}", f"balance:history:{item_transfer.to_owner_id}"],
+            policy=balance_history_cache_policy,
+        )
 
-        if from_balance.amount < amount + fee_amount:
-            raise ValueError("Insufficient balance!")
+        return transfer_history
 
-        from_balance.amount -= (amount + fee_amount)
-        to_balance.amount += amount
+    async def _raise_for_unmatched_trade(self, item_transfer: ItemTransferType) -> NoReturn:
+        """
+        Postgres runs every data-modifying CTE, so the `moved` UPDATE may have matched even though the balance
+        part did not. Roll it back first, and diagnose on a fresh transaction that sees the item as it was.
+        """
+        await self.async_session.rollback()
 
-        transfer_history = BalanceTransferHistory(
-            balance_id=from_balance.id,
-            amount=amount,
-            balance_before=from_balance.amount,
-            balance_after=from_balance.amount - amount,
-            operation_type="transfer",
+        stmt = sqlalchemy.select(Item.id).where(
+            Item.id == item_transfer.item_id, Item.owner_id == item_transfer.from_owner_id
         )
+        query = await self.async_session.execute(statement=stmt)
 
-        self.async_session.add(instance=transfer_history)
-        await self.async_session.commit()
-        await self.async_session.refresh(instance=transfer_history)
+        if not query.scalar():
+            await self.async_session.rollback()
+            raise EntityDoesNotExist("Item with id `{id}` does not exist or does not belong to the user!")
 
-        return transfer_history.id
+        await BalanceCRUDInterface.raise_for_unmatched_update(
+            self.async_session, item_transfer.from_owner_id, item_transfer.to_owner_id
+        )
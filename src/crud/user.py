@@ -1,14 +1,23 @@
 import typing
+from datetime import datetime
 from uuid import UUID
 
 import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import functions as sqlalchemy_functions
 
-from src.cache.redis import async_redis
-from src.crud.base import BaseCRUDInterface
+from src.cache.codec import user_codec
+from src.cache.manager import async_cache
+from src.cache.policy import user_cache_policy
+from src.config.manager import settings
+from src.crud.base import BaseCRUDInterface, read_from_replica
+from src.database.db import is_replica_read
 from src.models.user import User
+from src.schemas.models.user import UserModelType
 from src.schemas.routes.user import UserInCreateType, UserInLoginType, UserInUpdateType
-from src.securities.hashing.password import pwd_generator
+from src.securities.authorizations.session_store import session_store
+from src.securities.authorizations.token_cache import verified_token_cache
+from src.securities.hashing.service import hashing_service
 from src.securities.verifications.credentials import credential_verifier
 from src.utilities.exceptions.database import EntityAlreadyExists, EntityDoesNotExist
 from src.utilities.exceptions.password import PasswordDoesNotMatch
@@ -18,9 +27,9 @@ class UserCRUDInterface(BaseCRUDInterface):
     async def create_user(self, user_create: UserInCreateType) -> User:
         new_user = User(username=user_create.username, email=user_create.email, is_logged_in=True)
 
-        new_user.set_hash_salt(hash_salt=pwd_generator.generate_salt)
+        new_user.set_hash_salt(hash_salt=await hashing_service.generate_salt())
         new_user.set_hashed_password(
-            hashed_password=pwd_generator.generate_hashed_password(
+            hashed_password=await hashing_service.generate_hashed_password(
                 hash_salt=new_user.hash_salt, new_password=user_create.password
             )
         )
@@ -28,62 +37,118 @@ class UserCRUDInterface(BaseCRUDInterface):
         self.async_session.add(instance=new_user)
         await self.async_session.commit()
         await self.async_session.refresh(instance=new_user)
-
-        await async_redis.set(f"user:{new_user.id}", new_user.__dict__)
+        await self.mark_written(new_user.id, new_user.username, new_user.email)
+
+        cache_keys = (f"user:{new_user.id}", f"user:username:{new_user.username}", f"user:email:{new_user.email}")
+        await async_cache.set_many(
+            values={cache_key: new_user for cache_key in cache_keys},
+            codec=user_codec,
+            tags={cache_key: f"user:{new_user.id}" for cache_key in cache_keys},
+            policy=user_cache_policy,
+        )
 
         return new_user
 
-    async def read_users(self) -> typing.Sequence[User]:
-        stmt = sqlalchemy.select(User)
-        query = await self.async_session.execute(statement=stmt)
-        return query.scalars().all()
-
-    async def read_user_by_id(self, pk: UUID) -> User:
-        cache_key = f"user:{pk}"
-        cached_user = await async_redis.get(cache_key)
-        if cached_user:
-            return User(**cached_user)
-
-        stmt = sqlalchemy.select(User).where(User.id == pk)
-        query = await self.async_session.execute(statement=stmt)
-        db_user = query.scalar()
-
-        if not db_user:
-            raise EntityDoesNotExist("User with id `{id}` does not exist!")
-
-        await async_redis.set(cache_key, db_user.__dict__)
-        return db_user
+    @read_from_replica()
+    async def read_users(
+        self, after: tuple[datetime, UUID] | None = None, limit: int = settings.API_PAGE_DEFAULT_SIZE
+    ) -> typing.Sequence[UserModelType]:
+        """
+        Return one keyset page of users ordered by (`created_at`, `id`), starting after the `after` position.
+        """
+        id_stmt = self._page_users(sqlalchemy.select(User.id), after=after).limit(limit)
+        id_query = await self.async_session.execute(statement=id_stmt)
+        user_ids = id_query.scalars().all()
+
+        users = await async_cache.get_many(keys=[f"user:{user_id}" for user_id in user_ids], codec=user_codec)
+        missing_ids = [user_id for user_id, user in zip(user_ids, users) if user is None]
+
+        if missing_ids:
+            stmt = sqlalchemy.select(User).where(User.id.in_(missing_ids))
+            query = await self.async_session.execute(statement=stmt)
+            loaded_users = {db_user.id: user_codec.to_schema(db_user) for db_user in query.scalars().all()}
+
+            # A page read from a replica has no subject to keep it sticky, so it may lag a write that already
+            # left the cache; only rows read from the primary are safe to share with every worker.
+            if not is_replica_read.get():
+                await async_cache.set_many(
+                    values={f"user:{user_id}": user for user_id, user in loaded_users.items()},
+                    codec=user_codec,
+                    tags={f"user:{user_id}": f"user:{user_id}" for user_id in loaded_users},
+                    policy=user_cache_policy,
+                )
+            users = [user or loaded_users.get(user_id) for user_id, user in zip(user_ids, users)]
 
-    async def read_user_by_username(self, username: str) -> User:
-        cache_key = f"user:username:{username}"
-        cached_user = await async_redis.get(cache_key)
-        if cached_user:
-            return User(**cached_user)
+        return [user for user in users if user is not None]
 
-        stmt = sqlalchemy.select(User).where(User.username == username)
-        query = await self.async_session.execute(statement=stmt)
-        db_user = query.scalar()
+    @read_from_replica()
+    async def stream_users(self, after: tuple[datetime, UUID] | None = None) -> typing.AsyncIterator[User]:
+        return self.detached_stream(self._page_users(sqlalchemy.select(User), after=after))
 
-        if not db_user:
-            raise EntityDoesNotExist("User with username `{username}` does not exist!")
+    @read_from_replica(subject="pk")
+    async def read_user_by_id(self, pk: UUID) -> UserModelType:
+        return await async_cache.get_or_load(
+            key=f"user:{pk}",
+            loader=self.detached_loader(
+                lambda async_session: self._read_user(
+                    async_session, User.id == pk, error_message="User with id `{id}` does not exist!"
+                )
+            ),
+            codec=user_codec,
+            policy=user_cache_policy,
+            tag=lambda user: f"user:{user.id}",
+        )
 
-        await async_redis.set(cache_key, db_user.__dict__)
-        return db_user
+    @read_from_replica(subject="username")
+    async def read_user_by_username(self, username: str) -> UserModelType:
+        return await async_cache.get_or_load(
+            key=f"user:username:{username}",
+            loader=self.detached_loader(
+                lambda async_session: self._read_user(
+                    async_session,
+                    User.username == username,
+                    error_message="User with username `{username}` does not exist!",
+                )
+            ),
+            codec=user_codec,
+            policy=user_cache_policy,
+            tag=lambda user: f"user:{user.id}",
+        )
 
-    async def read_user_by_email(self, email: str) -> User:
-        cache_key = f"user:email:{email}"
-        cached_user = await async_redis.get(cache_key)
-        if cached_user:
-            return User(**cached_user)
+    @read_from_replica(subject="email")
+    async def read_user_by_email(self, email: str) -> UserModelType:
+        return await async_cache.get_or_load(
+            key=f"user:email:{email}",
+            loader=self.detached_loader(
+                lambda async_session: self._read_user(
+                    async_session, User.email == email, error_message="User with email `{email}` does not exist!"
+                )
+            ),
+            codec=user_codec,
+            policy=user_cache_policy,
+            tag=lambda user: f"user:{user.id}",
+        )
 
-        stmt = sqlalchemy.select(User).where(User.email == email)
-        query = await self.async_session.execute(statement=stmt)
+    @staticmethod
+    def _page_users(stmt: sqlalchemy.Select, after: tuple[datetime, UUID] | None) -> sqlalchemy.Select:
+        if after is not None:
+            stmt = stmt.where(
+                sqlalchemy.tuple_(User.created_at, User.id)
+                > sqlalchemy.tuple_(*after, types=(User.created_at.type, User.id.type))
+            )
+        return stmt.order_by(User.created_at, User.id)
+
+    @staticmethod
+    async def _read_user(
+        async_session: AsyncSession, whereclause: sqlalchemy.ColumnElement[bool], error_message: str
+    ) -> User:
+        stmt = sqlalchemy.select(User).where(whereclause)
+        query = await async_session.execute(statement=stmt)
         db_user = query.scalar()
 
         if not db_user:
-            raise EntityDoesNotExist("User with email `{email}` does not exist!")
+            raise EntityDoesNotExist(error_message)
 
-        await async_redis.set(cache_key, db_user.__dict__)
         return db_user
 
     async def read_user_by_password_authentication(self, user_login: UserInLoginType) -> User:
@@ -94,11 +159,18 @@ class UserCRUDInterface(BaseCRUDInterface):
         if not db_user:
             raise EntityDoesNotExist("Wrong username or wrong email!")
 
-        if not pwd_generator.is_password_authenticated(
+        is_authenticated, rehashed_password = await hashing_service.authenticate_and_rehash_password(
             hash_salt=db_user.hash_salt, password=user_login.password, hashed_password=db_user.hashed_password
-        ):
+        )
+        if not is_authenticated:
             raise PasswordDoesNotMatch("Password does not match!")
 
+        # The password was hashed with costs that have changed since; store a hash made with the current ones.
+        if rehashed_password:
+            db_user.set_hashed_password(hashed_password=rehashed_password)
+            await self.async_session.commit()
+            await self.async_session.refresh(instance=db_user)
+
         return db_user  # type: ignore
 
     async def update_user_by_id(self, pk: UUID, user_update: UserInUpdateType) -> User:
@@ -121,21 +193,36 @@ class UserCRUDInterface(BaseCRUDInterface):
             update_stmt = update_stmt.values(username=new_user_data["username"])
 
         if new_user_data["email"]:
-            update_stmt = update_stmt.values(username=new_user_data["email"])
+            update_stmt = update_stmt.values(email=new_user_data["email"])
 
         if new_user_data["password"]:
-            update_user.set_hash_salt(hash_salt=pwd_generator.generate_salt)
+            update_user.set_hash_salt(hash_salt=await hashing_service.generate_salt())
             update_user.set_hashed_password(
-                hashed_password=pwd_generator.generate_hashed_password(
+                hashed_password=await hashing_service.generate_hashed_password(
                     hash_salt=update_user.hash_salt, new_password=new_user_data["password"]
                 )
             )
 
         await self.async_session.execute(statement=update_stmt)
+        await self.mark_written(
+            pk, update_user.username, update_user.email, new_user_data["username"], new_user_data["email"]
+        )
         await self.async_session.commit()
         await self.async_session.refresh(instance=update_user)
 
-        await async_redis.set(f"user:{update_user.id}", update_user.__dict__)
+        # The email is a claim of the user's tokens, and a new password ends the old credentials.
+        if new_user_data["email"] or new_user_data["password"]:
+            verified_token_cache.revoke_user(user_id=str(update_user.id))
+            await session_store.end_user_sessions(user_id=str(update_user.id))
+
+        await async_cache.invalidate(tag=f"user:{update_user.id}")
+        await async_cache.set(
+            f"user:{update_user.id}",
+            update_user,
+            codec=user_codec,
+            tag=f"user:{update_user.id}",
+            policy=user_cache_policy,
+        )
 
         return update_user
 
@@ -150,11 +237,12 @@ class UserCRUDInterface(BaseCRUDInterface):
         stmt = sqlalchemy.delete(table=User).where(User.id == delete_user.id)
 
         await self.async_session.execute(statement=stmt)
+        await self.mark_written(pk, delete_user.username, delete_user.email)
         await self.async_session.commit()
 
-        await async_redis.delete(f"user:{pk}")
-        await async_redis.delete(f"user:username:{delete_user.username}")
-        await async_redis.delete(f"user:email:{delete_user.email}")
+        await async_cache.invalidate(tag=f"user:{pk}")
+        verified_token_cache.revoke_user(user_id=str(pk))
+        await session_store.end_user_sessions(user_id=str(pk))
 
         return f"User with id '{pk}' is successfully deleted!"
 
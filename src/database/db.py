@@ -1,7 +1,12 @@
+import random
+from contextvars import ContextVar
 from typing import AsyncGenerator
 
+import sqlalchemy
 from pydantic import PostgresDsn
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
 
 from src.config.manager import settings
@@ -15,24 +20,63 @@ DATABASE_URL = "{}://{}:{}@{}:{}/{}".format(
     settings.DB_POSTGRES_NAME,
 )
 
+is_replica_read: ContextVar[bool] = ContextVar("is_replica_read", default=False)
+
+
+class RoutingSession(Session):
+    """
+    Send plain SELECTs to a random replica while replica reads are enabled, either for the current context
+    (`is_replica_read`) or for the whole session (`info["is_read_only"]`). Flushes, DML and `FOR UPDATE`
+    selects always go to the primary.
+    """
+
+    def __init__(self, replica_engines: list[Engine] | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.replica_engines: list[Engine] = replica_engines or list()
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+        if (
+            self.replica_engines
+            and (self.info.get("is_read_only") or is_replica_read.get())
+            and not self._flushing
+            and isinstance(clause, sqlalchemy.Select)
+            and clause._for_update_arg is None
+        ):
+            return random.choice(self.replica_engines)
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
 
 class AsyncDatabase:
     def __init__(self):
         self.postgres_uri: PostgresDsn = PostgresDsn(url=DATABASE_URL)
-        self.async_engine: AsyncEngine = create_async_engine(
-            url=self.async_postgres_uri,
-            echo=settings.IS_DB_ECHO_LOG,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_POOL_OVERFLOW,
-            poolclass=AsyncAdaptedQueuePool,
+        self.async_engine: AsyncEngine = self._create_async_engine(url=self.async_postgres_uri)
+        self.async_replica_engines: list[AsyncEngine] = [
+            self._create_async_engine(url=make_url(uri).set(drivername="postgresql+asyncpg"))
+            for uri in settings.DB_POSTGRES_REPLICA_URIS.split(",")
+            if uri
+        ]
+        self.async_session = async_sessionmaker(
+            bind=self.async_engine,
+            sync_session_class=RoutingSession,
+            replica_engines=[engine.sync_engine for engine in self.async_replica_engines],
         )
-        self.async_session = async_sessionmaker(bind=self.async_engine)
         self.pool: Pool = self.async_engine.pool
 
     @property
     def async_postgres_uri(self) -> str:
         return self.postgres_uri.unicode_string().replace(settings.DB_POSTGRES_SCHEMA, "postgresql+asyncpg")
 
+    @staticmethod
+    def _create_async_engine(url: str | URL) -> AsyncEngine:
+        return create_async_engine(
+            url=url,
+            echo=settings.IS_DB_ECHO_LOG,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_OVERFLOW,
+            poolclass=AsyncAdaptedQueuePool,
+        )
+
 
 async_db: AsyncDatabase = AsyncDatabase()
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import fastapi
@@ -6,6 +7,8 @@ from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
 from sqlalchemy.pool.base import _ConnectionRecord
 
 from src.database.db import async_db
+from src.database.partitions import run_partition_maintenance
+from src.database.snapshots import run_balance_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,8 @@ async def initialize_db_connection(backend_app: fastapi.FastAPI) -> None:
     logger.info("Database Connection --- Establishing . . .")
 
     backend_app.state.db = async_db
+    backend_app.state.partition_maintenance = asyncio.create_task(run_partition_maintenance(async_db.async_engine))
+    backend_app.state.balance_snapshots = asyncio.create_task(run_balance_snapshots())
 
     logger.info("Database Connection --- Successfully Established!")
 
@@ -37,6 +42,11 @@ async def initialize_db_connection(backend_app: fastapi.FastAPI) -> None:
 async def dispose_db_connection(backend_app: fastapi.FastAPI) -> None:
     logger.info("Database Connection --- Disposing . . .")
 
+    backend_app.state.partition_maintenance.cancel()
+    backend_app.state.balance_snapshots.cancel()
+
     await backend_app.state.db.async_engine.dispose()
+    for async_replica_engine in backend_app.state.db.async_replica_engines:
+        await async_replica_engine.dispose()
 
     logger.info("Database Connection --- Successfully Disposed!")
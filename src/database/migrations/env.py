@@ -8,6 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.pool import NullPool as SQLAlchemyNullPool
 
 from src.database.db import async_db
+from src.models.balance import *
+from src.models.character import *
+from src.models.item import *
 from src.models.user import *
 from src.models.base import Base
 
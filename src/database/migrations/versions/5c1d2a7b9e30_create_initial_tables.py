@@ -0,0 +1,113 @@
+"""create initial tables
+
+Revision ID: 5c1d2a7b9e30
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d2a7b9e30"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("username", sa.String(length=64), nullable=False),
+        sa.Column("email", sa.String(length=64), nullable=False),
+        sa.Column("_hashed_password", sa.String(length=1024), nullable=True),
+        sa.Column("_hash_salt", sa.String(length=1024), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_logged_in", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("username"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "item_type",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=False),
+        sa.Column("rarity", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "balance",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "character",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "balance_transfer_history",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("balance_id", sa.UUID(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("balance_before", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("balance_after", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("operation_type", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["balance_id"], ["balance.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "item",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("type_id", sa.UUID(), nullable=False),
+        sa.Column("character_id", sa.UUID(), nullable=True),
+        sa.Column("owner_id", sa.UUID(), nullable=True),
+        sa.Column("is_equipped", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["character_id"], ["character.id"]),
+        sa.ForeignKeyConstraint(["owner_id"], ["user.id"]),
+        sa.ForeignKeyConstraint(["type_id"], ["item_type.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "item_transfer_history",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("item_id", sa.UUID(), nullable=False),
+        sa.Column("from_owner_id", sa.UUID(), nullable=False),
+        sa.Column("to_owner_id", sa.UUID(), nullable=False),
+        sa.Column("fee_amount", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("balance_transfer_history_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["balance_transfer_history_id"], ["balance_transfer_history.id"]),
+        sa.ForeignKeyConstraint(["from_owner_id"], ["user.id"]),
+        sa.ForeignKeyConstraint(["item_id"], ["item.id"]),
+        sa.ForeignKeyConstraint(["to_owner_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("item_transfer_history")
+    op.drop_table("item")
+    op.drop_table("balance_transfer_history")
+    op.drop_table("character")
+    op.drop_table("balance")
+    op.drop_table("item_type")
+    op.drop_table("user")
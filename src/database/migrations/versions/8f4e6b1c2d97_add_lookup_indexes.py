@@ -0,0 +1,45 @@
+"""add lookup indexes
+
+Revision ID: 8f4e6b1c2d97
+Revises: 5c1d2a7b9e30
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f4e6b1c2d97"
+down_revision: Union[str, None] = "5c1d2a7b9e30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, is_unique)
+INDEXES: list[tuple[str, str, list[str], bool]] = [
+    ("ix_balance_user_id", "balance", ["user_id"], True),
+    (
+        "ix_balance_transfer_history_balance_id_created_at_id",
+        "balance_transfer_history",
+        ["balance_id", "created_at", "id"],
+        False,
+    ),
+    ("ix_item_owner_id", "item", ["owner_id"], False),
+    ("ix_character_user_id", "character", ["user_id"], False),
+    ("ix_user_created_at_id", "user", ["created_at", "id"], False),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build, but cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, is_unique in INDEXES:
+            op.create_index(name, table, columns, unique=is_unique, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""allow null item type description
+
+Revision ID: a4c6e8f0b213
+Revises: e1f8a3b5c742
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c6e8f0b213"
+down_revision: Union[str, None] = "e1f8a3b5c742"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The baseline revision created the column NOT NULL, unlike the model; databases built from the corrected
+    # baseline are already nullable, for which this is a no-op.
+    op.alter_column("item_type", "description", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column("item_type", "description", existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,64 @@
+"""default primary keys to uuid7
+
+Revision ID: b3a9d4e6f120
+Revises: 8f4e6b1c2d97
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3a9d4e6f120"
+down_revision: Union[str, None] = "8f4e6b1c2d97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES: list[str] = [
+    "user",
+    "item_type",
+    "balance",
+    "character",
+    "balance_transfer_history",
+    "item",
+    "item_transfer_history",
+]
+
+
+def upgrade() -> None:
+    # The application sets ids itself; the server default only covers rows inserted outside of it, so they
+    # stay time-ordered too. Existing uuid4 keys are left untouched: both versions share the `uuid` type, and
+    # rewriting them would break every reference and pagination cursor handed out already.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION generate_uuid7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(
+                                int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3
+                            )
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("generate_uuid7()"))
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.alter_column(table, "id", server_default=None)
+    op.execute("DROP FUNCTION IF EXISTS generate_uuid7()")
@@ -0,0 +1,125 @@
+"""partition history tables by month
+
+Revision ID: d7e2c5a8b416
+Revises: b3a9d4e6f120
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e2c5a8b416"
+down_revision: Union[str, None] = "b3a9d4e6f120"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The application keeps creating partitions ahead from then on (`src/database/partitions.py`).
+PREMAKE_MONTHS: int = 3
+BALANCE_TRANSFER_HISTORY_FK: str = "item_transfer_history_balance_transfer_history_id_fkey"
+
+
+def history_columns(table: str) -> list[sa.Column]:
+    columns = {
+        "balance_transfer_history": [
+            sa.Column("balance_id", sa.UUID(), sa.ForeignKey("balance.id"), nullable=False),
+            sa.Column("amount", sa.Numeric(precision=15, scale=2), nullable=False),
+            sa.Column("balance_before", sa.Numeric(precision=15, scale=2), nullable=False),
+            sa.Column("balance_after", sa.Numeric(precision=15, scale=2), nullable=False),
+            sa.Column("operation_type", sa.String(length=50), nullable=False),
+        ],
+        "item_transfer_history": [
+            sa.Column("item_id", sa.UUID(), sa.ForeignKey("item.id"), nullable=False),
+            sa.Column("from_owner_id", sa.UUID(), sa.ForeignKey("user.id"), nullable=False),
+            sa.Column("to_owner_id", sa.UUID(), sa.ForeignKey("user.id"), nullable=False),
+            sa.Column("fee_amount", sa.Numeric(precision=15, scale=2), nullable=False),
+            sa.Column("balance_transfer_history_id", sa.UUID(), nullable=False),
+        ],
+    }[table]
+    return [
+        sa.Column("id", sa.UUID(), server_default=sa.text("generate_uuid7()"), nullable=False),
+        *columns,
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    ]
+
+
+def history_indexes(table: str) -> list[tuple[str, list[str]]]:
+    if table == "balance_transfer_history":
+        return [("ix_balance_transfer_history_balance_id_created_at_id", ["balance_id", "created_at", "id"])]
+    return list()
+
+
+def rebuild_history_table(table: str, is_partitioned: bool) -> None:
+    """
+    Recreate `table` (partitioned by month or not) and copy its rows over. The copy holds an exclusive lock on
+    the history for its whole duration, so this is meant for a maintenance window.
+    """
+    previous_table = f"{table}_previous"
+    column_names = ", ".join(f'"{column.name}"' for column in history_columns(table))
+
+    op.rename_table(table, previous_table)
+    op.drop_constraint(f"{table}_pkey", previous_table, type_="primary")
+    for index_name, _ in history_indexes(table):
+        op.drop_index(index_name, table_name=previous_table, if_exists=True)
+
+    if is_partitioned:
+        op.create_table(
+            table,
+            *history_columns(table),
+            sa.PrimaryKeyConstraint("id", "created_at"),
+            postgresql_partition_by="RANGE (created_at)",
+        )
+        # One partition per month from the oldest row up to PREMAKE_MONTHS ahead, so every copied row has one.
+        op.execute(
+            f"""
+            DO $$
+            DECLARE
+                month date := date_trunc(
+                    'month', coalesce((SELECT min(created_at) FROM "{previous_table}"), now()) AT TIME ZONE 'UTC'
+                );
+            BEGIN
+                WHILE month <= date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{PREMAKE_MONTHS} months' LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_p' || to_char(month, 'YYYYMM'),
+                        '{table}',
+                        month || ' 00:00:00+00',
+                        (month + interval '1 month')::date || ' 00:00:00+00'
+                    );
+                    month := month + interval '1 month';
+                END LOOP;
+            END $$
+            """
+        )
+    else:
+        op.create_table(table, *history_columns(table), sa.PrimaryKeyConstraint("id"))
+
+    for index_name, columns in history_indexes(table):
+        op.create_index(index_name, table, columns)
+
+    op.execute(f'INSERT INTO "{table}" ({column_names}) SELECT {column_names} FROM "{previous_table}"')
+    op.drop_table(previous_table)
+
+
+def upgrade() -> None:
+    # A foreign key into a partitioned table has to cover its partition key as well, which the item history
+    # does not store; both rows are written by the same statement, so the reference is kept by the application.
+    op.drop_constraint(BALANCE_TRANSFER_HISTORY_FK, "item_transfer_history", type_="foreignkey")
+    rebuild_history_table("balance_transfer_history", is_partitioned=True)
+    rebuild_history_table("item_transfer_history", is_partitioned=True)
+
+
+def downgrade() -> None:
+    # Partitions detached by the retention job are not part of the parent anymore and are left as they are.
+    rebuild_history_table("item_transfer_history", is_partitioned=False)
+    rebuild_history_table("balance_transfer_history", is_partitioned=False)
+    op.create_foreign_key(
+        BALANCE_TRANSFER_HISTORY_FK,
+        "item_transfer_history",
+        "balance_transfer_history",
+        ["balance_transfer_history_id"],
+        ["id"],
+    )
@@ -0,0 +1,37 @@
+"""create balance snapshot
+
+Revision ID: e1f8a3b5c742
+Revises: d7e2c5a8b416
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f8a3b5c742"
+down_revision: Union[str, None] = "d7e2c5a8b416"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "balance_snapshot",
+        sa.Column("id", sa.UUID(), server_default=sa.text("generate_uuid7()"), nullable=False),
+        sa.Column("balance_id", sa.UUID(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["balance_id"], ["balance.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("balance_id", "taken_at"),
+    )
+    op.create_index("ix_balance_snapshot_taken_at", "balance_snapshot", ["taken_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_balance_snapshot_taken_at", table_name="balance_snapshot")
+    op.drop_table("balance_snapshot")
@@ -0,0 +1,170 @@
+import asyncio
+import datetime
+import logging
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.archive.manager import history_archive
+from src.config.manager import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES: tuple[str, ...] = ("balance_transfer_history", "item_transfer_history")
+# Advisory lock shared by every worker, so only one of them runs the maintenance at a time.
+PARTITION_MAINTENANCE_LOCK_KEY: int = 0x7061727469
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def format_partition_name(table: str, month: datetime.date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def parse_partition_month(table: str, partition: str) -> datetime.date | None:
+    try:
+        return datetime.datetime.strptime(partition.removeprefix(f"{table}_p"), "%Y%m").date()
+
+    except ValueError:
+        return None
+
+
+async def list_partitions(connection: AsyncConnection, table: str) -> dict[str, bool]:
+    """
+    Return the attached partitions of `table`, each mapped to whether a concurrent detach of it was interrupted.
+    """
+    partitions_query = await connection.execute(
+        sqlalchemy.text(
+            "SELECT child.relname, pg_inherits.inhdetachpending FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    return {partition: is_detach_pending for partition, is_detach_pending in partitions_query.all()}
+
+
+async def create_partitions(connection: AsyncConnection, table: str, months: list[datetime.date]) -> list[str]:
+    partitions = await list_partitions(connection, table)
+    created_partitions = list()
+
+    for month in months:
+        partition = format_partition_name(table, month)
+        if partition in partitions:
+            continue
+
+        await connection.execute(
+            sqlalchemy.text(
+                f'CREATE TABLE IF NOT EXISTS "{partition}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}T00:00:00Z') TO ('{add_months(month, 1).isoformat()}T00:00:00Z')"
+            )
+        )
+        created_partitions.append(partition)
+
+    return created_partitions
+
+
+async def detach_partitions(
+    async_engine: AsyncEngine, connection: AsyncConnection, table: str, before: datetime.date
+) -> list[str]:
+    """
+    Detach every monthly partition of `table` that ends on or before `before`. With the archive enabled, each one
+    is written to its segment while still attached and only then detached and dropped, so its rows are readable
+    from the table or from the archive at any time. Without it, the detached tables are kept under the same name.
+    `connection` must be in autocommit mode, since a concurrent detach cannot run inside a transaction.
+    """
+    detached_partitions = list()
+
+    for partition, is_detach_pending in (await list_partitions(connection, table)).items():
+        month = parse_partition_month(table, partition)
+        if month is None or add_months(month, 1) > before:
+            continue
+
+        if history_archive.is_enabled:
+            await archive_partition(async_engine, table, partition=partition, month=month)
+
+        detach_mode = "FINALIZE" if is_detach_pending else "CONCURRENTLY"
+        await connection.execute(sqlalchemy.text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}" {detach_mode}'))
+        detached_partitions.append(partition)
+
+        if history_archive.is_enabled:
+            await connection.execute(sqlalchemy.text(f'DROP TABLE "{partition}"'))
+
+    return detached_partitions
+
+
+async def list_detached_partitions(connection: AsyncConnection, table: str) -> list[str]:
+    partitions_query = await connection.execute(
+        sqlalchemy.text(
+            "SELECT relname FROM pg_class WHERE relkind = 'r' AND NOT relispartition "
+            "AND relnamespace = CAST(current_schema() AS regnamespace) AND relname LIKE :pattern"
+        ),
+        {"pattern": f"{table}_p%"},
+    )
+    return [partition for partition in partitions_query.scalars() if parse_partition_month(table, partition)]
+
+
+async def archive_partition(async_engine: AsyncEngine, table: str, partition: str, month: datetime.date) -> None:
+    row_count = await history_archive.archive_partition(async_engine, table, partition=partition, month=month)
+    logger.info(f"History Partition --- Archived `{partition}` ({row_count} rows)")
+
+
+async def archive_detached_partitions(async_engine: AsyncEngine, connection: AsyncConnection, table: str) -> None:
+    """
+    Move the partitions of `table` that were detached without being archived into the history archive and drop
+    them: those detached while the archive was disabled, or by a run that stopped before the drop.
+    """
+    for partition in await list_detached_partitions(connection, table):
+        await archive_partition(async_engine, table, partition=partition, month=parse_partition_month(table, partition))
+        await connection.execute(sqlalchemy.text(f'DROP TABLE "{partition}"'))
+
+
+async def maintain_partitions(async_engine: AsyncEngine, today: datetime.date | None = None) -> None:
+    """
+    Create the monthly history partitions up to `HISTORY_PARTITION_PREMAKE_MONTHS` ahead and, when
+    `HISTORY_RETENTION_MONTHS` is set, detach the ones that fell out of retention (and archive them when
+    `HISTORY_ARCHIVE_DIR` is set). The tables have no default partition, so a row for a month without a
+    partition fails to insert; creating them ahead keeps a margin.
+    """
+    current_month = (today or datetime.datetime.now(tz=datetime.timezone.utc).date()).replace(day=1)
+    months = [add_months(current_month, offset) for offset in range(settings.HISTORY_PARTITION_PREMAKE_MONTHS + 1)]
+
+    async with async_engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        lock_query = await connection.execute(
+            sqlalchemy.text("SELECT pg_try_advisory_lock(:key)"), {"key": PARTITION_MAINTENANCE_LOCK_KEY}
+        )
+        if not lock_query.scalar():
+            return
+
+        try:
+            for table in PARTITIONED_TABLES:
+                for partition in await create_partitions(connection, table, months=months):
+                    logger.info(f"History Partition --- Created `{partition}`")
+
+                if settings.HISTORY_RETENTION_MONTHS > 0:
+                    retained_from = add_months(current_month, -settings.HISTORY_RETENTION_MONTHS)
+                    for partition in await detach_partitions(async_engine, connection, table, before=retained_from):
+                        logger.info(f"History Partition --- Detached `{partition}`")
+
+                if history_archive.is_enabled:
+                    await archive_detached_partitions(async_engine, connection, table)
+
+        finally:
+            await connection.execute(
+                sqlalchemy.text("SELECT pg_advisory_unlock(:key)"), {"key": PARTITION_MAINTENANCE_LOCK_KEY}
+            )
+
+
+async def run_partition_maintenance(async_engine: AsyncEngine) -> None:
+    while True:
+        try:
+            await maintain_partitions(async_engine)
+
+        except (sqlalchemy.exc.SQLAlchemyError, OSError) as db_error:
+            logger.warning(f"History Partition --- Maintenance failed --- {db_error}")
+
+        await asyncio.sleep(settings.HISTORY_PARTITION_MAINTENANCE_INTERVAL)
@@ -0,0 +1,46 @@
+import asyncio
+import datetime
+import logging
+
+import sqlalchemy
+
+from src.config.manager import settings
+from src.crud.balance import BalanceCRUDInterface
+from src.database.db import async_db
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock shared by every worker, so only one of them takes the snapshots of a run.
+BALANCE_SNAPSHOT_LOCK_KEY: int = 0x736E617073
+
+
+async def take_balance_snapshots() -> None:
+    """
+    Snapshot the balances as of `LEDGER_SNAPSHOT_SETTLE_SECONDS` ago rather than now: history rows carry the
+    start time of their transaction, so a transaction still running could commit rows older than "now".
+    """
+    taken_at = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(
+        seconds=settings.LEDGER_SNAPSHOT_SETTLE_SECONDS
+    )
+
+    async with async_db.async_session() as async_session:
+        lock_query = await async_session.execute(
+            sqlalchemy.text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": BALANCE_SNAPSHOT_LOCK_KEY}
+        )
+        if not lock_query.scalar():
+            return
+
+        balance_interface = BalanceCRUDInterface(async_session=async_session, authorization=None)
+        snapshot_count = await balance_interface.take_balance_snapshots(taken_at=taken_at)
+        logger.info(f"Balance Snapshot --- Took {snapshot_count} snapshots as of {taken_at.isoformat()}")
+
+
+async def run_balance_snapshots() -> None:
+    while True:
+        try:
+            await take_balance_snapshots()
+
+        except (sqlalchemy.exc.SQLAlchemyError, OSError) as db_error:
+            logger.warning(f"Balance Snapshot --- Failed --- {db_error}")
+
+        await asyncio.sleep(settings.LEDGER_SNAPSHOT_INTERVAL)
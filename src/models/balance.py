@@ -1,18 +1,19 @@
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import functions
 
 from src.models.base import Base
+from src.utilities.generators.uuid_generator import generate_uuid7
 
 
 class Balance(Base):
     __tablename__ = "balance"
 
-    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=uuid4())
-    user_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("user.id"), nullable=False)
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7)
+    user_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("user.id"), nullable=False, unique=True, index=True)
     amount: Mapped[float] = mapped_column(sa.Numeric(15, 2), nullable=False, default=0)
     updated_at: Mapped[datetime] = mapped_column(
         sa.DateTime(timezone=True), nullable=False, server_default=functions.now(), onupdate=functions.now()
@@ -21,13 +22,33 @@ class Balance(Base):
 
 class BalanceTransferHistory(Base):
     __tablename__ = "balance_transfer_history"
+    __table_args__ = (
+        sa.Index("ix_balance_transfer_history_balance_id_created_at_id", "balance_id", "created_at", "id"),
+        {"extend_existing": True, "postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=uuid4())
+    # The partition key has to be part of the primary key. `id` stays the insert sentinel, since `created_at` is
+    # only known after the insert and would otherwise turn ordered bulk inserts into one statement per row.
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7, insert_sentinel=True)
     balance_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("balance.id"), nullable=False)
     amount: Mapped[float] = mapped_column(sa.Numeric(15, 2), nullable=False)
     balance_before: Mapped[float] = mapped_column(sa.Numeric(15, 2), nullable=False)
     balance_after: Mapped[float] = mapped_column(sa.Numeric(15, 2), nullable=False)
     operation_type: Mapped[str] = mapped_column(sa.String(length=50), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        sa.DateTime(timezone=True), nullable=False, server_default=functions.now()
-    )
\ No newline at end of file
+        sa.DateTime(timezone=True), primary_key=True, nullable=False, server_default=functions.now()
+    )
+
+
+class BalanceSnapshot(Base):
+    __tablename__ = "balance_snapshot"
+    __table_args__ = (
+        sa.UniqueConstraint("balance_id", "taken_at"),
+        sa.Index("ix_balance_snapshot_taken_at", "taken_at"),
+        {"extend_existing": True},
+    )
+
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7)
+    balance_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("balance.id"), nullable=False)
+    amount: Mapped[float] = mapped_column(sa.Numeric(15, 2), nullable=False)
+    taken_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
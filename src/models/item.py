@@ -1,17 +1,18 @@
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import functions
 
 from src.models.base import Base
+from src.utilities.generators.uuid_generator import generate_uuid7
 
 
 class ItemType(Base):
     __tablename__ = "item_type"
 
-    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=uuid4())
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7)
     name: Mapped[str] = mapped_column(sa.String(length=50), nullable=False)
     type: Mapped[str] = mapped_column(sa.String(length=50), nullable=False)
     rarity: Mapped[str] = mapped_column(sa.String(length=50), nullable=False)
@@ -21,22 +22,24 @@ class ItemType(Base):
 class Item(Base):
     __tablename__ = "item"
 
-    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=uuid4())
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7)
     type_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("item_type.id"), nullable=False)
     character_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("character.id"), nullable=True)
-    owner_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("user.id"), nullable=True)
+    owner_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("user.id"), nullable=True, index=True)
     is_equipped: Mapped[bool] = mapped_column(sa.Boolean, nullable=False, default=False)
 
 
 class ItemTransferHistory(Base):
     __tablename__ = "item_transfer_history"
+    __table_args__ = {"extend_existing": True, "postgresql_partition_by": "RANGE (created_at)"}
 
-    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=uuid4())
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7)
     item_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("item.id"), nullable=False)
     from_owner_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("user.id"), nullable=False)
     to_owner_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("user.id"), nullable=False)
     fee_amount: Mapped[float] = mapped_column(sa.Numeric(15, 2), nullable=False)
-    balance_transfer_history_id: Mapped[UUID] = mapped_column(sa.UUID, sa.ForeignKey("balance_transfer_history.id"), nullable=False)
+    # Not a foreign key: a partitioned `balance_transfer_history` is only unique on (`id`, `created_at`).
+    balance_transfer_history_id: Mapped[UUID] = mapped_column(sa.UUID, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        sa.DateTime(timezone=True), nullable=False, server_default=functions.now()
+        sa.DateTime(timezone=True), primary_key=True, nullable=False, server_default=functions.now()
     )
@@ -1,17 +1,19 @@
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import functions
 
 from src.models.base import Base
+from src.utilities.generators.uuid_generator import generate_uuid7
 
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (sa.Index("ix_user_created_at_id", "created_at", "id"), {"extend_existing": True})
 
-    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=uuid4())
+    id: Mapped[UUID] = mapped_column(sa.UUID, primary_key=True, default=generate_uuid7)
     username: Mapped[str] = mapped_column(sa.String(length=64), nullable=False, unique=True)
     email: Mapped[str] = mapped_column(sa.String(length=64), nullable=False, unique=True)
     _hashed_password: Mapped[str] = mapped_column(sa.String(length=1024), nullable=True)
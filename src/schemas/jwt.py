@@ -11,3 +11,9 @@ class JWToken(pydantic.BaseModel):
 class JWTUser(pydantic.BaseModel):
     user_id: str
     email: pydantic.EmailStr
+    session_id: str | None = None
+
+
+class JWTRefresh(JWTUser):
+    session_id: str
+    token_id: str
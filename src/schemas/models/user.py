@@ -0,0 +1,15 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class UserModelType(BaseModel):
+    id: UUID
+    username: str
+    email: str
+    is_verified: bool
+    is_active: bool
+    is_logged_in: bool
+    created_at: datetime
+    updated_at: datetime | None
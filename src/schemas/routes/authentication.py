@@ -0,0 +1,10 @@
+from src.schemas.base import BaseSchemaModel
+
+
+class RefreshTokenInRequestType(BaseSchemaModel):
+    refresh_token: str
+
+
+class TokensInResponseType(BaseSchemaModel):
+    token: str
+    refresh_token: str
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, condecimal
+from pydantic import BaseModel, condecimal, conlist
 
 
 class BalanceUpdateType(BaseModel):
@@ -16,6 +16,12 @@ class BalanceType(BaseModel):
     updated_at: datetime
 
 
+class BalanceAtTimeType(BaseModel):
+    user_id: UUID
+    amount: condecimal(max_digits=15, decimal_places=2)
+    at: datetime
+
+
 class BalanceTransferType(BaseModel):
     from_user_id: UUID
     to_user_id: UUID
@@ -30,4 +36,15 @@ class BalanceTransferHistoryType(BaseModel):
     balance_before: condecimal(max_digits=15, decimal_places=2)
     balance_after: condecimal(max_digits=15, decimal_places=2)
     operation_type: str
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+
+class BalanceTransferBatchType(BaseModel):
+    transfers: conlist(BalanceTransferType, min_length=1, max_length=5000)
+
+
+class BalanceTransferResultType(BaseModel):
+    index: int
+    is_applied: bool
+    transfer: BalanceTransferHistoryType | None = None
+    detail: str | None = None
@@ -27,6 +27,7 @@ class ItemTransferType(BaseModel):
     item_id: UUID
     from_owner_id: UUID
     to_owner_id: UUID
+    amount: condecimal(max_digits=15, decimal_places=2)
     fee_amount: condecimal(max_digits=15, decimal_places=2)
 
 
@@ -36,4 +36,5 @@ class UserType(BaseSchemaModel):
 class UserInResponseType(BaseSchemaModel):
     id: UUID
     token: str
+    refresh_token: str | None = None
     authorized_user: UserType
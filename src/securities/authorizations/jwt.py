@@ -5,7 +5,9 @@ from jose import jwt as jose_jwt, JWTError as JoseJWTError
 
 from src.config.manager import settings
 from src.models.user import User
-from src.schemas.jwt import JWTUser, JWToken
+from src.schemas.jwt import JWTRefresh, JWTUser, JWToken
+from src.securities.authorizations.revocations import revoked_sessions
+from src.securities.authorizations.token_cache import verified_token_cache
 from src.utilities.exceptions.database import EntityDoesNotExist
 
 
@@ -18,6 +20,7 @@ class JWTGenerator:
         *,
         jwt_data: dict[str, str],
         expires_delta: timedelta | None = None,
+        secret_key: str = settings.JWT_SECRET_KEY_ACCESS_TOKEN,
     ) -> str:
         to_encode = jwt_data.copy()
 
@@ -29,30 +32,37 @@ class JWTGenerator:
 
         to_encode.update(JWToken(exp=expire, sub=settings.JWT_SUBJECT).dict())
 
-        return jose_jwt.encode(to_encode, key=settings.JWT_SECRET_KEY_ACCESS_TOKEN, algorithm=settings.JWT_ALGORITHM)
+        return jose_jwt.encode(to_encode, key=secret_key, algorithm=settings.JWT_ALGORITHM)
 
-    def generate_access_token(self, user: User) -> str:
+    def generate_access_token(self, user: User, session_id: str | None = None) -> str:
         if not user:
             raise EntityDoesNotExist(f"Cannot generate JWT token without User entity!")
 
+        return self.renew_access_token(jwt_user=JWTUser(user_id=str(user.id), email=user.email, session_id=session_id))
+
+    def renew_access_token(self, jwt_user: JWTUser) -> str:
+        # Rebuilt as a `JWTUser`, so the claims of a refresh token passed in do not leak into the access token.
         return self._generate_jwt_token(
-            jwt_data=JWTUser(user_id=user.id, email=user.email).dict(),
+            jwt_data=JWTUser(**jwt_user.dict()).dict(),
             expires_delta=timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRATION_TIME_MIN),
         )
 
-    def generate_refresh_token(self, user: User) -> str:
-        if not user:
-            raise EntityDoesNotExist(f"Cannot generate JWT token without User entity!")
-
+    def generate_refresh_token(self, jwt_user: JWTUser, token_id: str) -> str:
         return self._generate_jwt_token(
-            jwt_data=JWTUser(user_id=user.id, email=user.email).dict(),
+            jwt_data=JWTRefresh(**(jwt_user.dict() | {"token_id": token_id})).dict(),
             expires_delta=timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRATION_TIME_DAYS),
+            secret_key=settings.JWT_SECRET_KEY_REFRESH_TOKEN,
         )
 
     def retrieve_details_from_token(self, token: str, secret_key: str) -> JWTUser:
+        jwt_user = verified_token_cache.get(token=token, secret_key=secret_key)
+        if jwt_user is not None:
+            self._raise_if_revoked(jwt_user=jwt_user)
+            return jwt_user
+
         try:
             payload = jose_jwt.decode(token=token, key=secret_key, algorithms=[settings.JWT_ALGORITHM])
-            jwt_user = JWTUser(user_id=payload["user_id"], email=payload["email"])
+            jwt_user = JWTUser(user_id=payload["user_id"], email=payload["email"], session_id=payload.get("session_id"))
 
         except JoseJWTError as token_decode_error:
             raise ValueError("Unable to decode JWT Token") from token_decode_error
@@ -60,8 +70,34 @@ class JWTGenerator:
         except pydantic.ValidationError as validation_error:
             raise ValueError("Invalid payload in token") from validation_error
 
+        verified_token_cache.set(token=token, secret_key=secret_key, jwt_user=jwt_user, expires_at=payload["exp"])
+        self._raise_if_revoked(jwt_user=jwt_user)
         return jwt_user
 
+    def retrieve_details_from_refresh_token(self, token: str) -> JWTRefresh:
+        """
+        Verify a refresh token. It is not cached like access tokens, since each one is presented once.
+        """
+        try:
+            payload = jose_jwt.decode(
+                token=token, key=settings.JWT_SECRET_KEY_REFRESH_TOKEN, algorithms=[settings.JWT_ALGORITHM]
+            )
+            jwt_refresh = JWTRefresh.model_validate(payload)
+
+        except JoseJWTError as token_decode_error:
+            raise ValueError("Unable to decode JWT Token") from token_decode_error
+
+        except pydantic.ValidationError as validation_error:
+            raise ValueError("Invalid payload in token") from validation_error
+
+        self._raise_if_revoked(jwt_user=jwt_refresh)
+        return jwt_refresh
+
+    @staticmethod
+    def _raise_if_revoked(jwt_user: JWTUser) -> None:
+        if revoked_sessions.is_revoked(jwt_user.session_id):
+            raise ValueError("The session of the token has ended")
+
 
 def get_jwt_generator() -> JWTGenerator:
     return JWTGenerator()
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from src.cache.backend import CacheBackend
+from src.cache.manager import async_cache
+from src.config.manager import settings
+
+REVOKED_SESSIONS_KEY: str = "session:revoked"
+
+
+class RevokedSessions:
+    """
+    The sessions ended before their tokens expire, held in memory so every token check stays a dictionary
+    lookup. A session is revoked for `expire` seconds, the lifetime of its last access token; its refresh token
+    stops working with the session itself. Revocations made by other workers arrive with the next `sync`.
+    """
+
+    def __init__(self, cache: CacheBackend, expire: int):
+        self.cache: CacheBackend = cache
+        self._expire: int = expire
+        self._sessions: dict[str, float] = dict()
+
+    def is_revoked(self, session_id: str | None) -> bool:
+        return session_id is not None and self._sessions.get(session_id, float("-inf")) > time.time()
+
+    async def revoke(self, session_id: str) -> None:
+        expires_at = time.time() + self._expire
+        self._sessions[session_id] = expires_at
+        await self.cache.add_expiring_member(REVOKED_SESSIONS_KEY, member=session_id, expires_at=expires_at)
+
+    async def sync(self) -> None:
+        """
+        Merge the revocations stored in the cache into this worker's set. Local ones are kept, so a revocation
+        that could not be stored still holds in the worker that made it.
+        """
+        stored_sessions = await self.cache.read_expiring_members(REVOKED_SESSIONS_KEY)
+        if stored_sessions is None:
+            return
+
+        now = time.time()
+        self._sessions = {
+            session_id: expires_at
+            for session_id, expires_at in (self._sessions | stored_sessions).items()
+            if expires_at > now
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+def get_revoked_sessions() -> RevokedSessions:
+    return RevokedSessions(cache=async_cache, expire=settings.JWT_ACCESS_TOKEN_EXPIRATION_TIME_MIN * 60)
+
+
+revoked_sessions: RevokedSessions = get_revoked_sessions()
+
+
+async def run_revocation_sync() -> None:
+    # The cache backends degrade a failed read to `None`, which `sync` skips, so the loop needs no error handling.
+    while True:
+        await revoked_sessions.sync()
+        await asyncio.sleep(settings.JWT_REVOCATION_SYNC_INTERVAL)
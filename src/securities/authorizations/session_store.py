@@ -0,0 +1,118 @@
+import logging
+import time
+
+from src.cache.backend import CacheBackend, SessionRotation
+from src.cache.manager import async_cache
+from src.cache.policy import session_cache_policy
+from src.config.manager import settings
+from src.models.user import User
+from src.schemas.jwt import JWTUser
+from src.securities.authorizations.jwt import jwt_generator
+from src.securities.authorizations.revocations import revoked_sessions
+from src.securities.authorizations.token_cache import verified_token_cache
+from src.utilities.exceptions.session import SessionDoesNotExist, SessionStoreUnavailable
+from src.utilities.generators.uuid_generator import generate_uuid7
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    Signin sessions kept in the cache, renewed with rotating refresh tokens. A session stores the id of the one
+    refresh token that may renew it, and each renewal swaps that id atomically. A refresh token therefore works
+    once. When an already used one comes back, it has leaked, so the session ends for both holders. Renewals only
+    touch the cache, never the database or the password hasher, so every session of a user is also listed under
+    `user:sessions:{user_id}` for `end_user_sessions` to end them when the account changes.
+    """
+
+    def __init__(self, cache: CacheBackend):
+        self.cache: CacheBackend = cache
+
+    async def start_session(self, user: User) -> tuple[str, str]:
+        """
+        Return the access token and the refresh token of a new session of `user`.
+        """
+        jwt_user = JWTUser(user_id=str(user.id), email=user.email, session_id=generate_uuid7().hex)
+        token_id = generate_uuid7().hex
+
+        await self.cache.set(f"session:{jwt_user.session_id}", token_id, policy=session_cache_policy)
+        await self._list_session(jwt_user=jwt_user)
+
+        return (
+            jwt_generator.renew_access_token(jwt_user=jwt_user),
+            jwt_generator.generate_refresh_token(jwt_user=jwt_user, token_id=token_id),
+        )
+
+    async def renew_session(self, refresh_token: str) -> tuple[str, str]:
+        """
+        Trade `refresh_token` for a new access token and refresh token of the same session.
+        """
+        jwt_refresh = jwt_generator.retrieve_details_from_refresh_token(token=refresh_token)
+        new_token_id = generate_uuid7().hex
+
+        rotation = await self.cache.rotate_session(
+            f"session:{jwt_refresh.session_id}",
+            token_id=jwt_refresh.token_id,
+            new_token_id=new_token_id,
+            expire=session_cache_policy.expire,
+        )
+
+        if rotation == SessionRotation.UNAVAILABLE:
+            raise SessionStoreUnavailable("The session store is unavailable!")
+
+        if rotation == SessionRotation.REUSED:
+            await revoked_sessions.revoke(session_id=jwt_refresh.session_id)
+
+        if rotation != SessionRotation.ROTATED:
+            raise SessionDoesNotExist(f"Session `{jwt_refresh.session_id}` has ended!")
+
+        await self._list_session(jwt_user=jwt_refresh)
+
+        return (
+            jwt_generator.renew_access_token(jwt_user=jwt_refresh),
+            jwt_generator.generate_refresh_token(jwt_user=jwt_refresh, token_id=new_token_id),
+        )
+
+    async def end_session(self, refresh_token: str, access_token: str | None = None) -> None:
+        """
+        End the session of `refresh_token`: it can no longer be renewed and its access tokens stop working.
+        The claims of `access_token`, when given, are also dropped from the verified-token cache.
+        """
+        jwt_refresh = jwt_generator.retrieve_details_from_refresh_token(token=refresh_token)
+
+        await self.cache.delete(f"session:{jwt_refresh.session_id}")
+        await revoked_sessions.revoke(session_id=jwt_refresh.session_id)
+
+        if access_token:
+            verified_token_cache.revoke_token(token=access_token, secret_key=settings.JWT_SECRET_KEY_ACCESS_TOKEN)
+
+    async def end_user_sessions(self, user_id: str) -> None:
+        """
+        End every session of `user_id`, e.g. once the account is deleted or its credentials change: none of its
+        refresh tokens can be renewed any more and their access tokens stop working in every worker.
+        """
+        sessions = await self.cache.read_expiring_members(f"user:sessions:{user_id}")
+        if sessions is None:
+            logger.warning(f"Session Store --- The sessions of user `{user_id}` could not be read to end them")
+            return
+
+        await self.cache.delete_many(
+            keys=[f"session:{session_id}" for session_id in sessions] + [f"user:sessions:{user_id}"]
+        )
+        for session_id in sessions:
+            await revoked_sessions.revoke(session_id=session_id)
+
+    async def _list_session(self, jwt_user: JWTUser) -> None:
+        # Listed until the session record itself expires, which every renewal pushes back.
+        await self.cache.add_expiring_member(
+            f"user:sessions:{jwt_user.user_id}",
+            member=jwt_user.session_id,
+            expires_at=time.time() + session_cache_policy.expire,
+        )
+
+
+def get_session_store() -> SessionStore:
+    return SessionStore(cache=async_cache)
+
+
+session_store: SessionStore = get_session_store()
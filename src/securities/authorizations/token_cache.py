@@ -0,0 +1,65 @@
+import hashlib
+import time
+
+from src.cache.local import CacheStats, LocalCache
+from src.config.manager import settings
+from src.schemas.jwt import JWTUser
+
+
+class VerifiedTokenCache:
+    """
+    A bounded in-process cache of the claims of tokens that already passed verification, so a client sending the
+    same bearer token on every request is decoded and validated once. Entries are keyed by a digest of the token
+    keyed with the secret it was verified against, and expire at the token's `exp` or after `expire` seconds,
+    whichever comes first; the latter bounds how long another worker may keep serving a revoked token.
+    """
+
+    def __init__(self, max_size: int, expire: int):
+        self._expire: int = expire
+        self._entries: LocalCache = LocalCache(max_size=max_size, expire=expire)
+        self._revoked_users: dict[str, float] = dict()
+        self.stats: CacheStats = CacheStats()
+
+    def get(self, token: str, secret_key: str) -> JWTUser | None:
+        entry = self._entries.get(self._digest(token, secret_key))
+        if entry is not None:
+            cached_at, jwt_user = entry
+            if self._revoked_users.get(jwt_user.user_id, float("-inf")) < cached_at:
+                self.stats.record(is_hit=True)
+                return jwt_user
+
+        self.stats.record(is_hit=False)
+        return None
+
+    def set(self, token: str, secret_key: str, jwt_user: JWTUser, expires_at: float) -> None:
+        expire = min(int(expires_at - time.time()), self._expire)
+        if expire > 0:
+            self._entries.set(self._digest(token, secret_key), (time.monotonic(), jwt_user), expire=expire)
+
+    def revoke_token(self, token: str, secret_key: str) -> None:
+        self._entries.delete(self._digest(token, secret_key))
+
+    def revoke_user(self, user_id: str) -> None:
+        """
+        Stop serving every token of `user_id` cached so far; tokens verified afterwards are cached again.
+        """
+        now = time.monotonic()
+        self._revoked_users = {
+            revoked_user_id: revoked_at
+            for revoked_user_id, revoked_at in self._revoked_users.items()
+            if now - revoked_at < self._expire
+        }
+        self._revoked_users[str(user_id)] = now
+
+    @staticmethod
+    def _digest(token: str, secret_key: str) -> str:
+        return hashlib.blake2b(token.encode(), key=secret_key.encode()[:64], digest_size=32).hexdigest()
+
+
+def get_verified_token_cache() -> VerifiedTokenCache:
+    return VerifiedTokenCache(
+        max_size=settings.JWT_VERIFIED_TOKEN_CACHE_MAX_SIZE, expire=settings.JWT_VERIFIED_TOKEN_CACHE_EXPIRE
+    )
+
+
+verified_token_cache: VerifiedTokenCache = get_verified_token_cache()
@@ -0,0 +1,93 @@
+"""
+Benchmark Argon2 on this host and print the `HASHING_ARGON2_*` settings whose hash takes about `--target-ms`:
+
+    python -m src.securities.hashing.calibration --target-ms 250
+
+Passwords hashed with earlier settings keep verifying and are rehashed with the new ones on their next signin.
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.hash import argon2
+
+from src.config.manager import settings
+from src.securities.hashing.password import pwd_generator
+
+# Argon2 needs at least 8 KiB of memory per lane.
+ARGON2_MIN_MEMORY_COST_PER_LANE: int = 8
+ARGON2_MAX_TIME_COST: int = 64
+
+
+def measure_argon2(time_cost: int, memory_cost: int, parallelism: int, secret: str, samples: int) -> float:
+    """
+    Return the median time in milliseconds of hashing `secret` with the given Argon2 costs.
+    """
+    hasher = argon2.using(rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    durations = list()
+
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        hasher.hash(secret)
+        durations.append((time.perf_counter() - started_at) * 1000)
+
+    return statistics.median(durations)
+
+
+def calibrate_argon2(
+    target_ms: float, max_memory_cost: int, parallelism: int, samples: int = 5
+) -> tuple[int, int, float]:
+    """
+    Pick the Argon2 (`time_cost`, `memory_cost`) whose hash takes the longest without exceeding `target_ms`.
+    Memory is the costlier resource for an attacker, so it stays at `max_memory_cost` and only the number of
+    passes grows; it is halved only when a single pass already misses the target.
+    """
+    secret = pwd_generator.generate_salt + "calibration-password"
+    min_memory_cost = ARGON2_MIN_MEMORY_COST_PER_LANE * parallelism
+    memory_cost = max_memory_cost
+    latency = measure_argon2(1, memory_cost, parallelism, secret=secret, samples=samples)
+
+    while latency > target_ms and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+        latency = measure_argon2(1, memory_cost, parallelism, secret=secret, samples=samples)
+
+    time_cost = 1
+    while time_cost < ARGON2_MAX_TIME_COST:
+        next_latency = measure_argon2(time_cost + 1, memory_cost, parallelism, secret=secret, samples=samples)
+        if next_latency > target_ms:
+            break
+
+        time_cost, latency = time_cost + 1, next_latency
+
+    return time_cost, memory_cost, latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pick the Argon2 costs of the password hashes for this host.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target duration of one password hash.")
+    parser.add_argument(
+        "--max-memory-cost",
+        type=int,
+        default=settings.HASHING_ARGON2_MEMORY_COST,
+        help="Memory of one hash in KiB; lowered only when a single pass misses the target.",
+    )
+    parser.add_argument("--parallelism", type=int, default=settings.HASHING_ARGON2_PARALLELISM)
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per candidate.")
+    arguments = parser.parse_args()
+
+    time_cost, memory_cost, latency = calibrate_argon2(
+        target_ms=arguments.target_ms,
+        max_memory_cost=arguments.max_memory_cost,
+        parallelism=arguments.parallelism,
+        samples=arguments.samples,
+    )
+
+    print(f"# One hash takes {latency:.1f} ms on this host (target: {arguments.target_ms:.1f} ms)")
+    print(f"HASHING_ARGON2_TIME_COST={time_cost}")
+    print(f"HASHING_ARGON2_MEMORY_COST={memory_cost}")
+    print(f"HASHING_ARGON2_PARALLELISM={arguments.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
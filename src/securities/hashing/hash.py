@@ -9,10 +9,25 @@ class HashGenerator:
             schemes=[settings.HASHING_ALGORITHM_LAYER_1], deprecated="auto"
         )
         self._hash_ctx_layer_2: CryptContext = CryptContext(
-            schemes=[settings.HASHING_ALGORITHM_LAYER_2], deprecated="auto"
+            schemes=[settings.HASHING_ALGORITHM_LAYER_2], deprecated="auto", **self._get_layer_2_costs
         )
         self._hash_ctx_salt: str = settings.HASHING_SALT
 
+    @property
+    def _get_layer_2_costs(self) -> dict[str, int]:
+        """
+        The Argon2 costs new hashes are made with. Every hash carries the costs it was made with, so a hash made
+        with other costs still verifies and is flagged by `verify_and_update_password_hash` for a rehash.
+        """
+        if settings.HASHING_ALGORITHM_LAYER_2 != "argon2":
+            return dict()
+
+        return {
+            "argon2__rounds": settings.HASHING_ARGON2_TIME_COST,
+            "argon2__memory_cost": settings.HASHING_ARGON2_MEMORY_COST,
+            "argon2__parallelism": settings.HASHING_ARGON2_PARALLELISM,
+        }
+
     @property
     def _get_hashing_salt(self) -> str:
         return self._hash_ctx_salt
@@ -37,6 +52,13 @@ class HashGenerator:
         """
         return self._hash_ctx_layer_2.verify(secret=password, hash=hashed_password)
 
+    def verify_and_update_password_hash(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        A function that verifies users' password like `is_password_verified` and, when it is correct but was
+        hashed with outdated costs, also returns a new hash of it made with the current ones.
+        """
+        return self._hash_ctx_layer_2.verify_and_update(secret=password, hash=hashed_password)
+
 
 def get_hash_generator() -> HashGenerator:
     return HashGenerator()
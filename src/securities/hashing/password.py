@@ -12,6 +12,13 @@ class PasswordGenerator:
     def is_password_authenticated(self, hash_salt: str, password: str, hashed_password: str) -> bool:
         return hash_generator.is_password_verified(password=hash_salt + password, hashed_password=hashed_password)
 
+    def authenticate_and_rehash_password(
+        self, hash_salt: str, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return hash_generator.verify_and_update_password_hash(
+            password=hash_salt + password, hashed_password=hashed_password
+        )
+
 
 def get_pwd_generator() -> PasswordGenerator:
     return PasswordGenerator()
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import multiprocessing
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.config.manager import settings
+from src.securities.hashing.password import pwd_generator
+from src.utilities.exceptions.hashing import HashingServiceOverloaded
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_salt() -> str:
+    return pwd_generator.generate_salt
+
+
+def _generate_hashed_password(hash_salt: str, new_password: str) -> str:
+    return pwd_generator.generate_hashed_password(hash_salt=hash_salt, new_password=new_password)
+
+
+def _is_password_authenticated(hash_salt: str, password: str, hashed_password: str) -> bool:
+    return pwd_generator.is_password_authenticated(
+        hash_salt=hash_salt, password=password, hashed_password=hashed_password
+    )
+
+
+def _authenticate_and_rehash_password(hash_salt: str, password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_generator.authenticate_and_rehash_password(
+        hash_salt=hash_salt, password=password, hashed_password=hashed_password
+    )
+
+
+class AsyncHashingService:
+    """
+    Run the `pwd_generator` work in a pool of `max_workers` processes, so hashing does not block the event loop.
+    At most `max_workers` calls are handed to the pool at a time and the rest wait here, where a cancelled request
+    simply leaves the queue. Once `max_queue_depth` calls are waiting, further calls fail fast with
+    `HashingServiceOverloaded` instead of queueing behind a backlog they would time out in anyway.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        self.max_workers: int = max_workers
+        self.max_queue_depth: int = max_queue_depth
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_workers)
+        self._waiting: int = 0
+
+    def start(self) -> None:
+        # Workers are spawned rather than forked, since forking a process that runs an event loop and other
+        # threads can deadlock the child.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def generate_salt(self) -> str:
+        return await self._run(_generate_salt)
+
+    async def generate_hashed_password(self, hash_salt: str, new_password: str) -> str:
+        return await self._run(_generate_hashed_password, hash_salt, new_password)
+
+    async def is_password_authenticated(self, hash_salt: str, password: str, hashed_password: str) -> bool:
+        return await self._run(_is_password_authenticated, hash_salt, password, hashed_password)
+
+    async def authenticate_and_rehash_password(
+        self, hash_salt: str, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(_authenticate_and_rehash_password, hash_salt, password, hashed_password)
+
+    async def _run(self, function: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        if self._waiting >= self.max_queue_depth:
+            raise HashingServiceOverloaded(f"{self._waiting} hashing calls are already waiting for a worker!")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+
+        finally:
+            self._waiting -= 1
+
+        try:
+            self.start()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+        except BrokenProcessPool:
+            logger.warning("Hashing Pool --- A worker died, the pool restarts on the next call")
+            self.shutdown()
+            raise
+
+        finally:
+            self._slots.release()
+
+
+def get_hashing_service() -> AsyncHashingService:
+    return AsyncHashingService(
+        max_workers=settings.HASHING_POOL_WORKERS, max_queue_depth=settings.HASHING_QUEUE_MAX_DEPTH
+    )
+
+
+hashing_service: AsyncHashingService = get_hashing_service()
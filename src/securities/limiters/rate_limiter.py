@@ -0,0 +1,91 @@
+import hashlib
+import typing
+
+from src.cache.backend import CacheBackend
+from src.cache.manager import async_cache
+from src.config.manager import settings
+from src.utilities.exceptions.http.exc_429 import http_429_exc_too_many_requests
+
+
+class RateLimitRule:
+    """
+    A token bucket per subject (client IP, account, ...): up to `capacity` requests in a burst, refilled at
+    `capacity` requests per `period` seconds.
+    """
+
+    def __init__(self, name: str, capacity: int, period: int):
+        self.name: str = name
+        self.capacity: int = capacity
+        self.period: int = period
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+class RateLimitStats:
+    def __init__(self):
+        self.allowed: int = 0
+        self.limited: int = 0
+
+    def record(self, is_allowed: bool) -> None:
+        if is_allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+
+    def as_dict(self) -> dict[str, int]:
+        return {"allowed": self.allowed, "limited": self.limited}
+
+
+class RateLimiter:
+    def __init__(self, cache: CacheBackend, is_enabled: bool):
+        self.cache: CacheBackend = cache
+        self.is_enabled: bool = is_enabled
+        self.stats: dict[str, RateLimitStats] = dict()
+
+    async def hit(self, rule: RateLimitRule, subject: str) -> float:
+        """
+        Count one request of `subject` against `rule`. Return 0 when it is allowed, or else the seconds until
+        the subject may retry. Subjects are digested, so account names never end up in the cache.
+        """
+        if not self.is_enabled:
+            return 0.0
+
+        digest = hashlib.blake2b(subject.encode(), digest_size=16).hexdigest()
+        retry_after = await self.cache.take_token(
+            key=f"rate-limit:{rule.name}:{digest}", capacity=rule.capacity, refill_rate=rule.refill_rate
+        )
+
+        self.stats.setdefault(rule.name, RateLimitStats()).record(is_allowed=retry_after == 0)
+        return retry_after
+
+    async def enforce(self, limits: typing.Sequence[tuple[RateLimitRule, str]]) -> None:
+        """
+        Count the request against every (rule, subject) of `limits` in order and answer 429 at the first one
+        exhausted; the later buckets are left untouched, so a flood stopped by its IP does not drain the account.
+        """
+        for rule, subject in limits:
+            retry_after = await self.hit(rule=rule, subject=subject)
+            if retry_after:
+                raise await http_429_exc_too_many_requests(retry_after=retry_after)
+
+    @property
+    def metrics(self) -> dict[str, dict[str, int]]:
+        return {f"rate-limit:{name}": rule_stats.as_dict() for name, rule_stats in self.stats.items()}
+
+
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(cache=async_cache, is_enabled=settings.IS_RATE_LIMIT_ENABLED)
+
+
+rate_limiter: RateLimiter = get_rate_limiter()
+
+auth_ip_rate_limit_rule: RateLimitRule = RateLimitRule(
+    name="auth-ip", capacity=settings.RATE_LIMIT_AUTH_IP_CAPACITY, period=settings.RATE_LIMIT_AUTH_IP_PERIOD
+)
+auth_account_rate_limit_rule: RateLimitRule = RateLimitRule(
+    name="auth-account",
+    capacity=settings.RATE_LIMIT_AUTH_ACCOUNT_CAPACITY,
+    period=settings.RATE_LIMIT_AUTH_ACCOUNT_PERIOD,
+)
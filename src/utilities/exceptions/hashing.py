@@ -0,0 +1,4 @@
+class HashingServiceOverloaded(Exception):
+    """
+    Throw an exception when too many password hashing calls are already waiting for a worker.
+    """
@@ -0,0 +1,18 @@
+"""
+The HyperText Transfer Protocol (HTTP) 429 Too Many Requests response status code indicates the user has sent
+too many requests in a given amount of time; `Retry-After` tells the client how long to wait before retrying.
+"""
+
+import math
+
+import fastapi
+
+from src.utilities.messages.exceptions.http.exc_details import http_429_too_many_requests_details
+
+
+async def http_429_exc_too_many_requests(retry_after: float) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=http_429_too_many_requests_details(),
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
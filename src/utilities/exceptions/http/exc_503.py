@@ -0,0 +1,27 @@
+"""
+The HyperText Transfer Protocol (HTTP) 503 Service Unavailable server error response code indicates that the server
+is not ready to handle the request, e.g. because it is overloaded; `Retry-After` tells the client when to retry.
+"""
+
+import fastapi
+
+from src.utilities.messages.exceptions.http.exc_details import (
+    http_503_hashing_overloaded_details,
+    http_503_session_store_unavailable_details,
+)
+
+
+async def http_503_exc_hashing_overloaded_request() -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=http_503_hashing_overloaded_details(),
+        headers={"Retry-After": "1"},
+    )
+
+
+async def http_503_exc_session_store_unavailable_request() -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=http_503_session_store_unavailable_details(),
+        headers={"Retry-After": "1"},
+    )
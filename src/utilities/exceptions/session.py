@@ -0,0 +1,10 @@
+class SessionDoesNotExist(Exception):
+    """
+    Throw an exception when the session of a refresh token has ended or its token was already used.
+    """
+
+
+class SessionStoreUnavailable(Exception):
+    """
+    Throw an exception when the sessions cannot be read or renewed because the cache is unavailable.
+    """
@@ -0,0 +1,21 @@
+import base64
+import datetime
+import json
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime.datetime, pk: UUID) -> str:
+    payload = json.dumps([created_at.isoformat(), str(pk)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, UUID]:
+    """
+    Invert `encode_cursor`; any malformed cursor raises `ValueError`.
+    """
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.datetime.fromisoformat(created_at), UUID(pk)
+
+    except (TypeError, ValueError) as cursor_error:
+        raise ValueError(f"Malformed cursor `{cursor}`") from cursor_error
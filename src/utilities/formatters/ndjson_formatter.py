@@ -0,0 +1,8 @@
+import typing
+
+import pydantic
+
+
+async def format_models_into_ndjson(models: typing.AsyncIterator[pydantic.BaseModel]) -> typing.AsyncIterator[str]:
+    async for model in models:
+        yield model.model_dump_json(by_alias=True) + "\n"
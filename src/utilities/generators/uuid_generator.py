@@ -0,0 +1,33 @@
+import os
+import threading
+import time
+from uuid import UUID
+
+_lock = threading.Lock()
+_last_timestamp_ms: int = 0
+_counter: int = 0
+
+
+def generate_uuid7() -> UUID:
+    """
+    Return a UUIDv7 (RFC 9562): a 48-bit Unix millisecond timestamp followed by random bits, so keys generated
+    later sort after earlier ones and B-tree inserts land on the right-most index page instead of a random one.
+    The 12 `rand_a` bits are a counter seeded randomly every millisecond, which keeps ids from this process
+    strictly increasing even within the same millisecond.
+    """
+    global _last_timestamp_ms, _counter
+
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_timestamp_ms:
+            _last_timestamp_ms = timestamp_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_timestamp_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_timestamp_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    return UUID(int=(timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b)
@@ -17,6 +17,10 @@ def http_400_sigin_credentials_details() -> str:
     return "Signin failed! Recheck all your credentials!"
 
 
+def http_400_cursor_details(cursor: str) -> str:
+    return f"The cursor `{cursor}` is invalid! Use the cursor returned with the previous page."
+
+
 def http_401_token_credentials_details() -> str:
     return "Invalid authentication scheme. Provide valid credentials."
 
@@ -39,3 +43,15 @@ def http_404_username_details(username: str) -> str:
 
 def http_404_email_details(email: str) -> str:
     return f"Either the user with email `{email}` doesn't exist, has been deleted, or you are not authorized!"
+
+
+def http_429_too_many_requests_details() -> str:
+    return "Too many attempts! Wait before trying again."
+
+
+def http_503_hashing_overloaded_details() -> str:
+    return "Too many signins and signups are in progress! Retry in a moment."
+
+
+def http_503_session_store_unavailable_details() -> str:
+    return "Sessions cannot be renewed right now! Retry in a moment or sign in again."
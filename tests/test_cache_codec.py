@@ -0,0 +1,54 @@
+import datetime
+import uuid
+
+from src.cache.codec import CacheCodec
+from src.models.character import Character
+from src.schemas.routes.character import CharacterType
+
+
+def build_character() -> Character:
+    return Character(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name="character",
+        created_at=datetime.datetime(2026, 10, 18, tzinfo=datetime.timezone.utc),
+    )
+
+
+def test_round_trip_keeps_the_schema_columns() -> None:
+    codec = CacheCodec(name="character", schema=CharacterType)
+    character = build_character()
+
+    decoded = codec.decode(codec.encode(character))
+
+    assert decoded == CharacterType(
+        id=character.id, user_id=character.user_id, name=character.name, created_at=character.created_at
+    )
+
+
+def test_payload_starts_with_the_name_and_version_header() -> None:
+    codec = CacheCodec(name="character", schema=CharacterType, version=3)
+
+    assert codec.encode(build_character()).startswith("character/v3|")
+
+
+def test_payload_of_another_version_is_a_miss() -> None:
+    old_codec = CacheCodec(name="character", schema=CharacterType, version=1)
+    new_codec = CacheCodec(name="character", schema=CharacterType, version=2)
+
+    assert new_codec.decode(old_codec.encode(build_character())) is None
+
+
+def test_payload_of_another_entity_is_a_miss() -> None:
+    character_codec = CacheCodec(name="character", schema=CharacterType)
+    other_codec = CacheCodec(name="item", schema=CharacterType)
+
+    assert other_codec.decode(character_codec.encode(build_character())) is None
+
+
+def test_missing_and_legacy_payloads_are_misses() -> None:
+    codec = CacheCodec(name="character", schema=CharacterType)
+
+    assert codec.decode(None) is None
+    assert codec.decode("") is None
+    assert codec.decode('{"name": "stored without a header"}') is None
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.cache.breaker import CircuitBreaker, CircuitState
+from src.cache.local import LocalCache
+from src.cache.redis import AsyncRedis
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_after_consecutive_failures(clock: list[float]) -> None:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.trips == 1
+
+
+def test_lets_one_probe_through_after_the_reset_timeout(clock: list[float]) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+
+    clock[0] += 10
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_opens_the_circuit_again(clock: list[float]) -> None:
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=10)
+    for _ in range(5):
+        breaker.record_failure()
+
+    clock[0] += 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_redis_calls_fall_back_while_the_circuit_is_open(clock: list[float]) -> None:
+    cache = AsyncRedis()
+    cache.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    calls = list()
+
+    async def failing_command() -> str:
+        calls.append("failing")
+        raise RedisConnectionError("Connection refused")
+
+    async def command() -> str:
+        calls.append("ok")
+        return "value"
+
+    async def run() -> list[str]:
+        results = [await cache._call(failing_command, fallback="fallback") for _ in range(3)]
+        clock[0] += 10
+        results.append(await cache._call(command, fallback="fallback"))
+        return results
+
+    assert asyncio.run(run()) == ["fallback", "fallback", "fallback", "value"]
+    assert calls == ["failing", "failing", "ok"]
+    assert cache.breaker.state == CircuitState.CLOSED
+
+
+def test_failed_write_drops_the_local_copy(clock: list[float]) -> None:
+    cache = AsyncRedis()
+    cache.local_cache = LocalCache(max_size=10, expire=60)
+    cache.local_cache.set("user:1", "cached")
+
+    async def failing_command() -> None:
+        raise RedisConnectionError("Connection refused")
+
+    asyncio.run(cache._call(failing_command, stale_keys=["user:1"]))
+
+    assert cache.local_cache.get("user:1") is None
+    assert cache._stale_keys == {"user:1"}
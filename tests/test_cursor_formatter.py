@@ -0,0 +1,22 @@
+import datetime
+import uuid
+
+import pytest
+
+from src.utilities.formatters.cursor_formatter import decode_cursor, encode_cursor
+
+
+def test_round_trip() -> None:
+    created_at = datetime.datetime(2026, 10, 18, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+    pk = uuid.uuid4()
+
+    cursor = encode_cursor(created_at, pk)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, pk)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bnVsbA", "WyJub3QgYSBkYXRlIiwiMSJd"])
+def test_malformed_cursor_raises_value_error(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
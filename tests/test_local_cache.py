@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from src.cache.local import LocalCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted(clock: list[float]) -> None:
+    cache = LocalCache(max_size=2, expire=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_entry_expires_after_its_ttl(clock: list[float]) -> None:
+    cache = LocalCache(max_size=10, expire=60)
+    cache.set("default", 1)
+    cache.set("short", 2, expire=5)
+
+    clock[0] += 5
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+    assert cache.ttl("default") == 55
+
+    clock[0] += 55
+    assert cache.get("default") is None
+    assert cache.ttl("default") == -2
+    assert len(cache) == 0
+
+
+def test_max_bytes_evicts_until_the_total_fits(clock: list[float]) -> None:
+    cache = LocalCache(max_size=10, expire=60, max_bytes=100)
+    cache.set("a", 1, size=40)
+    cache.set("b", 2, size=40)
+
+    cache.set("c", 3, size=50)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.size_in_bytes == 90
+
+
+def test_entry_larger_than_max_bytes_is_still_kept(clock: list[float]) -> None:
+    cache = LocalCache(max_size=10, expire=60, max_bytes=100)
+    cache.set("a", 1, size=40)
+
+    cache.set("big", 2, size=150)
+
+    assert cache.get("big") == 2
+    assert len(cache) == 1
+    assert cache.size_in_bytes == 150
+
+
+def test_overwrite_and_delete_keep_the_size_in_bytes(clock: list[float]) -> None:
+    cache = LocalCache(max_size=10, expire=60, max_bytes=100)
+    cache.set("a", 1, size=40)
+    cache.set("a", 2, size=10)
+    assert cache.size_in_bytes == 10
+
+    cache.delete("a")
+    assert cache.size_in_bytes == 0
@@ -0,0 +1,153 @@
+"""
+EXPLAIN regression checks for the hot lookups: each query must be served by the index added for it, never by a
+sequential scan. Runs against the Postgres of the application settings, migrated to head, and is skipped when it
+cannot be reached. The rows are seeded, analyzed and explained in one transaction that is rolled back afterwards.
+"""
+
+import asyncio
+import datetime
+
+import pytest
+import sqlalchemy
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.crud.balance import BalanceCRUDInterface
+from src.crud.user import UserCRUDInterface
+from src.database.db import async_db
+from src.models.balance import Balance
+from src.models.character import Character
+from src.models.item import Item
+from src.models.user import User
+from src.utilities.generators.uuid_generator import generate_uuid7
+
+SEEDED_USERS: int = 20_000
+SEEDED_HISTORY_PER_BALANCE: int = 10
+SEEDED_ITEMS_PER_USER: int = 3
+PAGE_SIZE: int = 50
+
+SEED_STATEMENTS: list[str] = [
+    f"""
+    INSERT INTO "user" (id, username, email, is_verified, is_active, is_logged_in, created_at)
+    SELECT gen_random_uuid(), 'plan-' || n, 'plan-' || n || '@example.com', true, true, false,
+           now() - n * interval '1 minute'
+    FROM generate_series(1, {SEEDED_USERS}) AS n
+    """,
+    """
+    INSERT INTO balance (id, user_id, amount, updated_at)
+    SELECT gen_random_uuid(), id, 100, now() FROM "user" WHERE username LIKE 'plan-%'
+    """,
+    f"""
+    INSERT INTO balance_transfer_history (id, balance_id, amount, balance_before, balance_after, operation_type)
+    SELECT gen_random_uuid(), balance.id, 1, 100, 99, 'update'
+    FROM balance JOIN "user" ON "user".id = balance.user_id, generate_series(1, {SEEDED_HISTORY_PER_BALANCE})
+    WHERE "user".username LIKE 'plan-%'
+    """,
+    """
+    INSERT INTO item_type (id, name, type, rarity, description)
+    VALUES ('00000000-0000-7000-8000-000000000001', 'plan', 'plan', 'common', 'plan')
+    """,
+    f"""
+    INSERT INTO item (id, type_id, owner_id, is_equipped)
+    SELECT gen_random_uuid(), '00000000-0000-7000-8000-000000000001', id, false
+    FROM "user", generate_series(1, {SEEDED_ITEMS_PER_USER}) WHERE username LIKE 'plan-%'
+    """,
+    """
+    INSERT INTO "character" (id, user_id, name, created_at)
+    SELECT gen_random_uuid(), id, username, now() FROM "user" WHERE username LIKE 'plan-%'
+    """,
+]
+
+ANALYZE_STATEMENT: str = 'ANALYZE "user", balance, balance_transfer_history, item, "character"'
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: sqlalchemy.Select):
+        self.statement = statement
+
+
+@compiles(Explain)
+def compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN " + compiler.process(element.statement, **kwargs)
+
+
+async def explain_hot_queries() -> dict[str, str]:
+    async_engine = create_async_engine(url=async_db.async_postgres_uri, poolclass=NullPool)
+
+    try:
+        async with async_engine.connect() as connection:
+            transaction = await connection.begin()
+
+            try:
+                for seed_statement in SEED_STATEMENTS:
+                    await connection.execute(sqlalchemy.text(seed_statement))
+                await connection.execute(sqlalchemy.text(ANALYZE_STATEMENT))
+
+                user_id, balance_id, created_at = (
+                    await connection.execute(
+                        sqlalchemy.select(User.id, Balance.id, User.created_at)
+                        .join(Balance, Balance.user_id == User.id)
+                        .where(User.username == f"plan-{SEEDED_USERS // 2}")
+                    )
+                ).one()
+                history_after = (datetime.datetime.now(tz=datetime.timezone.utc), generate_uuid7())
+                statements = {
+                    "balance by user": sqlalchemy.select(Balance.id).where(Balance.user_id == user_id),
+                    "balance history page": BalanceCRUDInterface._page_balance_history(balance_id).limit(PAGE_SIZE),
+                    "balance history next page": BalanceCRUDInterface._page_balance_history(
+                        balance_id=balance_id, after=history_after
+                    ).limit(PAGE_SIZE),
+                    "items by owner": sqlalchemy.select(Item).where(Item.owner_id == user_id),
+                    "characters by user": sqlalchemy.select(Character).where(Character.user_id == user_id),
+                    "user page": UserCRUDInterface._page_users(sqlalchemy.select(User.id), after=None).limit(PAGE_SIZE),
+                    "user next page": UserCRUDInterface._page_users(
+                        sqlalchemy.select(User.id), after=(created_at, user_id)
+                    ).limit(PAGE_SIZE),
+                }
+
+                plans = dict()
+                for name, statement in statements.items():
+                    plan_query = await connection.execute(Explain(statement))
+                    plans[name] = "\n".join(plan_query.scalars().all())
+
+                return plans
+
+            finally:
+                await transaction.rollback()
+
+    finally:
+        await async_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def query_plans() -> dict[str, str]:
+    try:
+        return asyncio.run(explain_hot_queries())
+
+    except (OSError, OperationalError, InterfaceError) as error:
+        pytest.skip(f"Postgres is not reachable: {error}")
+
+
+@pytest.mark.parametrize(
+    ("name", "index"),
+    [
+        ("balance by user", "ix_balance_user_id"),
+        # Every monthly partition carries its own copy of the index, named after the partition.
+        ("balance history page", "balance_id_created_at_id"),
+        ("balance history next page", "balance_id_created_at_id"),
+        ("items by owner", "ix_item_owner_id"),
+        ("characters by user", "ix_character_user_id"),
+        ("user page", "ix_user_created_at_id"),
+        ("user next page", "ix_user_created_at_id"),
+    ],
+)
+def test_hot_query_uses_index(query_plans: dict[str, str], name: str, index: str) -> None:
+    plan = query_plans[name]
+
+    assert index in plan, plan
+    assert "Seq Scan" not in plan, plan
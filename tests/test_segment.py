@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import pathlib
+import uuid
+
+import pytest
+
+from src.archive.segment import SegmentLayout, SegmentReader, SegmentWriter
+
+LAYOUT: SegmentLayout = SegmentLayout(
+    table="balance_transfer_history",
+    group_by="balance_id",
+    columns=(
+        ("id", "uuid"),
+        ("balance_id", "uuid"),
+        ("amount", "decimal"),
+        ("operation_type", "text"),
+        ("created_at", "timestamp"),
+    ),
+)
+STARTED_AT: datetime.datetime = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def build_rows(group_ids: list[uuid.UUID], rows_per_group: int) -> list[dict]:
+    rows = [
+        dict(
+            id=uuid.UUID(int=index),
+            balance_id=group_id,
+            amount=decimal.Decimal(index) / 4,
+            operation_type="transfer" if index % 2 else "update",
+            created_at=STARTED_AT + datetime.timedelta(minutes=index),
+        )
+        for group_id in group_ids
+        for index in range(rows_per_group)
+    ]
+    return sorted(rows, key=lambda row: (row["balance_id"], row["created_at"], row["id"]))
+
+
+@pytest.fixture
+def segment(tmp_path: pathlib.Path) -> tuple[SegmentReader, list[uuid.UUID], list[dict]]:
+    group_ids = [uuid.uuid4() for _ in range(3)]
+    rows = build_rows(group_ids, rows_per_group=25)
+    writer = SegmentWriter(tmp_path / "202601.seg", LAYOUT, block_rows=10)
+    writer.write_rows(rows)
+    writer.close()
+
+    reader = SegmentReader(tmp_path / "202601.seg")
+    yield reader, group_ids, rows
+    reader.close()
+
+
+def test_reads_back_every_row_of_a_group(segment: tuple[SegmentReader, list[uuid.UUID], list[dict]]) -> None:
+    reader, group_ids, rows = segment
+
+    for group_id in group_ids:
+        assert reader.read_group(group_id, after=None, limit=100) == [
+            row for row in rows if row["balance_id"] == group_id
+        ]
+    assert reader.row_count == len(rows)
+
+
+def test_limit_and_after_page_through_a_group(segment: tuple[SegmentReader, list[uuid.UUID], list[dict]]) -> None:
+    reader, group_ids, rows = segment
+    group_rows = [row for row in rows if row["balance_id"] == group_ids[1]]
+
+    first_page = reader.read_group(group_ids[1], after=None, limit=10)
+    second_page = reader.read_group(
+        group_ids[1], after=(first_page[-1]["created_at"], first_page[-1]["id"]), limit=10
+    )
+    last_page = reader.read_group(
+        group_ids[1], after=(second_page[-1]["created_at"], second_page[-1]["id"]), limit=10
+    )
+
+    assert first_page + second_page + last_page == group_rows
+    assert len(last_page) == 5
+
+
+def test_after_the_last_row_returns_nothing(segment: tuple[SegmentReader, list[uuid.UUID], list[dict]]) -> None:
+    reader, group_ids, _ = segment
+
+    after = (STARTED_AT + datetime.timedelta(days=1), uuid.uuid4())
+
+    assert reader.read_group(group_ids[0], after=after, limit=10) == []
+    assert reader.read_group(uuid.uuid4(), after=None, limit=10) == []
+    assert reader.read_group(group_ids[0], after=None, limit=0) == []
+
+
+def test_aborted_writer_leaves_no_segment(tmp_path: pathlib.Path) -> None:
+    writer = SegmentWriter(tmp_path / "202601.seg", LAYOUT, block_rows=10)
+    writer.write_rows(build_rows([uuid.uuid4()], rows_per_group=5))
+
+    writer.abort()
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,76 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.cache.memory import AsyncMemoryCache
+from src.config.manager import settings
+from src.models.user import User
+from src.securities.authorizations.jwt import jwt_generator
+from src.securities.authorizations.revocations import revoked_sessions
+from src.securities.authorizations.session_store import SessionStore
+from src.utilities.exceptions.session import SessionDoesNotExist
+
+
+@pytest.fixture
+def session_store(monkeypatch: pytest.MonkeyPatch) -> SessionStore:
+    monkeypatch.setattr(revoked_sessions, "cache", AsyncMemoryCache())
+    monkeypatch.setattr(revoked_sessions, "_sessions", dict())
+    return SessionStore(cache=AsyncMemoryCache())
+
+
+def build_user() -> User:
+    return User(id=uuid.uuid4(), username="session", email="session@example.com")
+
+
+def session_id_of(refresh_token: str) -> str:
+    return jwt_generator.retrieve_details_from_refresh_token(token=refresh_token).session_id
+
+
+def test_renewal_rotates_the_refresh_token(session_store: SessionStore) -> None:
+    async def run() -> None:
+        _, refresh_token = await session_store.start_session(user=build_user())
+        access_token, renewed_refresh_token = await session_store.renew_session(refresh_token=refresh_token)
+
+        assert renewed_refresh_token != refresh_token
+        assert jwt_generator.retrieve_details_from_token(
+            token=access_token, secret_key=settings.JWT_SECRET_KEY_ACCESS_TOKEN
+        )
+        await session_store.renew_session(refresh_token=renewed_refresh_token)
+
+    asyncio.run(run())
+
+
+def test_reused_refresh_token_ends_the_session_for_both_holders(session_store: SessionStore) -> None:
+    async def run() -> None:
+        _, leaked_refresh_token = await session_store.start_session(user=build_user())
+        session_id = session_id_of(leaked_refresh_token)
+        _, renewed_refresh_token = await session_store.renew_session(refresh_token=leaked_refresh_token)
+
+        with pytest.raises(SessionDoesNotExist):
+            await session_store.renew_session(refresh_token=leaked_refresh_token)
+
+        assert revoked_sessions.is_revoked(session_id)
+        with pytest.raises(ValueError):
+            await session_store.renew_session(refresh_token=renewed_refresh_token)
+
+    asyncio.run(run())
+
+
+def test_ended_user_sessions_cannot_be_renewed(session_store: SessionStore) -> None:
+    async def run() -> None:
+        user = build_user()
+        other_user = build_user()
+        _, first_refresh_token = await session_store.start_session(user=user)
+        _, second_refresh_token = await session_store.start_session(user=user)
+        _, first_refresh_token = await session_store.renew_session(refresh_token=first_refresh_token)
+        _, other_refresh_token = await session_store.start_session(user=other_user)
+
+        await session_store.end_user_sessions(user_id=str(user.id))
+
+        for refresh_token in (first_refresh_token, second_refresh_token):
+            with pytest.raises(ValueError):
+                await session_store.renew_session(refresh_token=refresh_token)
+        await session_store.renew_session(refresh_token=other_refresh_token)
+
+    asyncio.run(run())
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from src.cache.bucket import LocalTokenBuckets
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_allows_a_burst_up_to_the_capacity(clock: list[float]) -> None:
+    buckets = LocalTokenBuckets(max_size=10)
+
+    assert [buckets.take("ip", capacity=3, refill_rate=1.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.take("ip", capacity=3, refill_rate=1.0) == pytest.approx(1.0)
+
+
+def test_refills_at_the_refill_rate(clock: list[float]) -> None:
+    buckets = LocalTokenBuckets(max_size=10)
+    for _ in range(2):
+        buckets.take("ip", capacity=2, refill_rate=0.5)
+
+    clock[0] += 1
+    assert buckets.take("ip", capacity=2, refill_rate=0.5) == pytest.approx(1.0)
+
+    clock[0] += 1
+    assert buckets.take("ip", capacity=2, refill_rate=0.5) == 0.0
+
+
+def test_refill_stops_at_the_capacity(clock: list[float]) -> None:
+    buckets = LocalTokenBuckets(max_size=10)
+    buckets.take("ip", capacity=2, refill_rate=1.0)
+
+    clock[0] += 1000
+    results = [buckets.take("ip", capacity=2, refill_rate=1.0) for _ in range(3)]
+
+    assert results[:2] == [0.0, 0.0]
+    assert results[2] > 0
+
+
+def test_subjects_have_buckets_of_their_own(clock: list[float]) -> None:
+    buckets = LocalTokenBuckets(max_size=10)
+    buckets.take("first", capacity=1, refill_rate=1.0)
+
+    assert buckets.take("first", capacity=1, refill_rate=1.0) > 0
+    assert buckets.take("second", capacity=1, refill_rate=1.0) == 0.0
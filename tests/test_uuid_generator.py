@@ -0,0 +1,36 @@
+import time
+import uuid
+
+import pytest
+
+from src.utilities.generators import uuid_generator
+from src.utilities.generators.uuid_generator import generate_uuid7
+
+
+def test_version_variant_and_timestamp() -> None:
+    before_ms = time.time_ns() // 1_000_000
+    generated = generate_uuid7()
+    after_ms = time.time_ns() // 1_000_000
+
+    assert generated.version == 7
+    assert generated.variant == uuid.RFC_4122
+    assert before_ms <= generated.int >> 80 <= after_ms
+
+
+def test_ids_strictly_increase() -> None:
+    generated = [generate_uuid7() for _ in range(10_000)]
+
+    assert all(earlier < later for earlier, later in zip(generated, generated[1:]))
+
+
+def test_counter_overflow_moves_on_to_the_next_millisecond(monkeypatch: pytest.MonkeyPatch) -> None:
+    frozen_ns = (time.time_ns() // 1_000_000 + 1000) * 1_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: frozen_ns)
+    # Undone after the test, so later ids are not generated a second ahead of the clock.
+    monkeypatch.setattr(uuid_generator, "_last_timestamp_ms", uuid_generator._last_timestamp_ms)
+
+    generated = [generate_uuid7() for _ in range(0x1000 + 1)]
+
+    assert all(earlier < later for earlier, later in zip(generated, generated[1:]))
+    assert generated[-1].int >> 80 == frozen_ns // 1_000_000 + 1
+    assert uuid_generator._last_timestamp_ms == frozen_ns // 1_000_000 + 1